@@ -0,0 +1,88 @@
+"""
+Measures the cost of capturing device "all" publishes in the base historian:
+the time spent in the pubsub callback, the number of items it queues for the
+processing thread and the time to write them to the backup cache.
+
+No platform is needed, the capture callback is called directly and the
+backup cache is written in a temporary directory.
+
+Usage::
+
+    python historian_capture_benchmark.py -n 1000 -p 10 100 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from queue import Empty
+
+from volttron.platform.agent.base_historian import BackupDatabase, BaseHistorianAgent
+from volttron.platform.agent.utils import format_timestamp, get_aware_utc_now
+from volttron.platform.messaging import headers as headers_mod
+
+
+class BenchmarkHistorian(BaseHistorianAgent):
+    def publish_to_historian(self, to_publish_list):
+        self.report_all_handled()
+
+
+def _drain(event_queue):
+    items = []
+    while True:
+        try:
+            items.append(event_queue.get_nowait())
+        except Empty:
+            return items
+
+
+def _run(historian, publishes, points):
+    values = {"point{}".format(i): float(i) for i in range(points)}
+    meta = {name: {"type": "float", "tz": "UTC", "units": "F"} for name in values}
+    headers = {headers_mod.DATE: format_timestamp(get_aware_utc_now())}
+
+    start = time.perf_counter()
+    for i in range(publishes):
+        historian._capture_device_data("pubsub", "platform.driver", "",
+                                       "devices/campus/building/device{}/all".format(i % 50),
+                                       dict(headers), [values, meta])
+    capture = time.perf_counter() - start
+    items = _drain(historian._event_queue)
+
+    backupdb = BackupDatabase(historian, None, 0.9)
+    start = time.perf_counter()
+    backupdb.backup_new_data(items)
+    backupdb._connection.commit()
+    cache = time.perf_counter() - start
+    rows = backupdb.get_backlog_count()
+    backupdb.close()
+    os.remove("backup.sqlite")
+    return capture, len(items), cache, rows
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--publishes', type=int, default=1000,
+                        help='number of device publishes per run')
+    parser.add_argument('-p', '--points', type=int, nargs='+', default=[10, 100, 500],
+                        help='points per device publish')
+    opts = parser.parse_args(argv[1:])
+
+    historian = BenchmarkHistorian(identity="capture.benchmark")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            print("points  capture us/publish  queued/publish  cache us/publish  cache us/point")
+            for points in opts.points:
+                capture, queued, cache, rows = _run(historian, opts.publishes, points)
+                print("{:6d}  {:18.1f}  {:14.1f}  {:16.1f}  {:14.2f}".format(
+                    points, capture / opts.publishes * 1e6, queued / opts.publishes,
+                    cache / opts.publishes * 1e6, cache / rows * 1e6))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
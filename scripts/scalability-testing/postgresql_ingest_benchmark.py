@@ -0,0 +1,82 @@
+"""
+Measures PostgreSQL historian ingest rate in rows per second for the
+default INSERT bulk insert mode and the COPY mode against a local
+PostgreSQL database.
+
+The benchmark creates its own tables, prefixed with ``bench_``, and
+drops them when it finishes.
+
+Usage::
+
+    python postgresql_ingest_benchmark.py --dbname historian --user postgres --password postgres \\
+        -n 200000 -b 5000
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+
+import psycopg2
+from psycopg2.sql import Identifier, SQL
+
+from volttron.platform.dbutils.postgresqlfuncts import PostgreSqlFuncts
+
+TABLE_NAMES = {"data_table": "bench_data",
+               "topics_table": "bench_topics",
+               "meta_table": "bench_topics"}
+
+
+def _drop_tables(params):
+    connection = psycopg2.connect(**params)
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        for table in ("bench_data", "bench_data_staging", "bench_topics"):
+            cursor.execute(SQL('DROP TABLE IF EXISTS {}').format(Identifier(table)))
+    connection.close()
+
+
+def _run(params, mode, rows, batch_size, topics):
+    _drop_tables(params)
+    functs = PostgreSqlFuncts(dict(params, bulk_insert_mode=mode), TABLE_NAMES)
+    functs.setup_historian_tables()
+    start_time = datetime(2020, 1, 1)
+
+    start = time.perf_counter()
+    for batch_start in range(0, rows, batch_size):
+        with functs.bulk_insert() as insert_data:
+            for i in range(batch_start, min(batch_start + batch_size, rows)):
+                insert_data(start_time + timedelta(seconds=i // topics), i % topics, float(i))
+        functs.commit()
+    elapsed = time.perf_counter() - start
+    functs.close()
+    return rows / elapsed
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=5432)
+    parser.add_argument('--dbname', default='historian')
+    parser.add_argument('--user', default='postgres')
+    parser.add_argument('--password', default='postgres')
+    parser.add_argument('-n', '--rows', type=int, default=200000,
+                        help='number of rows to insert per mode')
+    parser.add_argument('-b', '--batch-size', type=int, default=5000,
+                        help='rows per bulk insert')
+    parser.add_argument('-t', '--topics', type=int, default=1000,
+                        help='number of distinct topics')
+    opts = parser.parse_args(argv[1:])
+
+    params = {'host': opts.host, 'port': opts.port, 'dbname': opts.dbname,
+              'user': opts.user, 'password': opts.password}
+    try:
+        for mode in ('insert', 'copy'):
+            rate = _run(params, mode, opts.rows, opts.batch_size, opts.topics)
+            print("{:6}: {:.0f} rows/s".format(mode, rate))
+    finally:
+        _drop_tables(params)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
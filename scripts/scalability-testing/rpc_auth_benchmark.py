@@ -0,0 +1,75 @@
+"""
+Measures RPC calls per second against a running platform for an exported
+method without capability checks and for one protected by ``RPC.allow``.
+
+The calling agent must have the ``can_benchmark_rpc`` capability, e.g. by
+adding it to the catch-all auth entry used for scalability testing::
+
+    vctl auth add --credentials "/.*/" --capabilities can_benchmark_rpc
+
+Usage::
+
+    python rpc_auth_benchmark.py -n 10000 -m zmq
+"""
+import argparse
+import sys
+import time
+
+import gevent
+
+from volttron.platform import get_address
+from volttron.platform.vip.agent import Agent, RPC
+
+
+class BenchmarkServer(Agent):
+
+    @RPC.export
+    def echo_open(self, path, value):
+        return value
+
+    @RPC.export
+    @RPC.allow('can_benchmark_rpc')
+    def echo_checked(self, path, value):
+        return value
+
+
+def _run(client, method, count):
+    start = time.perf_counter()
+    for i in range(count):
+        client.vip.rpc.call('rpc.benchmark.server', method, 'campus/building/point', i).get(timeout=10)
+    return count / (time.perf_counter() - start)
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--calls', type=int, default=5000,
+                        help='number of RPC calls per method')
+    parser.add_argument('-m', '--messagebus', default='zmq',
+                        help='message bus')
+    opts = parser.parse_args(argv[1:])
+
+    server = BenchmarkServer(address=get_address(), identity='rpc.benchmark.server',
+                             message_bus=opts.messagebus)
+    client = Agent(address=get_address(), identity='rpc.benchmark.client',
+                   message_bus=opts.messagebus)
+    for agent in (server, client):
+        event = gevent.event.Event()
+        gevent.spawn(agent.core.run, event)
+        event.wait(timeout=5)
+
+    try:
+        # Warm up the connection and the authorization cache.
+        _run(client, 'echo_open', 10)
+        _run(client, 'echo_checked', 10)
+        open_rate = _run(client, 'echo_open', opts.calls)
+        checked_rate = _run(client, 'echo_checked', opts.calls)
+        print("auth disabled: {:.1f} calls/s".format(open_rate))
+        print("auth enabled:  {:.1f} calls/s".format(checked_rate))
+    finally:
+        client.core.stop()
+        server.core.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
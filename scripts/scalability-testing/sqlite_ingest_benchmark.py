@@ -0,0 +1,70 @@
+"""
+Measures SQLite historian ingest rate in rows per second, inserting the
+same rows one statement per row in rollback journal mode (the behavior
+before bulk inserts and WAL) and with bulk inserts in WAL mode.
+
+Each run writes a fresh database file in a temporary directory.
+
+Usage::
+
+    python sqlite_ingest_benchmark.py -n 1000000 -b 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from volttron.platform.dbutils.sqlitefuncts import SqlLiteFuncts
+
+TABLE_NAMES = {"data_table": "data",
+               "topics_table": "topics",
+               "meta_table": "meta",
+               "agg_topics_table": "aggregate_topics",
+               "agg_meta_table": "aggregate_meta"}
+
+
+def _run(directory, name, connect_params, bulk, rows, batch_size, topics):
+    params = dict(connect_params, database=os.path.join(directory, name + ".sqlite"))
+    functs = SqlLiteFuncts(params, TABLE_NAMES)
+    functs.setup_historian_tables()
+    start_time = datetime(2020, 1, 1)
+
+    start = time.perf_counter()
+    for batch_start in range(0, rows, batch_size):
+        batch = range(batch_start, min(batch_start + batch_size, rows))
+        if bulk:
+            with functs.bulk_insert() as insert_data:
+                for i in batch:
+                    insert_data(start_time + timedelta(seconds=i // topics), i % topics, float(i))
+        else:
+            for i in batch:
+                functs.insert_data(start_time + timedelta(seconds=i // topics), i % topics, float(i))
+        functs.commit()
+    elapsed = time.perf_counter() - start
+    functs.close()
+    return rows / elapsed
+
+
+def main(argv=sys.argv):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--rows', type=int, default=1000000,
+                        help='number of rows to insert per run')
+    parser.add_argument('-b', '--batch-size', type=int, default=5000,
+                        help='rows per transaction')
+    parser.add_argument('-t', '--topics', type=int, default=1000,
+                        help='number of distinct topics')
+    opts = parser.parse_args(argv[1:])
+
+    with tempfile.TemporaryDirectory() as directory:
+        before = _run(directory, "before", {"journal_mode": "DELETE", "synchronous": "FULL"}, False,
+                      opts.rows, opts.batch_size, opts.topics)
+        print("row inserts, rollback journal: {:.0f} rows/s".format(before))
+        after = _run(directory, "after", {}, True, opts.rows, opts.batch_size, opts.topics)
+        print("bulk inserts, WAL:             {:.0f} rows/s".format(after))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
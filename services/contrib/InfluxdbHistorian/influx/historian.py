@@ -66,6 +66,7 @@ def historian(config_path, **kwargs):
 
     connection = config_dict.pop('connection', {})
     aggregations = config_dict.pop("aggregations", {})
+    max_batch_size = config_dict.pop("max_batch_size", 5000)
 
     # assert connection is not None
     # params = connection.get('params', None)
@@ -75,7 +76,7 @@ def historian(config_path, **kwargs):
     utils.update_kwargs_with_config(kwargs, config_dict)
     _log.debug("In influx historian before calling class kwargs is {}".format(
         kwargs))
-    return InfluxdbHistorian(connection, aggregations, **kwargs)
+    return InfluxdbHistorian(connection, aggregations, max_batch_size=max_batch_size, **kwargs)
 
 
 class InfluxdbHistorian(BaseHistorian):
@@ -83,7 +84,7 @@ class InfluxdbHistorian(BaseHistorian):
         Historian that stores the data into influxdb client's database
     """
 
-    def __init__(self, connection, aggregations, **kwargs):
+    def __init__(self, connection, aggregations, max_batch_size=5000, **kwargs):
         """
         Initialise the historian.
 
@@ -95,6 +96,8 @@ class InfluxdbHistorian(BaseHistorian):
             3. database
             4. user
             5. passwd
+            6. gzip (optional, compress request bodies)
+        :param max_batch_size: maximum number of points written per request
         :param kwargs: additional keyword arguments. (optional identity and
                        topic_replace_list used by parent classes)
         """
@@ -107,10 +110,12 @@ class InfluxdbHistorian(BaseHistorian):
 
         # Config for aggregation queries, can be changed in config file.
         self._use_calendar_time_periods = aggregations.get('use_calendar_time_periods', False)
+        self._max_batch_size = max_batch_size
 
         config = {
             "connection": connection,
-            "aggregations": aggregations
+            "aggregations": aggregations,
+            "max_batch_size": max_batch_size
         }
 
         self.update_default_config(config)
@@ -135,7 +140,8 @@ class InfluxdbHistorian(BaseHistorian):
                   "user": "historian",
                   "passwd": "historian"
                 }
-              }
+              },
+              "max_batch_size": 5000
             }
 
         If user and passwd are optional if authentication is disabled
@@ -148,7 +154,10 @@ class InfluxdbHistorian(BaseHistorian):
             passwd = params.get('passwd', None)
             if configuration['aggregations']:
                 use_calendar_time_periods = configuration['aggregations']['use_calendar_time_periods']
-        except (KeyError, TypeError) as err:
+            max_batch_size = int(configuration.get('max_batch_size', 5000))
+            if max_batch_size < 1:
+                raise ValueError("max_batch_size must be at least 1")
+        except (KeyError, TypeError, ValueError) as err:
             _log.error('Invalid configuration: %s', err)
             raise err
 
@@ -196,6 +205,8 @@ class InfluxdbHistorian(BaseHistorian):
                                                                                 use_calendar_time_periods))
             self._use_calendar_time_periods = use_calendar_time_periods
 
+        self._max_batch_size = max_batch_size
+
     @doc_inherit
     def version(self):
         return __version__
@@ -206,67 +217,78 @@ class InfluxdbHistorian(BaseHistorian):
         _log.debug("publish_to_historian number of items: {}".format(
             len(to_publish_list)))
 
-        try:
-            for stored_index, row in enumerate(to_publish_list):
-                ts = utils.format_timestamp(row['timestamp'])
-                source = row['source']
-                topic = row['topic']
+        # Rows that are not written as data points (record/*) count as handled. Rows whose meta could not be written
+        # are left unhandled so they are retried from the cache.
+        handled = []
+        data_rows = []
+        data_points = []
 
-                # record/* has got wrong format for InfluxDB, only timeseries data
-                if topic.startswith('record/'):
-                    continue
+        for row in to_publish_list:
+            ts = utils.format_timestamp(row['timestamp'])
+            source = row['source']
+            topic = row['topic']
 
-                meta = row['meta']
-                value = row['value']
-                value_string = str(value)
+            # record/* has got wrong format for InfluxDB, only timeseries data
+            if topic.startswith('record/'):
+                handled.append(row)
+                continue
 
-                # Check type of value from metadata if it exists,
-                # then cast value to that type
-                try:
-                    value_type = meta["type"]
-                    value = influxdbutils.value_type_matching(value_type, value)
-                except KeyError:
-                    _log.info("Metadata doesn't include \'type\' keyword")
-                except ValueError:
-                    _log.warning("Metadata specifies \'type\' of value is {} while "
-                                 "value={} is type {}".format(value_type, value, type(value)))
+            meta = row['meta']
+            value = row['value']
+            value_string = str(value)
 
-                topic_id = topic.lower()
+            # Check type of value from metadata if it exists,
+            # then cast value to that type
+            try:
+                value_type = meta["type"]
+                value = influxdbutils.value_type_matching(value_type, value)
+            except KeyError:
+                _log.info("Metadata doesn't include \'type\' keyword")
+            except ValueError:
+                _log.warning("Metadata specifies \'type\' of value is {} while "
+                             "value={} is type {}".format(value_type, value, type(value)))
 
-                # If the topic is not in the list
-                if topic_id not in self._topic_id_map:
-                    self._topic_id_map[topic_id] = topic
-                    self._meta_dicts[topic_id] = {}
+            topic_id = topic.lower()
 
-                # If topic's metadata changes, update its metadata.
-                if topic_id in self._topic_id_map and meta != self._meta_dicts[topic_id]:
+            # If the topic is not in the list
+            if topic_id not in self._topic_id_map:
+                self._topic_id_map[topic_id] = topic
+                self._meta_dicts[topic_id] = {}
 
-                    _log.info("Updating meta for topic {} at {}".format(topic_id, ts))
-                    self._meta_dicts[topic_id] = meta
+            # If topic's metadata changes, update its metadata.
+            if topic_id in self._topic_id_map and meta != self._meta_dicts[topic_id]:
 
-                    # Insert the meta into the database
-                    influxdbutils.insert_meta(self._client, topic_id, topic, meta, ts)
-                # Else if topic name in database changes, update.
-                elif topic_id in self._topic_id_map and self._topic_id_map[topic_id] != topic:
-                    _log.info("Updating actual topic name {} in database for topic id {}".format(topic, topic_id))
-                    self._topic_id_map[topic_id] = topic
+                _log.info("Updating meta for topic {} at {}".format(topic_id, ts))
 
-                    # Update topic name in the database
+                # Insert the meta into the database
+                try:
                     influxdbutils.insert_meta(self._client, topic_id, topic, meta, ts)
+                except InfluxDBClientError as err:
+                    _log.error("Failed to update meta for topic {}: {}".format(topic_id, err))
+                    continue
+                self._meta_dicts[topic_id] = meta
+            # Else if topic name in database changes, update.
+            elif topic_id in self._topic_id_map and self._topic_id_map[topic_id] != topic:
+                _log.info("Updating actual topic name {} in database for topic id {}".format(topic, topic_id))
+                self._topic_id_map[topic_id] = topic
 
-                # Insert data point
-                influxdbutils.insert_data_point(self._client, ts, topic_id, source, value, value_string)
+                # Update topic name in the database
+                influxdbutils.insert_meta(self._client, topic_id, topic, meta, ts)
 
-            # After all data points are published
-            self.report_all_handled()
-            _log.info("Store ALL data in to_publish_list to InfluxDB client")
+            data_rows.append(row)
+            data_points.append((ts, topic_id, source, value, value_string))
 
-        except ConnectionError as err:
-            raise err
-        except InfluxDBClientError as err:
-            _log.error("Stored [:{}] data in to_publish_list to InfluxDB client".format(stored_index-1))
-            self.report_handled(to_publish_list[:stored_index-1])
-            raise err
+        # Data points are written in batches of max_batch_size. Only the records whose points could not be written are
+        # left unhandled, a ConnectionError leaves the whole list unhandled.
+        failed = set(influxdbutils.insert_data_points(self._client, data_points, self._max_batch_size))
+
+        handled.extend(row for index, row in enumerate(data_rows) if index not in failed)
+        if len(handled) == len(to_publish_list):
+            _log.info("Store ALL data in to_publish_list to InfluxDB client")
+        else:
+            _log.error("Stored {} of {} records in to_publish_list to InfluxDB client".format(len(handled),
+                                                                                            len(to_publish_list)))
+        self.report_handled(handled)
 
     @doc_inherit
     def query_topic_list(self):
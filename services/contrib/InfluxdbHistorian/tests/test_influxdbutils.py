@@ -1,5 +1,7 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from time import time
 import os
+import threading
 from gevent import sleep
 import pytest
 
@@ -14,6 +16,7 @@ except ImportError:
     )
 
 import volttron.platform.dbutils.influxdbutils as influxdbutils
+from volttron.platform import jsonapi
 from volttrontesting.fixtures.docker_wrapper import create_container
 from volttrontesting.utils.utils import get_rand_port
 
@@ -454,6 +457,78 @@ def test_get_topics_by_pattern(
         assert actual_topics == expected_topics
 
 
+@pytest.mark.dbutils
+@pytest.mark.influxdbutils
+def test_insert_data_points_writes_batches(counting_write_server):
+    client = InfluxDBClient(host="localhost", port=counting_write_server.server_port, database=TEST_DATABASE)
+    data_points = [
+        ("2017-01-01T00:00:{:02d}".format(i % 60), "campus/building/device/point{}".format(i % 7), "scrape", i, str(i))
+        for i in range(250)
+    ]
+
+    failed = influxdbutils.insert_data_points(client, data_points, batch_size=100)
+
+    assert failed == []
+    assert counting_write_server.write_requests == 3
+    assert counting_write_server.points_written == 250
+
+
+@pytest.mark.dbutils
+@pytest.mark.influxdbutils
+def test_insert_data_points_reports_only_failed_points(counting_write_server):
+    client = InfluxDBClient(host="localhost", port=counting_write_server.server_port, database=TEST_DATABASE)
+    data_points = [
+        ("2017-01-01T00:00:{:02d}".format(i), "campus/building/device/point", "scrape", float(i), str(i))
+        for i in range(10)
+    ]
+    data_points[4] = ("2017-01-01T00:00:04", "campus/building/device/rejected", "scrape", "on", "on")
+
+    failed = influxdbutils.insert_data_points(client, data_points, batch_size=5)
+
+    assert failed == [4]
+    # One rejected batch of five, five single point retries with one more retry after the type cast, one batch.
+    assert counting_write_server.write_requests == 8
+    assert counting_write_server.points_written == 9
+
+
+@pytest.fixture()
+def counting_write_server():
+    """
+    Local stand-in for the InfluxDB write endpoint that counts write requests and points. Any batch containing the
+    measurement "rejected" is refused with a field type conflict.
+    """
+
+    class WriteHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            lines = body.decode("utf-8").strip().split("\n")
+            self.server.write_requests += 1
+            if any(line.startswith("rejected,") for line in lines):
+                error = jsonapi.dumps({"error": "partial write: field type conflict: input field \"value\" on "
+                                                "measurement \"rejected\" is type string, already exists as type "
+                                                "float dropped=1"})
+                self.send_response(400)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(error.encode("utf-8"))
+                return
+            self.server.points_written += len(lines)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("localhost", 0), WriteHandler)
+    server.write_requests = 0
+    server.points_written = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture(params=IMAGES)
 def get_container_func(request):
     return create_container, request.param
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+try:
+    from influxdb.exceptions import InfluxDBClientError
+except ImportError:
+    pytest.skip("influxdb not found!", allow_module_level=True)
+
+from volttron.platform.agent.base_historian import BaseHistorianAgent
+from volttron.platform.vip.agent import Agent
+from volttrontesting.utils.utils import AgentMock
+
+BaseHistorianAgent.__bases__ = (AgentMock.imitate(Agent, Agent()),)
+
+from influx import historian as influx_historian
+
+
+def make_row(topic, value, meta):
+    return {"timestamp": datetime(2017, 1, 1), "source": "scrape", "topic": topic, "value": value, "meta": meta}
+
+
+@pytest.fixture
+def historian(monkeypatch):
+    historian = influx_historian.InfluxdbHistorian({"params": {}}, {})
+    historian.reported = []
+    historian.written = []
+
+    def insert_data_points(client, data_points, batch_size):
+        historian.written.extend(data_points)
+        return []
+
+    monkeypatch.setattr(historian, "report_handled", historian.reported.extend)
+    monkeypatch.setattr(historian, "report_all_handled", lambda: pytest.fail("report_all_handled called"))
+    monkeypatch.setattr(influx_historian.influxdbutils, "insert_data_points", insert_data_points)
+    return historian
+
+
+def test_rows_with_failed_meta_write_stay_unhandled(historian, monkeypatch):
+    def insert_meta(client, topic_id, topic, meta, ts):
+        if topic_id == "campus/device/bad":
+            raise InfluxDBClientError("meta write refused")
+
+    monkeypatch.setattr(influx_historian.influxdbutils, "insert_meta", insert_meta)
+    rows = [make_row("campus/device/good", 1.0, {"type": "float"}),
+            make_row("campus/device/bad", 2.0, {"type": "float"}),
+            make_row("record/campus/note", "text", {})]
+
+    historian.publish_to_historian(rows)
+
+    assert historian.reported == [rows[2], rows[0]]
+    assert [point[1] for point in historian.written] == ["campus/device/good"]
+
+    # the meta is written again when the row is retried
+    monkeypatch.setattr(influx_historian.influxdbutils, "insert_meta", lambda *args: None)
+    historian.reported.clear()
+    historian.publish_to_historian([rows[1]])
+    assert historian.reported == [rows[1]]
@@ -12,14 +12,29 @@ import random
 from kafka import KafkaConsumer, KafkaProducer
 from kafka.errors import KafkaError
 
-from volttron.platform.vip.agent import Agent, Core, PubSub
+from volttron.platform.vip.agent import Agent, Core, PubSub, RPC
 from volttron.platform.messaging import topics
 from volttron.platform.agent import utils
 from volttron.platform import jsonapi
 
+from .pipeline import ProducerPipeline
+
 utils.setup_logging()
 _log = logging.getLogger(__name__)
-__version__ = "0.1"
+__version__ = "0.2"
+
+
+# Producer pipeline settings and their defaults
+PRODUCER_CONFIG_DEFAULTS = {
+    'kafka_linger_ms': 5,
+    'kafka_batch_size': 16384,
+    'kafka_compression_type': None,
+    'kafka_queue_size': 10000,
+    'kafka_max_in_flight': 10000,
+    'kafka_queue_overflow': 'block',
+    'kafka_spill_path': None,
+    'kafka_max_retries': 3
+}
 
 
 def kafka_agent(config_path, **kwargs):
@@ -42,6 +57,7 @@ def kafka_agent(config_path, **kwargs):
     kafka_broker_port = config.get('kafka_broker_port')
     kafka_producer_topic = config.get('kafka_producer_topic')
     kafka_consumer_topic = config.get('kafka_consumer_topic')
+    producer_config = {key: config[key] for key in PRODUCER_CONFIG_DEFAULTS if key in config}
 
     if 'all' in services_topic_list:
         services_topic_list = [topics.DRIVER_TOPIC_BASE, topics.LOGGER_BASE,
@@ -52,6 +68,7 @@ def kafka_agent(config_path, **kwargs):
                       kafka_broker_port,
                       kafka_producer_topic,
                       kafka_consumer_topic,
+                      producer_config=producer_config,
                       **kwargs)
 
 class KafkaAgent(Agent):
@@ -75,12 +92,14 @@ class KafkaAgent(Agent):
             kafka_broker_port (str): Kafka Broker port
             kafka_producer_topic (str): Topic for messaging from kafka broker to VOLTTRON
             kafka_consumer_topic (str): Topic for messaging from VOLTTRON to Cloud
+            producer_config (dict): Producer pipeline settings, see PRODUCER_CONFIG_DEFAULTS
 
         Returns:
             None
 
         Note:
             Version 0.1: Add - Function 1, 2, 3, 4
+            Version 0.2: Batched producer pipeline with delivery tracking
     '''
 
     '''
@@ -100,6 +119,7 @@ class KafkaAgent(Agent):
                  kafka_broker_port,
                  kafka_producer_topic,
                  kafka_consumer_topic,
+                 producer_config=None,
                  **kwargs):
         '''
             Function:
@@ -125,6 +145,8 @@ class KafkaAgent(Agent):
         self.kafka_broker_port = kafka_broker_port
         self.kafka_producer_topic = kafka_producer_topic
         self.kafka_consumer_topic = kafka_consumer_topic
+        self.producer_config = dict(PRODUCER_CONFIG_DEFAULTS)
+        self.producer_config.update(producer_config or {})
 
         self.default_config = {"services_topic_list": services_topic_list,
                                "kafka_broker_ip": kafka_broker_ip,
@@ -153,8 +175,18 @@ class KafkaAgent(Agent):
         # produce json messages
         self.kafka_consumer_addr = '{0}:{1}'.format(self.kafka_broker_ip, self.kafka_broker_port)
         self.producer = KafkaProducer(bootstrap_servers=[self.kafka_consumer_addr],
-                        value_serializer=lambda v: jsonapi.dumps(v).encode('utf-8')
+                        value_serializer=lambda v: jsonapi.dumps(v).encode('utf-8'),
+                        linger_ms=self.producer_config['kafka_linger_ms'],
+                        batch_size=self.producer_config['kafka_batch_size'],
+                        compression_type=self.producer_config['kafka_compression_type']
                          )
+        # bounded local queue in front of the producer
+        self.pipeline = ProducerPipeline(self.producer, self.kafka_consumer_topic,
+                        max_queue_size=self.producer_config['kafka_queue_size'],
+                        max_in_flight=self.producer_config['kafka_max_in_flight'],
+                        overflow=self.producer_config['kafka_queue_overflow'],
+                        spill_path=self.producer_config['kafka_spill_path'],
+                        max_retries=self.producer_config['kafka_max_retries'])
 
     # configuration callbacks
     # lnke : http://volttron.readthedocs.io/en/4.0.1/devguides/agent_development/Agent-Configuration-Store.html
@@ -203,8 +235,8 @@ class KafkaAgent(Agent):
                 'description': 'message from VOLTTRON to KafkaBroker',
                 'message': message
                 }
-            # Send command to Consumer(in Cloud)
-            self.producer.send(self.kafka_consumer_topic, msg)
+            # Queue command for Consumer(in Cloud)
+            self.pipeline.put(msg)
 
         except Exception as e:
             _log.error('Send_to_broker: {}'.format(e))
@@ -242,10 +274,32 @@ class KafkaAgent(Agent):
                                       prefix=subscription,
                                       callback=callback_method)
 
+        # Start sending queued messages to Kafka Broker
+        self.core.spawn(self.pipeline.run)
+
         # Resister callback method with 'subscriber'
         for topic_subscriptions in self.services_topic_list:
             subscriber(topic_subscriptions, self.send_to_broker)
 
+    @Core.receiver("onstop")
+    def on_stop(self, sender, **kwargs):
+        '''
+            Function: Deliver or spill the messages still queued for Kafka Broker.
+            Args: .
+            Returns: None
+        '''
+        self.pipeline.stop()
+        _log.info('Producer stats on stop: {}'.format(self.pipeline.stats()))
+
+    @RPC.export
+    def get_producer_stats(self):
+        '''
+            Function: Return delivered, retried, dropped and spilled counters and queue depths.
+            Args: None
+            Returns: dict
+        '''
+        return self.pipeline.stats()
+
     @Core.periodic(1)
     def receive_from_broker(self):
         '''
@@ -0,0 +1,233 @@
+import logging
+import os
+from collections import deque
+
+from gevent.event import Event
+
+from volttron.platform import jsonapi
+
+_log = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('block', 'spill', 'drop')
+
+
+class ProducerPipeline(object):
+    '''
+        Function:
+            Bounded queue between the message bus callbacks and a Kafka
+            producer, with delivery tracking.
+
+            Records are handed to the producer from a single greenlet so the
+            producer's own linger/batch settings can group them. Delivery
+            results come back on the producer's I/O thread; failed records
+            are retried up to max_retries times and then dropped.
+
+        Args:
+            producer: KafkaProducer (or anything with the same send() API)
+            topic (str): Kafka topic to send records to
+            max_queue_size (int): records held locally before overflow
+            max_in_flight (int): records sent but not yet acknowledged
+            overflow (str): 'block' waits for space, 'spill' appends to
+                spill_path and replays it later, 'drop' discards the record
+            spill_path (str): file used by the 'spill' policy
+            max_retries (int): resends of a record after a failed delivery
+    '''
+
+    def __init__(self, producer, topic, max_queue_size=10000, max_in_flight=10000,
+                 overflow='block', spill_path=None, max_retries=3):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('overflow must be one of {}'.format(OVERFLOW_POLICIES))
+        if overflow == 'spill' and not spill_path:
+            raise ValueError("the 'spill' overflow policy requires a spill_path")
+
+        self.producer = producer
+        self.topic = topic
+        self.max_queue_size = max_queue_size
+        self.max_in_flight = max_in_flight
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self.max_retries = max_retries
+
+        # (value, attempt) waiting to be sent
+        self._queue = deque()
+        # filled from the producer's I/O thread; deque appends are thread safe
+        self._failed = deque()
+        # only updated from the I/O thread
+        self._completed = 0
+        self._spill_offset = 0
+        self._spill_count = 0
+        self._wakeup = Event()
+        self._space = Event()
+        self._space.set()
+        self._stopping = False
+
+        self.counters = {'queued': 0, 'sent': 0, 'delivered': 0, 'retried': 0,
+                         'dropped': 0, 'spilled': 0}
+
+        if spill_path and os.path.exists(spill_path):
+            with open(spill_path, 'rb') as spill:
+                self._spill_count = sum(1 for _ in spill)
+
+    def put(self, value):
+        '''
+            Function: Queue a record, applying the overflow policy when full.
+            Args: value: JSON serializable record
+            Returns: True if the record was queued or spilled, False if dropped
+        '''
+        # Once records have been spilled new ones follow them, to keep order.
+        if self._spill_count:
+            self._spill([value])
+            return True
+        while len(self._queue) >= self.max_queue_size:
+            if self.overflow == 'spill':
+                self._spill([value])
+                return True
+            if self.overflow == 'drop':
+                self.counters['dropped'] += 1
+                return False
+            self._space.clear()
+            self._space.wait()
+            if self._stopping:
+                self.counters['dropped'] += 1
+                return False
+        self._queue.append((value, 0))
+        self.counters['queued'] += 1
+        self._wakeup.set()
+        return True
+
+    @property
+    def in_flight(self):
+        return self.counters['sent'] - self._completed
+
+    def stats(self):
+        '''
+            Function: Return the pipeline counters and current queue depths.
+        '''
+        stats = dict(self.counters)
+        stats['queue_size'] = len(self._queue)
+        stats['in_flight'] = self.in_flight
+        stats['spill_size'] = self._spill_count
+        return stats
+
+    def drain(self):
+        '''
+            Function:
+                Requeue failed deliveries, replay spilled records while there
+                is room, and send queued records while the in-flight window
+                allows.
+            Returns: number of records sent
+        '''
+        while self._failed:
+            value, attempt = self._failed.popleft()
+            if attempt < self.max_retries:
+                self.counters['retried'] += 1
+                self._queue.appendleft((value, attempt + 1))
+            else:
+                _log.error('Dropping record after {} failed deliveries'.format(attempt + 1))
+                self.counters['dropped'] += 1
+
+        if self._spill_count and len(self._queue) < self.max_queue_size:
+            self._unspill(self.max_queue_size - len(self._queue))
+
+        sent = 0
+        while self._queue and self.in_flight < self.max_in_flight:
+            value, attempt = self._queue.popleft()
+            try:
+                future = self.producer.send(self.topic, value)
+            except Exception as e:
+                _log.error('Send_to_broker: {}'.format(e))
+                self._failed.append((value, attempt))
+                break
+            self.counters['sent'] += 1
+            sent += 1
+            future.add_callback(self._delivered)
+            future.add_errback(self._failed_delivery, value, attempt)
+
+        if len(self._queue) < self.max_queue_size:
+            self._space.set()
+        return sent
+
+    def run(self, poll_interval=0.1):
+        '''
+            Function:
+                Greenlet body. Drains the queue whenever records are added
+                and at least every poll_interval seconds to pick up
+                delivery results.
+        '''
+        while not self._stopping:
+            self._wakeup.wait(poll_interval)
+            self._wakeup.clear()
+            self.drain()
+
+    def stop(self, timeout=10):
+        '''
+            Function:
+                Stop the pipeline, giving the producer up to timeout seconds
+                to deliver what has been sent. With the 'spill' policy the
+                records still queued are written to the spill file so they
+                survive a restart.
+        '''
+        self._stopping = True
+        self._wakeup.set()
+        self._space.set()
+        self.drain()
+        try:
+            self.producer.flush(timeout)
+        except Exception as e:
+            _log.error('Flush on stop failed: {}'.format(e))
+        self.drain()
+        if self.spill_path and (self._queue or self._spill_offset):
+            # spilled records must follow the ones still queued, and the
+            # replayed ones are cut from the file since the read offset
+            # is only kept in memory
+            pending = [value for value, _ in self._queue]
+            self._queue.clear()
+            self._prepend_spill(pending)
+        elif self._queue:
+            _log.warning('Dropping {} unsent records on stop'.format(len(self._queue)))
+            self.counters['dropped'] += len(self._queue)
+            self._queue.clear()
+
+    # Called on the producer's I/O thread.
+    def _delivered(self, metadata):
+        self.counters['delivered'] += 1
+        self._completed += 1
+
+    def _failed_delivery(self, value, attempt, exc):
+        _log.warning('Kafka delivery failed: {}'.format(exc))
+        self._failed.append((value, attempt))
+        self._completed += 1
+
+    def _spill(self, values):
+        with open(self.spill_path, 'ab') as spill:
+            for value in values:
+                spill.write(jsonapi.dumpb(value) + b'\n')
+        self._spill_count += len(values)
+        self.counters['spilled'] += len(values)
+
+    def _unspill(self, limit):
+        with open(self.spill_path, 'rb') as spill:
+            spill.seek(self._spill_offset)
+            for _ in range(limit):
+                line = spill.readline()
+                if not line:
+                    break
+                self._queue.append((jsonapi.loadb(line), 0))
+                self._spill_count -= 1
+            self._spill_offset = spill.tell()
+        if not self._spill_count:
+            os.remove(self.spill_path)
+            self._spill_offset = 0
+
+    def _prepend_spill(self, values):
+        remaining = b''
+        if self._spill_count:
+            with open(self.spill_path, 'rb') as spill:
+                spill.seek(self._spill_offset)
+                remaining = spill.read()
+        with open(self.spill_path, 'wb') as spill:
+            for value in values:
+                spill.write(jsonapi.dumpb(value) + b'\n')
+            spill.write(remaining)
+        self._spill_offset = 0
+        self._spill_count += len(values)
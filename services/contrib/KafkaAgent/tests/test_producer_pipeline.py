@@ -0,0 +1,178 @@
+import gevent
+import pytest
+
+from kafkaagent.pipeline import ProducerPipeline
+
+
+class FakeFuture:
+    def __init__(self):
+        self.callbacks = []
+        self.errbacks = []
+
+    def add_callback(self, f, *args):
+        self.callbacks.append((f, args))
+        return self
+
+    def add_errback(self, f, *args):
+        self.errbacks.append((f, args))
+        return self
+
+    def success(self):
+        for f, args in self.callbacks:
+            f(*args, "metadata")
+
+    def failure(self, exc):
+        for f, args in self.errbacks:
+            f(*args, exc)
+
+
+class FakeProducer:
+    """In-process stand in for KafkaProducer that groups sends into batches
+    the way linger_ms/batch_size would and completes them on demand."""
+
+    def __init__(self, batch_size=4):
+        self.batch_size = batch_size
+        self.batches = [[]]
+        self.flushed = 0
+
+    def send(self, topic, value):
+        if len(self.batches[-1]) == self.batch_size:
+            self.batches.append([])
+        future = FakeFuture()
+        self.batches[-1].append((value, future))
+        return future
+
+    def complete(self, fail=None):
+        batches, self.batches = self.batches, [[]]
+        for batch in batches:
+            for value, future in batch:
+                if fail is not None and fail(value):
+                    future.failure(Exception("broker unavailable"))
+                else:
+                    future.success()
+        return [[value for value, _ in batch] for batch in batches if batch]
+
+    def flush(self, timeout=None):
+        self.flushed += 1
+
+
+def test_records_are_sent_in_batches_and_delivered():
+    producer = FakeProducer(batch_size=4)
+    pipeline = ProducerPipeline(producer, "topic")
+    for i in range(10):
+        pipeline.put(i)
+
+    assert pipeline.drain() == 10
+    assert producer.complete() == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    stats = pipeline.stats()
+    assert stats["delivered"] == 10
+    assert stats["in_flight"] == 0
+    assert stats["queue_size"] == 0
+
+
+def test_failed_records_are_retried_then_dropped():
+    producer = FakeProducer()
+    pipeline = ProducerPipeline(producer, "topic", max_retries=2)
+    for i in range(3):
+        pipeline.put(i)
+
+    pipeline.drain()
+    producer.complete(fail=lambda value: value == 1)
+    for _ in range(2):
+        pipeline.drain()
+        assert producer.complete(fail=lambda value: value == 1) == [[1]]
+    pipeline.drain()
+
+    stats = pipeline.stats()
+    assert stats["delivered"] == 2
+    assert stats["retried"] == 2
+    assert stats["dropped"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_in_flight_window_limits_sends():
+    producer = FakeProducer()
+    pipeline = ProducerPipeline(producer, "topic", max_in_flight=3)
+    for i in range(5):
+        pipeline.put(i)
+
+    assert pipeline.drain() == 3
+    assert pipeline.drain() == 0
+    producer.complete()
+    assert pipeline.drain() == 2
+
+
+def test_drop_when_queue_is_full():
+    pipeline = ProducerPipeline(FakeProducer(), "topic", max_queue_size=2, overflow="drop")
+    assert [pipeline.put(i) for i in range(4)] == [True, True, False, False]
+    assert pipeline.stats()["dropped"] == 2
+
+
+def test_spill_to_disk_and_replay_in_order(tmpdir):
+    spill_path = str(tmpdir.join("spill.jsonl"))
+    producer = FakeProducer(batch_size=100)
+    pipeline = ProducerPipeline(producer, "topic", max_queue_size=3, overflow="spill",
+                                spill_path=spill_path)
+    for i in range(8):
+        pipeline.put(i)
+    assert pipeline.stats()["spilled"] == 5
+
+    sent = []
+    while pipeline.drain():
+        sent.extend(producer.complete()[0])
+    assert sent == list(range(8))
+    assert pipeline.stats()["spill_size"] == 0
+
+    # records still queued at stop are kept for the next start
+    pipeline = ProducerPipeline(FakeProducer(), "topic", max_queue_size=3, overflow="spill",
+                                spill_path=spill_path, max_in_flight=1)
+    for i in range(5):
+        pipeline.put(i)
+    pipeline.stop()
+
+    producer = FakeProducer(batch_size=100)
+    restarted = ProducerPipeline(producer, "topic", max_queue_size=10, overflow="spill",
+                                 spill_path=spill_path)
+    assert restarted.stats()["spill_size"] == 4
+    restarted.drain()
+    assert producer.complete() == [[1, 2, 3, 4]]
+
+
+def test_stop_after_partial_replay_does_not_resend_records(tmpdir):
+    spill_path = str(tmpdir.join("spill.jsonl"))
+    producer = FakeProducer(batch_size=100)
+    pipeline = ProducerPipeline(producer, "topic", max_queue_size=2, overflow="spill",
+                                spill_path=spill_path)
+    for i in range(8):
+        pipeline.put(i)
+    pipeline.drain()
+    # stop replays part of the spill file and leaves nothing queued
+    pipeline.stop()
+    assert producer.complete() == [[0, 1, 2, 3, 4, 5]]
+
+    producer = FakeProducer(batch_size=100)
+    restarted = ProducerPipeline(producer, "topic", max_queue_size=10, overflow="spill",
+                                 spill_path=spill_path)
+    assert restarted.stats()["spill_size"] == 2
+    restarted.drain()
+    assert producer.complete() == [[6, 7]]
+
+
+def test_block_waits_for_space():
+    producer = FakeProducer()
+    pipeline = ProducerPipeline(producer, "topic", max_queue_size=2)
+    pipeline.put(0)
+    pipeline.put(1)
+
+    blocked = gevent.spawn(pipeline.put, 2)
+    gevent.sleep(0.01)
+    assert not blocked.ready()
+
+    pipeline.drain()
+    assert blocked.get(timeout=1) is True
+    assert pipeline.stats()["queue_size"] == 1
+
+
+def test_spill_policy_requires_path():
+    with pytest.raises(ValueError):
+        ProducerPipeline(FakeProducer(), "topic", overflow="spill")
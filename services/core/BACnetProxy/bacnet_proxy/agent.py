@@ -25,6 +25,7 @@
 import logging
 import sys
 import datetime
+import uuid
 
 from volttron.platform.vip.agent import Agent, RPC
 from volttron.platform.async_ import AsyncCall
@@ -38,7 +39,7 @@ bacnet_logger = logging.getLogger("bacpypes")
 bacnet_logger.setLevel(logging.WARNING)
 __version__ = '0.5'
 
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
 
 from queue import Queue, Empty
 
@@ -78,6 +79,7 @@ from bacpypes.primitivedata import (Null, Atomic, Enumerated, Integer,
 from bacpypes.constructeddata import Array, Any, Choice
 from bacpypes.basetypes import ServicesSupported
 from bacpypes.task import TaskManager
+import gevent
 from gevent.event import AsyncResult
 
 from volttron.platform.agent.known_identities import PLATFORM_DRIVER
@@ -104,6 +106,18 @@ class SubscriptionContext:
         self.lifetime = lifetime
 
 
+class ReadPlan:
+    """
+    ReadPropertyMultiple access specifications for a set of points on a device, built once when the plan is
+    registered and reused on every read.
+    """
+    def __init__(self, target_address, chunks, reverse_point_map):
+        self.target_address = target_address
+        # List of (list of ReadAccessSpecification, property count), one entry per request.
+        self.chunks = chunks
+        self.reverse_point_map = reverse_point_map
+
+
 class BACnetApplication(BIPSimpleApplication, RecurringTask):
     def __init__(self, i_am_callback, send_cov_subscription_callback, forward_cov_callback, request_check_interval,
                  *args):
@@ -417,9 +431,13 @@ def bacnet_proxy_agent(config_path, **kwargs):
     ven_id = config.get("vendor_id", 15)
     max_per_request = config.get("default_max_per_request", 1000000)
     request_check_interval = config.get("request_check_interval", 100)
+    max_requests_in_flight = config.get("max_requests_in_flight", 4)
+    max_read_plans = config.get("max_read_plans", 1000)
 
     return BACnetProxyAgent(device_address, max_apdu_len, seg_supported, obj_id, obj_name, ven_id, max_per_request,
-                            request_check_interval=request_check_interval, heartbeat_autostart=True, **kwargs)
+                            request_check_interval=request_check_interval,
+                            max_requests_in_flight=max_requests_in_flight, max_read_plans=max_read_plans,
+                            heartbeat_autostart=True, **kwargs)
 
 
 class BACnetProxyAgent(Agent):
@@ -427,7 +445,7 @@ class BACnetProxyAgent(Agent):
     This agent creates a virtual bacnet device that is used by the bacnet driver interface to communicate with devices.
     """
     def __init__(self, device_address, max_apdu_len, seg_supported, obj_id, obj_name, ven_id, max_per_request,
-                 request_check_interval=100, **kwargs):
+                 request_check_interval=100, max_requests_in_flight=4, max_read_plans=1000, **kwargs):
         super(BACnetProxyAgent, self).__init__(**kwargs)
 
         async_call = AsyncCall()
@@ -448,6 +466,11 @@ class BACnetProxyAgent(Agent):
 
         self.iocb_class = IOCB
         self._max_per_request = max_per_request
+        self._max_requests_in_flight = max(int(max_requests_in_flight), 1)
+        self._max_read_plans = max(int(max_read_plans), 1)
+        # handle -> (key, ReadPlan) in least recently used order
+        self._read_plans = OrderedDict()
+        self._read_plan_handles = {}
 
         self.setup_device(async_call, device_address, max_apdu_len, seg_supported, obj_id, obj_name, ven_id,
                           request_check_interval)
@@ -711,26 +734,12 @@ class BACnetProxyAgent(Agent):
 
         return object_property_map, reverse_point_map
 
-    @RPC.export
-    def read_properties(self, target_address, point_map, max_per_request=None, use_read_multiple=True):
-        """
-        Read a set of points and return the results
-        """
-
-        if not use_read_multiple:
-            return self.read_using_single_request(target_address, point_map)
-
-        # Set max_per_request really high if not set.
-        if max_per_request is None:
-            max_per_request = self._max_per_request
-
-        _log.debug("Reading {count} points on {target}, max per scrape: {max}".format(
-            count=len(point_map), target=target_address, max=max_per_request))
+    def _build_read_plan(self, target_address, point_map, max_per_request):
         # process point map and populate object_property_map and
         # reverse_point_map
         (object_property_map, reverse_point_map) = self._get_object_properties(point_map, target_address)
 
-        result_dict = {}
+        chunks = []
         finished = False
 
         while not finished:
@@ -747,23 +756,136 @@ class BACnetProxyAgent(Agent):
                 read_access_spec_list.append(spec_list)
 
             if read_access_spec_list:
+                chunks.append((read_access_spec_list, count))
+
+        return ReadPlan(target_address, chunks, reverse_point_map)
+
+    def _read_plan_chunks(self, read_plan):
+        """
+        Sends the ReadPropertyMultiple requests of a read plan keeping up to max_requests_in_flight of them
+        outstanding at once, so a device with many chunks is read in about one round trip per window instead of one
+        per chunk.
+
+        If a request fails no further requests are sent, and the requests still outstanding are waited for before the
+        error is raised so their responses are not left pending in the application.
+        """
+        target_address = read_plan.target_address
+        result_dict = {}
+        in_flight = deque()
+
+        def collect():
+            iocb, count = in_flight.popleft()
+            bacnet_results = iocb.ioResult.get(10)
+
+            _log.debug("Received read response from {target} count: {count}".format(
+                count=count, target=target_address))
+
+            for prop_tuple, value in bacnet_results.items():
+                name = read_plan.reverse_point_map[prop_tuple]
+                result_dict[name] = value
+
+        try:
+            for read_access_spec_list, count in read_plan.chunks:
+                if len(in_flight) >= self._max_requests_in_flight:
+                    collect()
+
                 _log.debug("Requesting {count} properties from {target}".format(count=count, target=target_address))
                 request = ReadPropertyMultipleRequest(listOfReadAccessSpecs=read_access_spec_list)
                 request.pduDestination = Address(target_address)
 
                 iocb = self.iocb_class(request)
                 self.bacnet_application.submit_request(iocb)
-                bacnet_results = iocb.ioResult.get(10)
-
-                _log.debug("Received read response from {target} count: {count}".format(
-                    count=count, target=target_address))
+                in_flight.append((iocb, count))
 
-                for prop_tuple, value in bacnet_results.items():
-                    name = reverse_point_map[prop_tuple]
-                    result_dict[name] = value
+            while in_flight:
+                collect()
+        except BaseException:
+            if in_flight:
+                _log.debug("Waiting for {count} outstanding requests to {target} after a failed read".format(
+                    count=len(in_flight), target=target_address))
+                gevent.wait([iocb.ioResult for iocb, _ in in_flight], timeout=10)
+            raise
 
         return result_dict
 
+    @RPC.export
+    def read_properties(self, target_address, point_map, max_per_request=None, use_read_multiple=True):
+        """
+        Read a set of points and return the results
+        """
+
+        if not use_read_multiple:
+            return self.read_using_single_request(target_address, point_map)
+
+        # Set max_per_request really high if not set.
+        if max_per_request is None:
+            max_per_request = self._max_per_request
+
+        _log.debug("Reading {count} points on {target}, max per scrape: {max}".format(
+            count=len(point_map), target=target_address, max=max_per_request))
+
+        return self._read_plan_chunks(self._build_read_plan(target_address, point_map, max_per_request))
+
+    @RPC.export
+    def register_read_plan(self, target_address, point_map, max_per_request=None):
+        """
+        Register a set of points to be read repeatedly with read_plan.
+
+        Registering the same points for the same device again returns the existing handle. At most max_read_plans
+        plans are kept, the least recently used plan is dropped when a new plan would exceed that.
+
+        :param target_address: address of the device
+        :param point_map: dictionary of point name to [object type, instance number, property, (index)]
+        :param max_per_request: maximum number of objects per ReadPropertyMultiple request
+        :return: handle to pass to read_plan
+        """
+        if max_per_request is None:
+            max_per_request = self._max_per_request
+
+        key = (target_address, max_per_request,
+               tuple(sorted((name, tuple(properties)) for name, properties in point_map.items())))
+        handle = self._read_plan_handles.get(key)
+        if handle is not None:
+            self._read_plans.move_to_end(handle)
+            return handle
+
+        handle = uuid.uuid4().hex
+        self._read_plans[handle] = (key, self._build_read_plan(target_address, point_map, max_per_request))
+        self._read_plan_handles[key] = handle
+        _log.debug("Registered read plan {handle} for {count} points on {target}".format(
+            handle=handle, count=len(point_map), target=target_address))
+
+        # Plans of drivers that went away without unregistering are dropped least recently used first.
+        while len(self._read_plans) > self._max_read_plans:
+            expired_handle, (expired_key, _) = self._read_plans.popitem(last=False)
+            self._read_plan_handles.pop(expired_key, None)
+            _log.debug("Dropped least recently used read plan {}".format(expired_handle))
+        return handle
+
+    @RPC.export
+    def unregister_read_plan(self, handle):
+        """
+        Forget a read plan registered with register_read_plan.
+        """
+        key, _ = self._read_plans.pop(handle, (None, None))
+        if key is not None:
+            self._read_plan_handles.pop(key, None)
+
+    @RPC.export
+    def read_plan(self, handle):
+        """
+        Read the points of a registered read plan and return the results
+
+        :raises ValueError: if the handle is unknown, for example because the proxy restarted. The caller should
+            register the plan again.
+        """
+        try:
+            _, read_plan = self._read_plans[handle]
+        except KeyError:
+            raise ValueError("Unknown read plan: {}".format(handle))
+        self._read_plans.move_to_end(handle)
+        return self._read_plan_chunks(read_plan)
+
     @RPC.export
     def create_cov_subscription(self, address, device_path, point_name, object_type, instance_number, lifetime=None):
         """
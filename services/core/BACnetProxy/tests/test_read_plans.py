@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+import gevent
+import pytest
+
+from volttron.platform.vip.agent import Agent
+from volttrontesting.utils.utils import AgentMock
+
+from bacnet_proxy.agent import BACnetProxyAgent
+
+BACnetProxyAgent.__bases__ = (AgentMock.imitate(Agent, Agent()),)
+
+
+class FakeApplication:
+    """
+    Stands in for the BACpypes application. Requests are answered from the greenlet loop after submission, so several
+    can be outstanding at once, and requests for objects in fail_instances fail before the others are answered.
+    """
+
+    def __init__(self, fail_instances=()):
+        self.fail_instances = set(fail_instances)
+        self.submitted = []
+        self.outstanding = 0
+        self.max_outstanding = 0
+
+    def submit_request(self, iocb):
+        self.submitted.append(iocb)
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        failing = any(spec.objectIdentifier[1] in self.fail_instances
+                      for spec in iocb.ioRequest.listOfReadAccessSpecs)
+        gevent.spawn_later(0.01 if failing else 0.05, self._respond, iocb)
+
+    def _respond(self, iocb):
+        self.outstanding -= 1
+        result = {}
+        for spec in iocb.ioRequest.listOfReadAccessSpecs:
+            object_type, instance = spec.objectIdentifier
+            if instance in self.fail_instances:
+                iocb.ioResult.set_exception(RuntimeError("Device communication aborted"))
+                return
+            for reference in spec.listOfPropertyReferences:
+                result[object_type, instance, reference.propertyIdentifier, reference.propertyArrayIndex] = instance
+        iocb.ioResult.set(result)
+
+
+@pytest.fixture
+def proxy(monkeypatch):
+    monkeypatch.setattr(BACnetProxyAgent, "setup_device", lambda *args, **kwargs: None)
+    agent = BACnetProxyAgent("10.0.0.1", 1024, "segmentedBoth", 599, "proxy", 15, 1000,
+                             max_requests_in_flight=2, max_read_plans=2)
+    agent.bacnet_application = FakeApplication()
+    return agent
+
+
+def point_map(count):
+    return {"point{}".format(i): ["analogInput", i, "presentValue"] for i in range(count)}
+
+
+@pytest.mark.driver_unit
+def test_read_plan_pipelines_chunks(proxy):
+    handle = proxy.register_read_plan("10.0.0.2", point_map(5), max_per_request=1)
+
+    result = proxy.read_plan(handle)
+
+    assert result == {"point{}".format(i): i for i in range(5)}
+    assert len(proxy.bacnet_application.submitted) == 5
+    assert proxy.bacnet_application.max_outstanding == 2
+
+
+@pytest.mark.driver_unit
+def test_read_properties_uses_same_pipeline(proxy):
+    assert proxy.read_properties("10.0.0.2", point_map(3), max_per_request=2) == {"point0": 0, "point1": 1,
+                                                                                 "point2": 2}
+    assert len(proxy.bacnet_application.submitted) == 2
+
+
+@pytest.mark.driver_unit
+def test_failed_chunk_collects_outstanding_requests(proxy):
+    # chunks are built from the end of the point map, so instance 4 is the first request
+    proxy.bacnet_application = FakeApplication(fail_instances=[4])
+    handle = proxy.register_read_plan("10.0.0.2", point_map(5), max_per_request=1)
+
+    with pytest.raises(RuntimeError):
+        proxy.read_plan(handle)
+
+    submitted = proxy.bacnet_application.submitted
+    assert len(submitted) == 2
+    assert all(iocb.ioResult.ready() for iocb in submitted)
+    assert proxy.bacnet_application.outstanding == 0
+
+
+@pytest.mark.driver_unit
+def test_register_read_plan_reuses_handle(proxy):
+    handle = proxy.register_read_plan("10.0.0.2", point_map(2))
+
+    assert proxy.register_read_plan("10.0.0.2", point_map(2)) == handle
+    assert proxy.register_read_plan("10.0.0.2", point_map(2), max_per_request=1) != handle
+
+    proxy.unregister_read_plan(handle)
+    with pytest.raises(ValueError, match="Unknown read plan"):
+        proxy.read_plan(handle)
+    assert proxy.register_read_plan("10.0.0.2", point_map(2)) != handle
+
+
+@pytest.mark.driver_unit
+def test_least_recently_used_read_plan_is_dropped(proxy):
+    first = proxy.register_read_plan("10.0.0.2", point_map(1))
+    second = proxy.register_read_plan("10.0.0.3", point_map(1))
+    proxy.read_plan(first)
+
+    third = proxy.register_read_plan("10.0.0.4", point_map(1))
+
+    assert set(proxy._read_plans) == {first, third}
+    with pytest.raises(ValueError, match="Unknown read plan"):
+        proxy.read_plan(second)
+    assert len(proxy._read_plan_handles) == 2
@@ -12,7 +12,7 @@ from volttron.platform.vip.agent import Agent, Core, RPC
 # from dnp3_python.dnp3station.outstation import MyOutStation as MyOutStationNew
 from dnp3_python.dnp3station.outstation_new import MyOutStationNew
 from pydnp3 import opendnp3
-from typing import Dict
+from typing import Dict, List
 
 
 
@@ -23,6 +23,14 @@ __version__ = "0.2.0"
 _log.level=logging.DEBUG
 _log.addHandler(logging.StreamHandler(sys.stdout))  # Note: redirect stdout from dnp3 lib
 
+# point_type: (opendnp3 measurement, value type)
+POINT_TYPES = {
+    "analog_input": (opendnp3.Analog, float),
+    "analog_output": (opendnp3.AnalogOutputStatus, float),
+    "binary_input": (opendnp3.Binary, bool),
+    "binary_output": (opendnp3.BinaryOutputStatus, bool),
+}
+
 
 # def agent_main(config_path, **kwargs):
 #     """
@@ -73,6 +81,9 @@ class Dnp3Agent(Agent):
         # agent configuration using volttron config framework
         # self._dnp3_outstation_config = default_config
         config_from_path = self._parse_config(config_path)
+        # point_mapping is for the agent, not for MyOutStationNew
+        config_from_path = dict(config_from_path)
+        self._point_mapping = self._parse_point_mapping(config_from_path.pop("point_mapping", {}))
 
         # TODO: improve this logic by refactoring out the MyOutstationNew init,
         #  and add config from "config store"
@@ -121,6 +132,13 @@ class Dnp3Agent(Agent):
         # for dnp3 outstation
         self.outstation_application.start()
 
+        # update the database straight from the device scrapes in point_mapping
+        for topic in self._point_mapping:
+            _log.debug(f"Subscribing to {topic}")
+            self.vip.pubsub.subscribe(peer='pubsub',
+                                      prefix=topic,
+                                      callback=self._on_device_publish)
+
         # Example publish to pubsub
         # self.vip.pubsub.publish('pubsub', "some/random/topic", message="HI!")
         #
@@ -130,6 +148,61 @@ class Dnp3Agent(Agent):
         # self._create_subscriptions(self.setting2)
 
     # ***************** Helper methods ********************
+    @staticmethod
+    def _parse_point_mapping(point_mapping: Dict) -> Dict[str, List[tuple]]:
+        """Validates the point_mapping configuration, e.g.,
+        {"devices/campus/building/meter/all": {
+            "Power": {"point_type": "analog_input", "index": 0},
+            "Breaker": {"point_type": "binary_input", "index": 3}}}
+
+        :return: for each topic, a list of (point name, point_type, index)
+        """
+        parsed = {}
+        for topic, points in point_mapping.items():
+            if not topic.endswith("/all"):
+                raise ValueError(f"point_mapping topic {topic} is not a device 'all' topic")
+            parsed[topic] = []
+            for point_name, point in points.items():
+                point_type = point.get("point_type")
+                if point_type not in POINT_TYPES:
+                    raise ValueError(f"Unknown point_type {point_type} for {topic} {point_name}, "
+                                     f"expected one of {list(POINT_TYPES)}")
+                parsed[topic].append((point_name, point_type, int(point["index"])))
+        return parsed
+
+    @staticmethod
+    def _make_measurement(point_type: str, val):
+        """Builds the opendnp3 measurement for a point_type from a JSON value."""
+        measurement, value_type = POINT_TYPES[point_type]
+        if value_type is bool:
+            if not isinstance(val, (bool, int)) or isinstance(val, int) and val not in (0, 1):
+                raise ValueError(f"val {val} for {point_type} should be bool")
+            return measurement(value=bool(val))
+        if isinstance(val, bool) or not isinstance(val, (int, float)):
+            raise ValueError(f"val {val} for {point_type} should be float")
+        return measurement(value=float(val))
+
+    def _apply_updates(self, measurements: List[tuple]) -> None:
+        for measurement, index in measurements:
+            self.outstation_application.apply_update(measurement, index)
+
+    def _on_device_publish(self, peer, sender, bus, topic, headers, message):
+        """Applies a device scrape to the mapped outstation indexes in one pass."""
+        points = self._point_mapping.get(topic)
+        if not points:
+            return
+        values = message[0] if isinstance(message, list) else message
+        measurements = []
+        for point_name, point_type, index in points:
+            if point_name not in values:
+                continue
+            try:
+                measurements.append((self._make_measurement(point_type, values[point_name]), index))
+            except ValueError as e:
+                _log.debug(f"Skipping {topic} {point_name}: {e}")
+        self._apply_updates(measurements)
+        _log.debug(f"Updated {len(measurements)} outstation points from {topic}")
+
     def _parse_config(self, config_path: str) -> Dict:
         """Parses the agent's configuration file.
 
@@ -241,6 +314,24 @@ class Dnp3Agent(Agent):
 
         return self.outstation_application.db_handler.db
 
+    @RPC.export
+    def apply_update_bulk(self, updates: List[list]) -> int:
+        """public interface to update many points of mixed types in one call
+        updates: list of [point_type, index, val], point_type being one of
+            "analog_input", "analog_output", "binary_input", "binary_output"
+        All updates are validated before any is applied.
+        Returns the number of points updated.
+        """
+        measurements = []
+        for point_type, index, val in updates:
+            if point_type not in POINT_TYPES:
+                raise ValueError(f"Unknown point_type {point_type}, expected one of {list(POINT_TYPES)}")
+            measurements.append((self._make_measurement(point_type, val), int(index)))
+        self._apply_updates(measurements)
+        _log.debug(f"Updated {len(measurements)} outstation points")
+
+        return len(measurements)
+
     @RPC.export
     def update_outstation(self,
                           outstation_ip: str = None,
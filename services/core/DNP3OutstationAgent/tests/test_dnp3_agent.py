@@ -229,6 +229,24 @@ def test_outstation_apply_update_binary_output(vip_agent, dnp3_outstation_agent)
     assert val_new == val
 
 
+def test_outstation_apply_update_bulk(vip_agent, dnp3_outstation_agent):
+    peer = dnp3_vip_identity
+    method = Dnp3OutstationAgent.apply_update_bulk
+    peer_method = method.__name__  # "apply_update_bulk"
+    analog_vals = [random.random() for _ in range(5)]
+    binary_vals = [random.choice([True, False]) for _ in range(5)]
+    updates = [["analog_input", index, val] for index, val in enumerate(analog_vals)] + \
+              [["binary_output", index, val] for index, val in enumerate(binary_vals)]
+    rs = vip_agent.vip.rpc.call(peer, peer_method, updates).get(timeout=5)
+    print(datetime.datetime.now(), "rs: ", rs)
+    assert rs == len(updates)
+
+    # verify
+    rs = vip_agent.vip.rpc.call(peer, "display_outstation_db").get(timeout=5)
+    assert [rs.get("Analog").get(str(index)) for index in range(5)] == analog_vals
+    assert [rs.get("BinaryOutputStatus").get(str(index)) for index in range(5)] == binary_vals
+
+
 def test_outstation_update_config_with_restart(vip_agent, dnp3_outstation_agent):
     peer = dnp3_vip_identity
     method = Dnp3OutstationAgent.update_outstation
@@ -0,0 +1,140 @@
+from types import SimpleNamespace
+
+import pytest
+try:
+    from paho.mqtt.client import MQTT_ERR_NO_CONN, MQTT_ERR_SUCCESS
+except ImportError:
+    pytest.skip("paho-mqtt not found!", allow_module_level=True)
+
+from volttron.platform.agent.base_historian import BaseHistorianAgent
+from volttron.platform.vip.agent import Agent
+from volttrontesting.utils.utils import AgentMock
+
+BaseHistorianAgent.__bases__ = (AgentMock.imitate(Agent, Agent()),)
+
+from mqtt_historian import agent as mqtt_agent
+
+
+class FakeClient:
+    """Stands in for paho's Client; acknowledges publishes on demand."""
+
+    instances = []
+
+    def __init__(self, client_id='', protocol=None, reconnect_on_failure=True):
+        self.connects = 0
+        self.refuse = False
+        self.ack_on_publish = True
+        self.published = []
+        self.unacked = []
+        self.connected = False
+        self.mid = 0
+        FakeClient.instances.append(self)
+
+    def max_inflight_messages_set(self, inflight):
+        self.max_inflight = inflight
+
+    def connect(self, host, port=1883, keepalive=60):
+        self.connects += 1
+        if self.refuse:
+            raise ConnectionRefusedError("refused")
+        self.connected = True
+        self.on_connect(self, None, {}, 0)
+
+    def loop_start(self):
+        pass
+
+    def loop_stop(self):
+        pass
+
+    def disconnect(self):
+        self.connected = False
+
+    def drop(self):
+        self.connected = False
+        self.on_disconnect(self, None, 1)
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        if not self.connected:
+            return SimpleNamespace(rc=MQTT_ERR_NO_CONN, mid=None)
+        self.mid += 1
+        self.published.append(topic)
+        if self.ack_on_publish:
+            # paho may run the callback before publish() returns
+            self.on_publish(self, None, self.mid)
+        else:
+            self.unacked.append(self.mid)
+        return SimpleNamespace(rc=MQTT_ERR_SUCCESS, mid=self.mid)
+
+    def ack_all(self):
+        unacked, self.unacked = self.unacked, []
+        for mid in unacked:
+            self.on_publish(self, None, mid)
+
+
+@pytest.fixture
+def historian(monkeypatch):
+    FakeClient.instances = []
+    monkeypatch.setattr(mqtt_agent, "Client", FakeClient)
+    historian = mqtt_agent.MQTTHistorian(connection={"mqtt_qos": 1, "mqtt_ack_timeout": 0.05,
+                                                     "mqtt_max_inflight": 3})
+    historian.historian_setup()
+    return historian
+
+
+def records(count, start=0):
+    return [{"_id": i, "topic": "t/{}".format(i), "value": i} for i in range(start, start + count)]
+
+
+def handled(historian):
+    published, historian._successful_published = historian._successful_published, set()
+    return published
+
+
+def test_single_connection_across_batches(historian):
+    historian.publish_to_historian(records(5))
+    historian.publish_to_historian(records(5, start=5))
+
+    client = FakeClient.instances[0]
+    assert client.connects == 1
+    assert len(client.published) == 10
+    assert handled(historian) == set(range(10))
+
+
+def test_only_acknowledged_records_are_handled(historian):
+    client = FakeClient.instances[0]
+    client.ack_on_publish = False
+
+    # the in-flight window stops the batch once 3 publishes are unacknowledged
+    historian.publish_to_historian(records(5))
+    assert len(client.published) == 3
+    assert handled(historian) == set()
+
+    # records still in flight are not sent again; late acks are reported
+    client.ack_all()
+    historian.publish_to_historian(records(5))
+    assert client.published == ["t/0", "t/1", "t/2", "t/3", "t/4"]
+    assert handled(historian) == {0, 1, 2}
+
+
+def test_reconnect_after_disconnect_with_backoff(historian, monkeypatch):
+    client = FakeClient.instances[0]
+    historian.publish_to_historian(records(1))
+    handled(historian)
+
+    client.drop()
+    client.refuse = True
+    monkeypatch.setattr(mqtt_agent.random, "uniform", lambda low, high: high)
+    historian.publish_to_historian(records(1, start=1))
+    assert handled(historian) == set()
+    assert client.connects == 2
+
+    # still backing off; no new connection attempt is made
+    historian.publish_to_historian(records(1, start=1))
+    assert client.connects == 2
+
+    client.refuse = False
+    historian._next_connect = 0
+    historian.publish_to_historian(records(1, start=1))
+    assert client.connects == 3
+    assert handled(historian) == {1}
+    assert historian._connect_failures == 0
@@ -23,22 +23,22 @@
 # }}}
 
 
-import datetime
 import logging
+import random
 import sys
+import threading
 import time
 
 from volttron.platform import jsonapi
 from volttron.platform.agent.base_historian import BaseHistorian
 from volttron.platform.agent import utils
 
-from paho.mqtt.client import MQTTv311, MQTTv31
-import paho.mqtt.publish as publish
+from paho.mqtt.client import Client, MQTTv311, MQTTv31, MQTT_ERR_SUCCESS, connack_string
 
 
 utils.setup_logging()
 _log = logging.getLogger(__name__)
-__version__ = '0.2'
+__version__ = '0.3'
 
 
 def historian(config_path, **kwargs):
@@ -85,50 +85,180 @@ class MQTTHistorian(BaseHistorian):
 
         self.mqtt_protocol = protocol
 
-        # will be available in both threads.
-        self._last_error = 0
+        # Session settings for the long-lived client.
+        self.mqtt_max_inflight = connection.get('mqtt_max_inflight', 100)
+        self.mqtt_ack_timeout = connection.get('mqtt_ack_timeout', 30)
+        self.mqtt_reconnect_min_delay = connection.get('mqtt_reconnect_min_delay', 1)
+        self.mqtt_reconnect_max_delay = connection.get('mqtt_reconnect_max_delay', 120)
+
+        if self.mqtt_max_inflight < 1:
+            raise ValueError("mqtt_max_inflight must be at least 1")
+
+        # Shared between the publishing thread and the paho network thread.
+        self._client = None
+        self._connected = False
+        self._connack = threading.Event()
+        self._session_lock = threading.Condition()
+        self._inflight = {}
+        self._pending_ids = set()
+        self._early_acks = set()
+        self._acked = []
+        self._connect_failures = 0
+        self._next_connect = 0
 
         super(MQTTHistorian, self).__init__(**kwargs)
 
-    def timestamp(self):
-        return time.mktime(datetime.datetime.now().timetuple())
+    def historian_setup(self):
+        client = Client(client_id=self.mqtt_client_id, protocol=self.mqtt_protocol,
+                        reconnect_on_failure=False)
+        if self.mqtt_auth is not None:
+            client.username_pw_set(self.mqtt_auth['username'], self.mqtt_auth.get('password'))
+        if self.mqtt_will is not None:
+            client.will_set(self.mqtt_will['topic'], self.mqtt_will.get('payload'),
+                            self.mqtt_will.get('qos', 0), self.mqtt_will.get('retain', False))
+        if self.mqtt_tls is not None:
+            tls = dict(self.mqtt_tls)
+            insecure = tls.pop('insecure', False)
+            client.tls_set(**tls)
+            if insecure:
+                client.tls_insecure_set(insecure)
+        # Let paho send as much as our own window allows.
+        client.max_inflight_messages_set(self.mqtt_max_inflight)
+        client.on_connect = self._on_connect
+        client.on_disconnect = self._on_disconnect
+        client.on_publish = self._on_publish
+
+        self._client = client
+        self._connected = False
+        self._connect_failures = 0
+        self._next_connect = 0
+        self._acked = []
+        self._reset_inflight()
+
+    def historian_teardown(self):
+        client, self._client = self._client, None
+        if client is None:
+            return
+        self._connected = False
+        client.disconnect()
+        client.loop_stop()
+        self._reset_inflight()
+
+    def _reset_inflight(self):
+        with self._session_lock:
+            self._inflight.clear()
+            self._pending_ids = {x['_id'] for x in self._acked}
+            self._early_acks.clear()
+            self._session_lock.notify_all()
+
+    def _on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            self._connected = True
+        else:
+            _log.warning("MQTT broker refused connection: {}".format(connack_string(rc)))
+        self._connack.set()
+
+    def _on_disconnect(self, client, userdata, rc):
+        if rc != 0:
+            _log.warning("Lost connection to MQTT broker (rc={})".format(rc))
+        self._connected = False
+        # Anything not yet acknowledged stays in the cache and is sent again
+        # on the next session.
+        self._reset_inflight()
+
+    def _on_publish(self, client, userdata, mid):
+        with self._session_lock:
+            record = self._inflight.pop(mid, None)
+            if record is None:
+                # paho can acknowledge before publish() has returned the mid.
+                self._early_acks.add(mid)
+            else:
+                self._acked.append(record)
+            self._session_lock.notify_all()
+
+    def _ensure_connected(self):
+        """
+        Connects the client if it is not connected and the reconnect back-off
+        has elapsed. Returns True if the client is connected.
+        """
+        if self._connected:
+            return True
+        now = time.monotonic()
+        if now < self._next_connect:
+            return False
+
+        client = self._client
+        client.loop_stop()
+        self._connack.clear()
+        try:
+            client.connect(self.mqtt_hostname, port=self.mqtt_port, keepalive=self.mqtt_keepalive)
+            client.loop_start()
+            self._connack.wait(self.mqtt_ack_timeout)
+        except Exception as e:
+            _log.warning("Exception ({}) raised connecting to MQTT broker: {}".format(e.__class__.__name__, e))
+
+        if self._connected:
+            self._connect_failures = 0
+            return True
+
+        # Exponential back-off with jitter so many historians don't retry a
+        # recovering broker in lock step.
+        delay = min(self.mqtt_reconnect_max_delay,
+                    self.mqtt_reconnect_min_delay * 2 ** self._connect_failures)
+        delay = random.uniform(delay / 2, delay)
+        self._connect_failures += 1
+        self._next_connect = time.monotonic() + delay
+        _log.debug("Retrying MQTT connection in {:.1f} seconds".format(delay))
+        return False
+
+    def _wait_for_window(self, limit, deadline):
+        with self._session_lock:
+            while len(self._inflight) > limit and self._connected:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._session_lock.wait(remaining)
+            return self._connected
 
     def publish_to_historian(self, to_publish_list):
         _log.debug("publish_to_historian number of items: {}".format(len(to_publish_list)))
-        if self._last_error:
-            # if we failed we need to wait 60 seconds before we go on.
-            if self.timestamp() < self._last_error + 60:
-                _log.debug('Not allowing send < 60 seconds from failure')
-                return
+        if not self._ensure_connected():
+            return
 
-        to_send = []
+        deadline = time.monotonic() + self.mqtt_ack_timeout
         for x in to_publish_list:
-            topic = x['topic']
+            # Sent with an earlier batch and not yet reported handled.
+            if x['_id'] in self._pending_ids:
+                continue
+            if not self._wait_for_window(self.mqtt_max_inflight - 1, deadline):
+                break
 
             # Construct payload from data in the publish item.
             # Available fields: 'value', 'headers', and 'meta'
             payload = jsonapi.dumps(x['value'])
-            _log.debug(f'payload: {payload}, topic {topic}')
 
-            to_send.append({'topic': topic,
-                            'payload': payload,
-                            'qos': self.mqtt_qos,
-                            'retain': self.mqtt_retain})
+            info = self._client.publish(x['topic'], payload, qos=self.mqtt_qos, retain=self.mqtt_retain)
+            if info.rc != MQTT_ERR_SUCCESS:
+                _log.warning("MQTT publish failed (rc={})".format(info.rc))
+                break
+            with self._session_lock:
+                self._pending_ids.add(x['_id'])
+                if info.mid in self._early_acks:
+                    self._early_acks.discard(info.mid)
+                    self._acked.append(x)
+                else:
+                    self._inflight[info.mid] = x
 
-        try:
-            publish.multiple(to_send,
-                             hostname=self.mqtt_hostname,
-                             port=self.mqtt_port,
-                             client_id=self.mqtt_client_id,
-                             keepalive=self.mqtt_keepalive,
-                             will=self.mqtt_will,
-                             auth=self.mqtt_auth,
-                             tls=self.mqtt_tls,
-                             protocol=self.mqtt_protocol)
-            self.report_all_handled()
-        except Exception as e:
-            _log.warning("Exception ({}) raised by publish: {}".format(e.__class__.__name__, e))
-            self._last_error = self.timestamp()
+        # Give the broker until the deadline to acknowledge the batch. Records
+        # acknowledged later are reported with the next batch.
+        self._wait_for_window(0, deadline)
+
+        with self._session_lock:
+            acked, self._acked = self._acked, []
+            self._pending_ids.difference_update(x['_id'] for x in acked)
+            self._early_acks.clear()
+        if acked:
+            self.report_handled(acked)
 
 
 def main(argv=sys.argv):
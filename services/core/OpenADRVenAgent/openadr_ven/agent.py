@@ -47,6 +47,7 @@ from .volttron_openadr_client import (
     OpenADRMeasurements,
     OpenADROpt,
 )
+from .report_source import DeviceReportSource
 
 from .constants import (
     REQUIRED_KEYS,
@@ -61,6 +62,7 @@ from .constants import (
     CA_FILE,
     VEN_ID,
     DISABLE_SIGNATURE,
+    REPORT_SOURCES,
 )
 
 from openleadr.objects import Event
@@ -121,9 +123,46 @@ class OpenADRVenAgent(Agent):
         # and then add it as the second input for 'self.ven_client.add_handler(<some event>, <coroutine>)'
         self.ven_client.add_handler("on_event", self.handle_event)
 
+        self._configure_report_source(config.get(REPORT_SOURCES) or [])
+
         _log.info("Starting OpenADRVen agent...")
         gevent.spawn_later(3, self._start_asyncio_loop)
 
+    def _configure_report_source(self, report_sources: list) -> None:
+        """Subscribes to the device topics of the configured report sources and registers
+        a report for each resource that is answered from the recent samples in memory.
+
+        :param report_sources: the report source configurations
+        """
+        self.vip.pubsub.unsubscribe(peer="pubsub", prefix=None, callback=None)
+        self.report_source = DeviceReportSource(report_sources)
+        for topic in self.report_source.topics:
+            self.vip.pubsub.subscribe(
+                peer="pubsub",
+                prefix=topic,
+                callback=self.report_source.on_device_publish,
+            )
+
+        for resource in self.report_source.resources.values():
+            kwargs = {"data_collection_mode": resource.data_collection_mode}
+            if resource.sampling_interval:
+                kwargs["sampling_rate"] = (
+                    resource.sampling_interval,
+                    resource.sampling_interval,
+                    False,
+                )
+            report_specifier_id, r_id = self.ven_client.add_report(
+                callback=resource.callback(),
+                report_name=resource.report_name,
+                resource_id=resource.resource_id,
+                measurement=resource.measurement,
+                **kwargs,
+            )
+            _log.info(
+                f"Reporting {resource.topic} {resource.point} as {resource.resource_id}: "
+                f"report_specifier_id: {report_specifier_id}, r_id: {r_id}"
+            )
+
     def _start_asyncio_loop(self) -> None:
         loop = asyncio.get_event_loop()
         loop.create_task(self.ven_client.run())
@@ -250,6 +289,7 @@ class OpenADRVenAgent(Agent):
         show_fingerprint = bool(config.get(SHOW_FINGERPRINT, True))
         ven_id = config.get(VEN_ID)
         disable_signature = bool(config.get(DISABLE_SIGNATURE))
+        report_sources = config.get(REPORT_SOURCES, [])
 
         return {
             VEN_NAME: ven_name,
@@ -263,6 +303,7 @@ class OpenADRVenAgent(Agent):
             CA_FILE: ca_file,
             VEN_ID: ven_id,
             DISABLE_SIGNATURE: disable_signature,
+            REPORT_SOURCES: report_sources,
         }
 
     def _check_required_key(self, required_key: str, key_actual: str) -> None:
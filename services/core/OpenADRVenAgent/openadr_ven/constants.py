@@ -34,4 +34,5 @@ SHOW_FINGERPRINT = "show_fingerprint"
 CA_FILE = "ca_file"
 VEN_ID = "ven_id"
 DISABLE_SIGNATURE = "disable_signature"
+REPORT_SOURCES = "report_sources"
 REQUIRED_KEYS = [VEN_NAME, VTN_URL]
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+import logging
+
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from volttron.platform.agent.utils import get_aware_utc_now, parse_timestamp_string
+from volttron.platform.messaging import headers as headers_mod
+
+_log = logging.getLogger(__name__)
+
+AGGREGATIONS = {
+    "mean": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "last": lambda values: values[-1],
+}
+
+DATA_COLLECTION_MODES = ("incremental", "full")
+
+
+class ReportResource:
+    """Configuration and recent samples of one reported resource.
+
+    :param resource_id: The resource_id reported to the VTN
+    :param topic: The device 'all' topic the samples come from
+    :param point: The point in the device publish holding the value
+    :param report_name: An OpenADR name for the report
+    :param measurement: The quantity that is being measured
+    :param data_collection_mode: 'incremental' reports one value per report, 'full' reports
+        one aggregated value per sampling interval of the requested period
+    :param sampling_interval: Seconds per reported value, or None to report the latest sample
+    :param aggregation: How samples within a sampling interval are combined
+    :param max_samples: Size of the ring of recent samples
+    """
+
+    def __init__(
+        self,
+        resource_id: str,
+        topic: str,
+        point: str,
+        report_name: str = "TELEMETRY_USAGE",
+        measurement: str = "power_real",
+        data_collection_mode: str = "incremental",
+        sampling_interval: Optional[float] = None,
+        aggregation: str = "mean",
+        max_samples: int = 1000,
+    ) -> None:
+        if data_collection_mode not in DATA_COLLECTION_MODES:
+            raise ValueError(
+                f"data_collection_mode must be one of {DATA_COLLECTION_MODES}, got {data_collection_mode}"
+            )
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(
+                f"aggregation must be one of {list(AGGREGATIONS)}, got {aggregation}"
+            )
+        if data_collection_mode == "full" and not sampling_interval:
+            raise ValueError(f"{resource_id}: 'full' reports require a sampling_interval")
+
+        self.resource_id = resource_id
+        self.topic = topic
+        self.point = point
+        self.report_name = report_name
+        self.measurement = measurement
+        self.data_collection_mode = data_collection_mode
+        self.sampling_interval = (
+            timedelta(seconds=sampling_interval) if sampling_interval else None
+        )
+        self.aggregation = aggregation
+        self._aggregate = AGGREGATIONS[aggregation]
+        # (timestamp, value), oldest first
+        self.samples = deque(maxlen=max_samples)
+
+    def add_sample(self, timestamp: datetime, value: float) -> None:
+        self.samples.append((timestamp, value))
+
+    def latest(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Value for an incremental report: the aggregate of the samples in the last
+        sampling interval, or the latest sample if there is no sampling interval.
+        """
+        if not self.samples:
+            return None
+        if self.sampling_interval is None:
+            return self.samples[-1][1]
+        start = (now or get_aware_utc_now()) - self.sampling_interval
+        values = [value for timestamp, value in self.samples if timestamp >= start]
+        return self._aggregate(values) if values else None
+
+    def intervals(
+        self,
+        date_from: datetime,
+        date_to: datetime,
+        sampling_interval: Optional[timedelta] = None,
+    ) -> List[Tuple[datetime, float]]:
+        """Values for a full report: one (interval start, aggregate) for each sampling
+        interval between date_from and date_to that has samples.
+        """
+        interval = sampling_interval or self.sampling_interval
+        buckets = {}
+        for timestamp, value in self.samples:
+            if date_from <= timestamp < date_to:
+                buckets.setdefault((timestamp - date_from) // interval, []).append(value)
+        return [
+            (date_from + interval * bucket, self._aggregate(values))
+            for bucket, values in sorted(buckets.items())
+        ]
+
+    def callback(self) -> Callable:
+        """Report callback for the OpenADR client, answered from the ring."""
+        if self.data_collection_mode == "full":
+
+            def full_report(date_from, date_to, sampling_interval):
+                return self.intervals(date_from, date_to, sampling_interval)
+
+            return full_report
+
+        def incremental_report():
+            return self.latest()
+
+        return incremental_report
+
+
+class DeviceReportSource:
+    """Serves OpenADR report values from device publishes on the message bus.
+
+    Each configured resource keeps a bounded ring of recent samples of one point of a
+    device 'all' topic, so report callbacks are answered from memory instead of with an
+    RPC or historian query per report.
+
+    :param report_sources: List of resource configurations, see :py:class:`ReportResource`
+    """
+
+    def __init__(self, report_sources: List[Dict]) -> None:
+        self.resources: Dict[str, ReportResource] = {}
+        self._by_topic: Dict[str, List[ReportResource]] = {}
+        for source in report_sources:
+            resource = ReportResource(**source)
+            if resource.resource_id in self.resources:
+                raise ValueError(f"Duplicate report resource_id {resource.resource_id}")
+            self.resources[resource.resource_id] = resource
+            self._by_topic.setdefault(resource.topic, []).append(resource)
+
+    @property
+    def topics(self) -> List[str]:
+        return list(self._by_topic)
+
+    def on_device_publish(self, peer, sender, bus, topic, headers, message) -> None:
+        """Pub/sub callback recording the configured points of a device publish."""
+        resources = self._by_topic.get(topic)
+        if not resources:
+            return
+        values = message[0] if isinstance(message, list) else message
+        try:
+            timestamp = parse_timestamp_string(headers[headers_mod.TIMESTAMP])
+        except (KeyError, TypeError, ValueError):
+            timestamp = get_aware_utc_now()
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        for resource in resources:
+            value = values.get(resource.point)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                _log.debug(f"Ignoring {topic} {resource.point} value {value}")
+                continue
+            resource.add_sample(timestamp, value)
@@ -118,6 +118,7 @@ class OpenADRClientInterface(metaclass=abc.ABCMeta):
         report_name: OpenADRReportName,
         resource_id: str,
         measurement: OpenADRMeasurements,
+        **kwargs,
     ):
         pass
 
@@ -155,5 +156,11 @@ class VolttronOpenADRClient(OpenADRClientInterface):
     def add_handler(self, event, function):
         self._openadr_client.add_handler(event, function)
 
-    def add_report(self, callback, report_name, resource_id, measurement):
-        self._openadr_client.add_report(callback, report_name, resource_id, measurement)
+    def add_report(self, callback, report_name, resource_id, measurement, **kwargs):
+        return self._openadr_client.add_report(
+            callback=callback,
+            report_name=report_name,
+            resource_id=resource_id,
+            measurement=measurement,
+            **kwargs,
+        )
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from volttron.platform.agent.utils import format_timestamp
+from volttron.platform.messaging import headers as headers_mod
+
+from openadr_ven.report_source import DeviceReportSource
+
+TOPIC = "devices/campus/building/meter/all"
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def publish(source, minutes, values, topic=TOPIC):
+    headers = {headers_mod.TIMESTAMP: format_timestamp(START + timedelta(minutes=minutes))}
+    source.on_device_publish("pubsub", "platform.driver", "", topic, headers, [values, {}])
+
+
+def test_incremental_report_answers_latest_sample():
+    source = DeviceReportSource([{"resource_id": "meter", "topic": TOPIC, "point": "Power"}])
+    callback = source.resources["meter"].callback()
+    assert callback() is None
+
+    publish(source, 0, {"Power": 10.0, "Other": 1})
+    publish(source, 1, {"Power": 12.0})
+    publish(source, 2, {"Power": "bad"})
+    publish(source, 3, {"Power": 99.0}, topic="devices/campus/building/other/all")
+    assert callback() == 12.0
+
+
+def test_incremental_report_aggregates_last_interval():
+    source = DeviceReportSource([{"resource_id": "meter", "topic": TOPIC, "point": "Power",
+                                  "sampling_interval": 120, "aggregation": "max"}])
+    for minute, value in enumerate([5.0, 7.0, 6.0, 4.0]):
+        publish(source, minute, {"Power": value})
+    assert source.resources["meter"].latest(now=START + timedelta(minutes=3, seconds=30)) == 6.0
+
+
+def test_full_report_aggregates_intervals():
+    source = DeviceReportSource([
+        {"resource_id": "power", "topic": TOPIC, "point": "Power",
+         "data_collection_mode": "full", "sampling_interval": 300},
+        {"resource_id": "energy", "topic": TOPIC, "point": "Energy",
+         "data_collection_mode": "full", "sampling_interval": 300, "aggregation": "sum"},
+    ])
+    for minute in range(15):
+        publish(source, minute, {"Power": float(minute), "Energy": 1})
+
+    callback = source.resources["power"].callback()
+    assert callback(START, START + timedelta(minutes=15), timedelta(minutes=5)) == [
+        (START, 2.0),
+        (START + timedelta(minutes=5), 7.0),
+        (START + timedelta(minutes=10), 12.0),
+    ]
+    energy = source.resources["energy"].callback()
+    assert energy(START + timedelta(minutes=5), START + timedelta(minutes=10),
+                  timedelta(minutes=5)) == [(START + timedelta(minutes=5), 5)]
+
+
+def test_ring_is_bounded():
+    source = DeviceReportSource([{"resource_id": "meter", "topic": TOPIC, "point": "Power",
+                                  "max_samples": 3}])
+    for minute in range(10):
+        publish(source, minute, {"Power": float(minute)})
+    assert [value for _, value in source.resources["meter"].samples] == [7.0, 8.0, 9.0]
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        DeviceReportSource([{"resource_id": "meter", "topic": TOPIC, "point": "Power",
+                             "data_collection_mode": "full"}])
+    with pytest.raises(ValueError):
+        DeviceReportSource([{"resource_id": "meter", "topic": TOPIC, "point": "Power",
+                             "aggregation": "median"}])
+    with pytest.raises(ValueError):
+        DeviceReportSource([{"resource_id": "meter", "topic": TOPIC, "point": "Power"},
+                            {"resource_id": "meter", "topic": TOPIC, "point": "Energy"}])
@@ -26,7 +26,7 @@ import logging
 import sys
 import gevent
 from collections import defaultdict
-from volttron.platform.vip.agent import Agent, RPC
+from volttron.platform.vip.agent import Agent, Core, RPC
 from volttron.platform.agent import utils
 from volttron.platform.agent import math_utils
 from volttron.platform.agent.known_identities import PLATFORM_DRIVER
@@ -38,6 +38,9 @@ import fnmatch
 from volttron.platform import jsonapi
 from .interfaces import DriverInterfaceError
 from .driver_locks import configure_socket_lock, configure_publish_lock
+from .scrape_executor import ScrapeExecutor, GREENLET_EXECUTOR
+from .scrape_scheduler import (spread_scrape_offsets, scrape_offset_distance, ADAPTIVE_SCHEDULER, FIXED_SCHEDULER,
+                               REBALANCE_TOLERANCE)
 
 utils.setup_logging()
 _log = logging.getLogger(__name__)
@@ -102,6 +105,14 @@ def platform_driver_agent(config_path, **kwargs):
 
     group_offset_interval = get_config("group_offset_interval", 0.0)
 
+    scrape_executor = get_config("scrape_executor", GREENLET_EXECUTOR)
+    max_concurrent_scrapes = get_config("max_concurrent_scrapes", 0)
+    interface_scrape_limits = get_config("interface_scrape_limits", {})
+    default_scrape_timeout = get_config("default_scrape_timeout", None)
+
+    scrape_scheduler = get_config("scrape_scheduler", FIXED_SCHEDULER)
+    scrape_rebalance_interval = get_config("scrape_rebalance_interval", 300)
+
     return PlatformDriverAgent(driver_config_list, scalability_test,
                              scalability_test_iterations,
                              driver_scrape_interval,
@@ -113,6 +124,12 @@ def platform_driver_agent(config_path, **kwargs):
                              publish_breadth_first_all,
                              publish_depth_first,
                              publish_breadth_first,
+                             scrape_executor,
+                             max_concurrent_scrapes,
+                             interface_scrape_limits,
+                             default_scrape_timeout,
+                             scrape_scheduler,
+                             scrape_rebalance_interval,
                              heartbeat_autostart=True, **kwargs)
 
 
@@ -128,6 +145,12 @@ class PlatformDriverAgent(Agent):
                  publish_breadth_first_all=False,
                  publish_depth_first=False,
                  publish_breadth_first=False,
+                 scrape_executor=GREENLET_EXECUTOR,
+                 max_concurrent_scrapes=0,
+                 interface_scrape_limits=None,
+                 default_scrape_timeout=None,
+                 scrape_scheduler=FIXED_SCHEDULER,
+                 scrape_rebalance_interval=300,
                  **kwargs):
         super(PlatformDriverAgent, self).__init__(**kwargs)
         self.instances = {}
@@ -157,6 +180,11 @@ class PlatformDriverAgent(Agent):
         self._override_devices = set()
         self._override_patterns = None
         self._override_interval_events = {}
+        # Replaced with the configured executor when the main configuration is processed.
+        self.scrape_executor = ScrapeExecutor()
+        self.scrape_scheduler = FIXED_SCHEDULER
+        self.scrape_rebalance_interval = None
+        self._rebalance_greenlet = None
 
         if scalability_test:
             self.waiting_to_finish = set()
@@ -173,7 +201,13 @@ class PlatformDriverAgent(Agent):
                                "publish_depth_first_all": self.publish_depth_first_all,
                                "publish_breadth_first_all": self.publish_breadth_first_all,
                                "publish_depth_first": self.publish_depth_first,
-                               "publish_breadth_first": self.publish_breadth_first}
+                               "publish_breadth_first": self.publish_breadth_first,
+                               "scrape_executor": scrape_executor,
+                               "max_concurrent_scrapes": max_concurrent_scrapes,
+                               "interface_scrape_limits": interface_scrape_limits or {},
+                               "default_scrape_timeout": default_scrape_timeout,
+                               "scrape_scheduler": scrape_scheduler,
+                               "scrape_rebalance_interval": scrape_rebalance_interval}
 
         self.vip.config.set_default("config", self.default_config)
         self.vip.config.subscribe(self.configure_main, actions=["NEW", "UPDATE"], pattern="config")
@@ -210,6 +244,17 @@ class PlatformDriverAgent(Agent):
                     _log.info("maximum concurrent driver publishes limited to " + str(max_concurrent_publishes))
                 configure_publish_lock(max_concurrent_publishes)
 
+                self.scrape_executor_settings = (config["scrape_executor"],
+                                                 config["max_concurrent_scrapes"],
+                                                 config["interface_scrape_limits"],
+                                                 config["default_scrape_timeout"])
+                self.scrape_executor.shutdown()
+                self.scrape_executor = ScrapeExecutor(*self.scrape_executor_settings)
+                _log.info("device scrapes run in {} executor, maximum concurrent scrapes: {}, "
+                          "per interface limits: {}".format(self.scrape_executor.executor,
+                                                            self.scrape_executor.max_concurrent_scrapes or "unlimited",
+                                                            config["interface_scrape_limits"]))
+
                 self.scalability_test = bool(config["scalability_test"])
                 self.scalability_test_iterations = int(config["scalability_test_iterations"])
 
@@ -233,6 +278,13 @@ class PlatformDriverAgent(Agent):
                 _log.info("The platform driver must be restarted for changes to the max_concurrent_publishes setting to "
                           "take effect")
 
+            if self.scrape_executor_settings != (config["scrape_executor"],
+                                                 config["max_concurrent_scrapes"],
+                                                 config["interface_scrape_limits"],
+                                                 config["default_scrape_timeout"]):
+                _log.info("The platform driver must be restarted for changes to the scrape executor settings to take "
+                          "effect")
+
             if self.scalability_test != bool(config["scalability_test"]):
                 if not self.scalability_test:
                     _log.info(
@@ -300,14 +352,9 @@ class PlatformDriverAgent(Agent):
 
             _log.info("Setting time delta between driver device scrapes to  " + str(driver_scrape_interval))
 
-            # Reset all scrape schedules
-            self.freed_time_slots.clear()
-            self.group_counts.clear()
-            for driver in self.instances.values():
-                time_slot = self.group_counts[driver.group]
-                driver.update_scrape_schedule(time_slot, self.driver_scrape_interval,
-                                              driver.group, self.group_offset_interval)
-                self.group_counts[driver.group] += 1
+            self._reset_scrape_schedules()
+
+        self._configure_scrape_scheduler(config["scrape_scheduler"], config["scrape_rebalance_interval"])
 
         self.publish_depth_first_all = bool(config["publish_depth_first_all"])
         self.publish_breadth_first_all = bool(config["publish_breadth_first_all"])
@@ -321,10 +368,73 @@ class PlatformDriverAgent(Agent):
                                         self.publish_depth_first,
                                         self.publish_breadth_first)
 
+    def _reset_scrape_schedules(self):
+        self.freed_time_slots.clear()
+        self.group_counts.clear()
+        for driver in self.instances.values():
+            time_slot = self.group_counts[driver.group]
+            driver.update_scrape_schedule(time_slot, self.driver_scrape_interval,
+                                          driver.group, self.group_offset_interval)
+            self.group_counts[driver.group] += 1
+
+    def _configure_scrape_scheduler(self, scrape_scheduler, scrape_rebalance_interval):
+        if scrape_scheduler not in (FIXED_SCHEDULER, ADAPTIVE_SCHEDULER):
+            _log.error("Invalid scrape_scheduler {}, must be {} or {}. Scrape scheduler unchanged".format(
+                scrape_scheduler, FIXED_SCHEDULER, ADAPTIVE_SCHEDULER))
+            return
+        try:
+            scrape_rebalance_interval = float(scrape_rebalance_interval)
+            if scrape_rebalance_interval <= 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            _log.error("Invalid scrape_rebalance_interval {}. Scrape scheduler unchanged".format(
+                scrape_rebalance_interval))
+            return
+
+        if (self.scrape_scheduler == scrape_scheduler and
+                self.scrape_rebalance_interval == scrape_rebalance_interval):
+            return
+
+        if self._rebalance_greenlet is not None:
+            self._rebalance_greenlet.kill()
+            self._rebalance_greenlet = None
+
+        if self.scrape_scheduler == ADAPTIVE_SCHEDULER and scrape_scheduler == FIXED_SCHEDULER:
+            self._reset_scrape_schedules()
+
+        self.scrape_scheduler = scrape_scheduler
+        self.scrape_rebalance_interval = scrape_rebalance_interval
+        _log.info("Using {} scrape scheduler".format(scrape_scheduler))
+
+        if scrape_scheduler == ADAPTIVE_SCHEDULER:
+            self._rebalance_greenlet = self.core.periodic(scrape_rebalance_interval, self.rebalance_scrape_schedule)
+
+    def rebalance_scrape_schedule(self):
+        """
+        Spreads device scrapes across their interval using the scrape durations observed so far. Devices whose offset
+        moved by less than REBALANCE_TOLERANCE of their interval, or driver_scrape_interval if that is larger, keep their
+        current schedule so a stable schedule is not churned.
+        """
+        devices = [(path, driver.group, driver.interval, self.scrape_executor.mean_duration(path))
+                   for path, driver in self.instances.items()]
+        offsets = spread_scrape_offsets(devices, self.group_offset_interval, self.driver_scrape_interval)
+        moved = 0
+        for path, offset in offsets.items():
+            driver = self.instances[path]
+            tolerance = max(driver.interval * REBALANCE_TOLERANCE, self.driver_scrape_interval)
+            if scrape_offset_distance(driver.time_slot_offset, offset, driver.interval) > tolerance:
+                driver.set_scrape_offset(offset)
+                moved += 1
+        _log.debug("Rebalanced scrape schedule, {} of {} devices moved".format(moved, len(offsets)))
+
     def derive_device_topic(self, config_name):
         _, topic = config_name.split('/', 1)
         return topic
 
+    @Core.receiver('onstop')
+    def onstop(self, sender, **kwargs):
+        self.scrape_executor.shutdown()
+
     def stop_driver(self, device_topic):
         real_name = self._name_map.pop(device_topic.lower(), device_topic)
 
@@ -342,6 +452,7 @@ class PlatformDriverAgent(Agent):
 
         bisect.insort(self.freed_time_slots[driver.group], driver.time_slot)
         self.group_counts[driver.group] -= 1
+        self.scrape_executor.remove_device(real_name)
 
     def update_driver(self, config_name, action, contents):
         _log.info("In update_driver")
@@ -457,6 +568,32 @@ class PlatformDriverAgent(Agent):
     def scrape_all(self, path):
         return self.instances[path].scrape_all()
 
+    @RPC.export
+    def get_scrape_statistics(self, path=None):
+        """RPC method
+
+        Return scrape duration, overrun, skip and start jitter statistics collected by the scrape executor.
+        :param path: device path, if omitted statistics for all devices are returned keyed by device path
+        :type path: str
+        """
+        return self.scrape_executor.get_statistics(path)
+
+    @RPC.export
+    def get_scrape_schedule(self):
+        """RPC method
+
+        Return the scrape schedule of every device keyed by device path: scheduler, group, interval, offset into the
+        interval, next scrape time and mean scrape duration.
+        """
+        now = utils.get_aware_utc_now()
+        return {path: {"scheduler": self.scrape_scheduler,
+                       "group": driver.group,
+                       "interval": driver.interval,
+                       "offset": driver.time_slot_offset,
+                       "next_scrape": utils.format_timestamp(driver.find_starting_datetime(now)),
+                       "mean_duration": self.scrape_executor.mean_duration(path)}
+                for path, driver in self.instances.items()}
+
     @RPC.export
     def get_multiple_points(self, path, point_names, **kwargs):
         return self.instances[path].get_multiple_points(point_names, **kwargs)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+import datetime
+
+PUBLISH_ALL = "all"
+PUBLISH_COV = "cov"
+
+NUMERIC_TYPES = ("integer", "float")
+
+
+class CovFilter:
+    """
+    Decides which scraped points a device publishes in change of value mode.
+
+    A numeric point is published when it moved from its last published value by more than its deadband, which is the
+    larger of the absolute deadband and the relative deadband times the last published value. Any other point is
+    published when its value changed. Every keyframe_interval seconds all points are published regardless.
+    """
+
+    def __init__(self, meta_data, absolute_deadband=0.0, relative_deadband=0.0, point_deadbands=None,
+                 keyframe_interval=900):
+        """
+        :param meta_data: device meta data, the "type" of each point selects numeric or equality comparison
+        :param absolute_deadband: default absolute deadband for numeric points
+        :param relative_deadband: default deadband for numeric points as a fraction of the last published value
+        :param point_deadbands: per point overrides, point name to {"absolute": ..., "relative": ...}
+        :param keyframe_interval: seconds between publishes of every point
+        """
+        self.keyframe_interval = datetime.timedelta(seconds=float(keyframe_interval))
+        self._numeric = {point for point, meta in meta_data.items() if meta.get("type") in NUMERIC_TYPES}
+        default = (float(absolute_deadband or 0.0), float(relative_deadband or 0.0))
+        self._deadbands = {}
+        for point in meta_data:
+            overrides = (point_deadbands or {}).get(point, {})
+            self._deadbands[point] = (float(overrides.get("absolute", default[0])),
+                                      float(overrides.get("relative", default[1])))
+        self._last_values = {}
+        self._last_keyframe = None
+
+    def filter(self, results, now):
+        """
+        Returns the points of a scrape to publish and whether this publish is a keyframe.
+
+        :param results: scraped point values
+        :param now: time of the scrape
+        :return: (dictionary of point name to value, keyframe)
+        """
+        if self._last_keyframe is None or now - self._last_keyframe >= self.keyframe_interval:
+            self._last_keyframe = now
+            self._last_values.update(results)
+            return results, True
+
+        changed = {point: value for point, value in results.items() if self._changed(point, value)}
+        self._last_values.update(changed)
+        return changed, False
+
+    def record(self, values):
+        """Records values published outside of a scrape as the last published values."""
+        self._last_values.update(values)
+
+    def _changed(self, point, value):
+        if point not in self._last_values:
+            return True
+        last = self._last_values[point]
+        if point not in self._numeric or not isinstance(value, (int, float)) or not isinstance(last, (int, float)):
+            return value != last
+        absolute, relative = self._deadbands.get(point, (0.0, 0.0))
+        return abs(value - last) > max(absolute, relative * abs(last))
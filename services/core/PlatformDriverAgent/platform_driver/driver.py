@@ -36,6 +36,7 @@ from volttron.platform.messaging.topics import (DRIVER_TOPIC_BASE,
 
 from volttron.platform.vip.agent.errors import VIPError, Again
 from .driver_locks import publish_lock
+from .cov_filter import CovFilter, PUBLISH_ALL, PUBLISH_COV
 import datetime
 
 utils.setup_logging()
@@ -75,6 +76,24 @@ class DriverAgent(BasicAgent):
 
         self.interval = interval
         self.periodic_read_event = None
+        self._scrape_in_progress = False
+
+        self.driver_type = config.get("driver_type")
+        try:
+            scrape_timeout = config.get("scrape_timeout")
+            self.scrape_timeout = float(scrape_timeout) if scrape_timeout is not None else None
+            if self.scrape_timeout is not None and self.scrape_timeout <= 0:
+                raise ValueError
+        except ValueError:
+            _log.warning("Invalid device scrape timeout {}. Using the platform driver default.".format(
+                config.get("scrape_timeout")))
+            self.scrape_timeout = None
+
+        self.publish_mode = config.get("publish_mode", PUBLISH_ALL)
+        if self.publish_mode not in (PUBLISH_ALL, PUBLISH_COV):
+            _log.warning("Invalid device publish mode {}. Defaulting to {}.".format(self.publish_mode, PUBLISH_ALL))
+            self.publish_mode = PUBLISH_ALL
+        self.cov_filter = None
 
         self.update_scrape_schedule(time_slot, driver_scrape_interval, group, group_offset_interval)
 
@@ -104,6 +123,15 @@ class DriverAgent(BasicAgent):
             while self.time_slot_offset >= self.interval:
                 self.time_slot_offset -= self.interval
 
+        self._reschedule_periodic_read()
+
+    def set_scrape_offset(self, offset):
+        """Moves the device scrape to offset seconds from the start of its interval, keeping its time slot and group."""
+        self.time_slot_offset = offset % self.interval
+        _log.debug("{} scrape offset set to {}".format(self.device_path, self.time_slot_offset))
+        self._reschedule_periodic_read()
+
+    def _reschedule_periodic_read(self):
         #check weather or not we have run our starting method.
         if not self.periodic_read_event:
             return
@@ -115,7 +143,6 @@ class DriverAgent(BasicAgent):
         self.periodic_read_event = self.core.schedule(next_periodic_read, self.periodic_read, next_periodic_read)
 
 
-
     def find_starting_datetime(self, now):
         midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
         seconds_from_midnight = (now - midnight).total_seconds()
@@ -158,6 +185,15 @@ class DriverAgent(BasicAgent):
         self.all_path_depth, self.all_path_breadth = self.get_paths_for_point(DRIVER_TOPIC_ALL)
 
 
+    @Core.receiver('onstop')
+    def stopping(self, sender, **kwargs):
+        interface = getattr(self, "interface", None)
+        if interface is not None:
+            try:
+                interface.teardown()
+            except Exception as e:
+                _log.error("Failure during {} interface teardown: {}".format(self.device_path, e))
+
     def setup_device(self):
 
         config = self.config
@@ -190,6 +226,13 @@ class DriverAgent(BasicAgent):
                                      'type': ts_type,
                                      'tz': config.get('timezone', '')}
 
+        if self.publish_mode == PUBLISH_COV:
+            self.cov_filter = CovFilter(self.meta_data,
+                                        absolute_deadband=config.get("cov_deadband", 0.0),
+                                        relative_deadband=config.get("cov_relative_deadband", 0.0),
+                                        point_deadbands=config.get("cov_point_deadbands"),
+                                        keyframe_interval=config.get("cov_keyframe_interval", 900))
+
         self.base_topic = DEVICES_VALUE(campus='',
                                         building='',
                                         unit='',
@@ -224,12 +267,31 @@ class DriverAgent(BasicAgent):
 
         self.periodic_read_event = self.core.schedule(next_scrape_time, self.periodic_read, next_scrape_time)
 
+        self.parent.scrape_executor.record_start(self.device_path, max((test_now - now).total_seconds(), 0.0))
+
+        # A slow device must not have several scrapes queued up behind each other. The late scrape is dropped and
+        # the device is scraped again at its next regular time.
+        if self._scrape_in_progress:
+            _log.warning("Skipping scrape of {}, previous scrape is still running".format(self.device_name))
+            self.parent.scrape_executor.record_skip(self.device_path)
+            return
+
+        self._scrape_in_progress = True
+        try:
+            self._scrape_and_publish(now)
+        finally:
+            self._scrape_in_progress = False
+
+    def _scrape_and_publish(self, now):
         _log.debug("scraping device: " + self.device_name)
 
         self.parent.scrape_starting(self.device_name)
 
         try:
-            results = self.interface.scrape_all()
+            results = self.parent.scrape_executor.scrape(self.device_path, self.driver_type,
+                                                         self.interface.scrape_all,
+                                                         interval=self.interval,
+                                                         timeout=self.scrape_timeout)
             register_names = self.interface.get_register_names_view()
             for point in (register_names - results.keys()):
                 depth_first_topic = self.base_topic(point=point)
@@ -244,6 +306,15 @@ class DriverAgent(BasicAgent):
             return
 
         utcnow = utils.get_aware_utc_now()
+        meta_data = self.meta_data
+        if self.cov_filter is not None:
+            results, keyframe = self.cov_filter.filter(results, utcnow)
+            if not results:
+                self.parent.scrape_ending(self.device_name)
+                return
+            if not keyframe:
+                meta_data = {point: self.meta_data[point] for point in results}
+
         utcnow_string = utils.format_timestamp(utcnow)
         sync_timestamp = utils.format_timestamp(now - datetime.timedelta(seconds=self.time_slot_offset))
 
@@ -268,7 +339,7 @@ class DriverAgent(BasicAgent):
                                           headers=headers,
                                           message=message)
 
-        message = [results, self.meta_data]
+        message = [results, meta_data]
         if self.publish_depth_first_all:
             self._publish_wrapper(self.all_path_depth,
                                   headers=headers,
@@ -385,6 +456,9 @@ class DriverAgent(BasicAgent):
             meta = {point_name: self.meta_data[point_name]}
             all_message = [results, meta]
             individual_point_message = [value, self.meta_data[point_name]]
+            # A value already published from a COV notification does not need to be published again by the next scrape.
+            if self.cov_filter is not None:
+                self.cov_filter.record(results)
 
             depth_first_topic, breadth_first_topic = self.get_paths_for_point(
                 point_name)
@@ -385,6 +385,13 @@ class BaseInterface(object, metaclass=abc.ABCMeta):
         :param kwargs: Any interface specific parameters.
         """
 
+    def teardown(self):
+        """
+        Called when the driver for the device is stopped, before it is reconfigured or removed. Interfaces holding
+        resources outside of the driver, such as registrations with a proxy agent, release them here.
+        """
+        pass
+
     def get_multiple_points(self, path, point_names, **kwargs):
         """
         Read multiple points from the interface.
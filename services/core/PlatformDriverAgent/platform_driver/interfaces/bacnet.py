@@ -29,7 +29,7 @@ from datetime import datetime, timedelta
 from platform_driver.driver_exceptions import DriverConfigError
 from platform_driver.interfaces import BaseInterface, BaseRegister
 from volttron.platform.vip.agent import errors
-from volttron.platform.jsonrpc import RemoteError
+from volttron.platform.jsonrpc import RemoteError, MethodNotFound
 
 # Logging is completely configured by now.
 _log = logging.getLogger(__name__)
@@ -60,6 +60,7 @@ class Interface(BaseInterface):
         self.register_count = 10000
         self.register_count_divisor = 1
         self.cov_points = []
+        self.read_plan = None
 
     def configure(self, config_dict, registry_config_str):
         self.min_priority = config_dict.get("min_priority", 8)
@@ -70,6 +71,7 @@ class Interface(BaseInterface):
         self.proxy_address = config_dict.get("proxy_address", "platform.bacnet_proxy")
         self.max_per_request = config_dict.get("max_per_request", 24)
         self.use_read_multiple = config_dict.get("use_read_multiple", True)
+        self.use_read_plan = config_dict.get("use_read_plan", True)
         self.timeout = float(config_dict.get("timeout", 30.0))
 
         self.ping_retry_interval = timedelta(seconds=config_dict.get("ping_retry_interval", 5.0))
@@ -159,16 +161,28 @@ class Interface(BaseInterface):
 
         while True:
             try:
-                result = self.vip.rpc.call(self.proxy_address, 'read_properties',
-                                           self.target_address, point_map,
-                                           self.max_per_request, self.use_read_multiple).get(timeout=self.timeout)
+                if self.use_read_plan and self.use_read_multiple:
+                    result = self.read_with_plan(point_map)
+                else:
+                    result = self.vip.rpc.call(self.proxy_address, 'read_properties',
+                                               self.target_address, point_map,
+                                               self.max_per_request, self.use_read_multiple).get(timeout=self.timeout)
+            except MethodNotFound:
+                _log.info("BACnet proxy does not support read plans, falling back to read_properties")
+                self.use_read_plan = False
+                continue
             except RemoteError as e:
-                if "segmentationNotSupported" in e.message:
+                if "Unknown read plan" in e.message:
+                    # The proxy restarted and lost the plan.
+                    self.read_plan = None
+                    continue
+                elif "segmentationNotSupported" in e.message:
                     if self.max_per_request <= 1:
                         _log.error("Receiving a segmentationNotSupported error with 'max_per_request' setting of 1.")
                         raise
                     self.register_count_divisor += 1
                     self.max_per_request = max(int(self.register_count/self.register_count_divisor), 1)
+                    self.discard_read_plan()
                     _log.info("Device requires a lower max_per_request setting. Trying: "+str(self.max_per_request))
                     continue
                 elif e.message.endswith("rejected the request: 9") and self.use_read_multiple:
@@ -187,6 +201,28 @@ class Interface(BaseInterface):
 
         return result
 
+    def read_with_plan(self, point_map):
+        if self.read_plan is None:
+            self.read_plan = self.vip.rpc.call(self.proxy_address, 'register_read_plan',
+                                               self.target_address, point_map,
+                                               self.max_per_request).get(timeout=self.timeout)
+        return self.vip.rpc.call(self.proxy_address, 'read_plan', self.read_plan).get(timeout=self.timeout)
+
+    def teardown(self):
+        # Do not wait for the proxy, the driver is stopping.
+        if self.read_plan is not None:
+            self.vip.rpc.call(self.proxy_address, 'unregister_read_plan', self.read_plan)
+            self.read_plan = None
+
+    def discard_read_plan(self):
+        if self.read_plan is None:
+            return
+        try:
+            self.vip.rpc.call(self.proxy_address, 'unregister_read_plan', self.read_plan).get(timeout=self.timeout)
+        except (Exception, gevent.Timeout) as e:
+            _log.debug("Unable to unregister read plan {}: {}".format(self.read_plan, e))
+        self.read_plan = None
+
     def revert_all(self, priority=None):
         """
         Revert entrire device to it's default state
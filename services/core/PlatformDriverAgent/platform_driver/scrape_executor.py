@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+import logging
+import time
+
+import gevent
+from gevent.lock import BoundedSemaphore, DummySemaphore
+from gevent.threadpool import ThreadPool
+
+_log = logging.getLogger(__name__)
+
+GREENLET_EXECUTOR = "greenlet"
+THREAD_EXECUTOR = "thread"
+
+
+class ScrapeTimeout(Exception):
+    """Raised when a device scrape does not finish before its deadline."""
+    pass
+
+
+class ScrapeStatistics:
+    """Scrape duration, overrun and start jitter counters for a single device."""
+
+    def __init__(self):
+        self.scrapes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_duration = None
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+        self.starts = 0
+        self.last_jitter = None
+        self.max_jitter = 0.0
+        self.total_jitter = 0.0
+
+    @property
+    def mean_duration(self):
+        return self.total_duration / self.scrapes if self.scrapes else None
+
+    def record_start(self, jitter):
+        self.starts += 1
+        self.last_jitter = jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.total_jitter += jitter
+
+    def record(self, duration, interval, failed=False, timed_out=False):
+        self.scrapes += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+        if failed:
+            self.failures += 1
+        if timed_out:
+            self.timeouts += 1
+        if timed_out or (interval is not None and duration > interval):
+            self.overruns += 1
+
+    def to_dict(self):
+        return {"scrapes": self.scrapes,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "overruns": self.overruns,
+                "skipped": self.skipped,
+                "last_duration": self.last_duration,
+                "max_duration": self.max_duration,
+                "mean_duration": self.mean_duration,
+                "last_jitter": self.last_jitter,
+                "max_jitter": self.max_jitter,
+                "mean_jitter": self.total_jitter / self.starts if self.starts else None}
+
+
+class ScrapeExecutor:
+    """
+    Runs device scrapes for the platform driver.
+
+    In "greenlet" mode the scrape runs in the calling DriverAgent greenlet, as it always has. In "thread" mode the
+    scrape runs in a native thread pool so interfaces built on blocking client libraries do not stall the agent's
+    gevent loop while they wait on the network.
+
+    In both modes the number of scrapes running at once can be limited overall and per interface type, a scrape can be
+    bounded by a deadline and its duration is recorded per device.
+    """
+
+    def __init__(self, executor=GREENLET_EXECUTOR, max_concurrent_scrapes=0, interface_scrape_limits=None,
+                 default_scrape_timeout=None):
+        if executor not in (GREENLET_EXECUTOR, THREAD_EXECUTOR):
+            raise ValueError("Invalid scrape executor {}, must be {} or {}".format(executor, GREENLET_EXECUTOR,
+                                                                                THREAD_EXECUTOR))
+        max_concurrent_scrapes = int(max_concurrent_scrapes or 0)
+        self.executor = executor
+        self.max_concurrent_scrapes = max_concurrent_scrapes
+        self.default_scrape_timeout = float(default_scrape_timeout) if default_scrape_timeout else None
+        self._unlimited = DummySemaphore()
+        self._scrape_lock = self._make_semaphore(max_concurrent_scrapes)
+        self._interface_locks = {driver_type: self._make_semaphore(int(limit))
+                                 for driver_type, limit in (interface_scrape_limits or {}).items()}
+        self._thread_pool = None
+        if executor == THREAD_EXECUTOR:
+            self._thread_pool = ThreadPool(max_concurrent_scrapes if max_concurrent_scrapes > 0 else 100)
+        self._statistics = {}
+
+    @staticmethod
+    def _make_semaphore(limit):
+        return BoundedSemaphore(limit) if limit > 0 else DummySemaphore()
+
+    def _acquire(self, driver_type):
+        locks = [self._interface_locks.get(driver_type, self._unlimited), self._scrape_lock]
+        for lock in locks:
+            lock.acquire()
+        return locks
+
+    @staticmethod
+    def _release(locks):
+        for lock in reversed(locks):
+            lock.release()
+
+    def scrape(self, device_name, driver_type, scrape_function, interval=None, timeout=None):
+        """
+        Runs scrape_function for a device and returns its result.
+
+        :param device_name: device the scrape belongs to, used as the statistics key
+        :param driver_type: interface type of the device, used for per-type concurrency limits
+        :param scrape_function: callable performing the scrape
+        :param interval: scrape interval of the device, a scrape longer than this counts as an overrun
+        :param timeout: deadline in seconds for the scrape, defaults to default_scrape_timeout. None means no deadline.
+        :raises ScrapeTimeout: if the scrape did not finish before the deadline
+        """
+        if timeout is None:
+            timeout = self.default_scrape_timeout
+        statistics = self._statistics.setdefault(device_name, ScrapeStatistics())
+        start = time.monotonic()
+        failed = timed_out = False
+        try:
+            locks = self._acquire(driver_type)
+            if self._thread_pool is not None:
+                # A thread cannot be interrupted. If the deadline passes the scrape finishes in the background and
+                # keeps its concurrency slot until then so a hung device cannot pile up threads.
+                result = self._thread_pool.spawn(scrape_function)
+                result.rawlink(lambda _: self._release(locks))
+                try:
+                    return result.get(timeout=timeout)
+                except gevent.Timeout:
+                    raise ScrapeTimeout("Scrape of {} exceeded {} seconds".format(device_name, timeout))
+            try:
+                with gevent.Timeout(timeout, ScrapeTimeout("Scrape of {} exceeded {} seconds".format(device_name,
+                                                                                                 timeout))):
+                    return scrape_function()
+            finally:
+                self._release(locks)
+        except ScrapeTimeout:
+            timed_out = True
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            duration = time.monotonic() - start
+            statistics.record(duration, interval, failed=failed, timed_out=timed_out)
+            if timed_out or (interval is not None and duration > interval):
+                _log.warning("Scrape of {} overran: {:.3f} seconds (interval {})".format(device_name, duration,
+                                                                                        interval))
+
+    def record_start(self, device_name, jitter):
+        """Records how late, in seconds, a scrape of the device started relative to its scheduled time."""
+        self._statistics.setdefault(device_name, ScrapeStatistics()).record_start(jitter)
+
+    def record_skip(self, device_name):
+        """Records a scrape skipped because the previous scrape of the device was still running."""
+        self._statistics.setdefault(device_name, ScrapeStatistics()).skipped += 1
+
+    def mean_duration(self, device_name):
+        statistics = self._statistics.get(device_name)
+        return statistics.mean_duration if statistics is not None else None
+
+    def remove_device(self, device_name):
+        self._statistics.pop(device_name, None)
+
+    def get_statistics(self, device_name=None):
+        """Returns scrape statistics for a device, or for all devices keyed by device name."""
+        if device_name is not None:
+            statistics = self._statistics.get(device_name)
+            return statistics.to_dict() if statistics is not None else None
+        return {name: statistics.to_dict() for name, statistics in self._statistics.items()}
+
+    def shutdown(self):
+        """Stops the thread pool of the "thread" executor. Scrapes still running in it are abandoned."""
+        if self._thread_pool is not None:
+            self._thread_pool.kill()
+            self._thread_pool = None
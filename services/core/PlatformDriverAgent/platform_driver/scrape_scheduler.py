@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+from collections import defaultdict
+
+FIXED_SCHEDULER = "fixed"
+ADAPTIVE_SCHEDULER = "adaptive"
+# Fraction of a device's scrape interval its offset must move by before a rebalance reschedules it.
+REBALANCE_TOLERANCE = 0.05
+
+
+def spread_scrape_offsets(devices, group_offset_interval, default_duration):
+    """
+    Computes scrape offsets that spread devices across their scrape interval in proportion to how long each device
+    takes to scrape. Every device starts when the devices before it in the interval would, on average, have taken
+    their share of the interval, which keeps the number of scrapes running at any moment roughly constant.
+
+    Devices are spread separately per group and scrape interval. Each group is still shifted by
+    group * group_offset_interval.
+
+    :param devices: iterable of (device path, group, interval, mean scrape duration or None)
+    :param group_offset_interval: offset between groups in seconds
+    :param default_duration: duration assumed for devices that have not been scraped yet
+    :return: dictionary of device path to offset in seconds from the start of the interval
+    """
+    buckets = defaultdict(list)
+    for device_path, group, interval, duration in devices:
+        buckets[(group, interval)].append((device_path, duration if duration else default_duration))
+
+    offsets = {}
+    for (group, interval), members in buckets.items():
+        members.sort()
+        total = sum(duration for _, duration in members) or 1.0
+        group_offset = group * group_offset_interval
+        elapsed = 0.0
+        for device_path, duration in members:
+            offsets[device_path] = (group_offset + interval * elapsed / total) % interval
+            elapsed += duration
+    return offsets
+
+
+def scrape_offset_distance(offset, other_offset, interval):
+    """
+    Returns the distance in seconds between two scrape offsets within an interval, wrapping around the end of the
+    interval, so offsets just before the end and just after the start of the interval are close together.
+    """
+    distance = abs(offset - other_offset) % interval
+    return min(distance, interval - distance)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+import pytest
+from mock import MagicMock
+
+from platform_driver.interfaces.bacnet import Interface, Register
+from volttron.platform.jsonrpc import RemoteError, MethodNotFound
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self, timeout=None):
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+class FakeProxy:
+    """Answers proxy RPC calls from a per method list of results, recording every call."""
+
+    def __init__(self, **responses):
+        self.responses = responses
+        self.calls = []
+
+    def call(self, peer, method, *args):
+        self.calls.append((method, args))
+        responses = self.responses.get(method)
+        if not responses:
+            return FakeResult(None)
+        return FakeResult(responses.pop(0) if len(responses) > 1 else responses[0])
+
+    def methods(self):
+        return [method for method, _ in self.calls]
+
+
+def remote_error(message):
+    return RemoteError(message, exc_type="builtins.ValueError", exc_args=[message])
+
+
+def build_interface(proxy):
+    vip = MagicMock()
+    vip.rpc = proxy
+    interface = Interface(vip=vip, core=MagicMock(), device_path="campus/bacnet")
+    interface.target_address = "10.0.0.2"
+    interface.proxy_address = "platform.bacnet_proxy"
+    interface.max_per_request = 24
+    interface.use_read_multiple = True
+    interface.use_read_plan = True
+    interface.timeout = 1.0
+    interface.insert_register(Register(1, "analogInput", "presentValue", True, "Temperature", "degF"))
+    return interface
+
+
+@pytest.mark.driver_unit
+def test_plan_registered_once_and_read_by_handle():
+    proxy = FakeProxy(register_read_plan=["plan1"], read_plan=[{"Temperature": 70.0}])
+    interface = build_interface(proxy)
+
+    assert interface.scrape_all() == {"Temperature": 70.0}
+    assert interface.scrape_all() == {"Temperature": 70.0}
+
+    assert proxy.methods() == ["register_read_plan", "read_plan", "read_plan"]
+    assert proxy.calls[0][1] == ("10.0.0.2", {"Temperature": ["analogInput", 1, "presentValue", None]}, 24)
+    assert proxy.calls[1][1] == ("plan1",)
+
+
+@pytest.mark.driver_unit
+def test_falls_back_to_read_properties_without_read_plan_support():
+    proxy = FakeProxy(register_read_plan=[MethodNotFound(-32601, "Method not found")],
+                      read_properties=[{"Temperature": 70.0}])
+    interface = build_interface(proxy)
+
+    assert interface.scrape_all() == {"Temperature": 70.0}
+    assert interface.scrape_all() == {"Temperature": 70.0}
+
+    assert proxy.methods() == ["register_read_plan", "read_properties", "read_properties"]
+    assert interface.use_read_plan is False
+
+
+@pytest.mark.driver_unit
+def test_registers_again_after_unknown_read_plan():
+    proxy = FakeProxy(register_read_plan=["plan1", "plan2"],
+                      read_plan=[remote_error("Unknown read plan: plan1"), {"Temperature": 70.0}])
+    interface = build_interface(proxy)
+
+    assert interface.scrape_all() == {"Temperature": 70.0}
+
+    assert proxy.methods() == ["register_read_plan", "read_plan", "register_read_plan", "read_plan"]
+    assert proxy.calls[-1][1] == ("plan2",)
+
+
+@pytest.mark.driver_unit
+def test_segmentation_error_replaces_plan_with_smaller_requests():
+    proxy = FakeProxy(register_read_plan=["plan1", "plan2"],
+                      read_plan=[remote_error("segmentationNotSupported"), {"Temperature": 70.0}])
+    interface = build_interface(proxy)
+
+    assert interface.scrape_all() == {"Temperature": 70.0}
+
+    assert proxy.methods() == ["register_read_plan", "read_plan", "unregister_read_plan", "register_read_plan",
+                               "read_plan"]
+    assert proxy.calls[2][1] == ("plan1",)
+    assert proxy.calls[3][1][2] == interface.max_per_request == 5000
+
+
+@pytest.mark.driver_unit
+def test_teardown_unregisters_plan():
+    proxy = FakeProxy(register_read_plan=["plan1"], read_plan=[{"Temperature": 70.0}])
+    interface = build_interface(proxy)
+    interface.scrape_all()
+
+    interface.teardown()
+    interface.teardown()
+
+    assert proxy.methods() == ["register_read_plan", "read_plan", "unregister_read_plan"]
+    assert interface.read_plan is None
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from platform_driver.cov_filter import CovFilter
+
+META_DATA = {"Temperature": {"units": "F", "type": "float", "tz": ""},
+             "Setpoint": {"units": "F", "type": "integer", "tz": ""},
+             "Mode": {"units": "", "type": "string", "tz": ""}}
+START = datetime(2023, 1, 1)
+
+
+@pytest.mark.driver_unit
+def test_first_scrape_is_keyframe():
+    cov_filter = CovFilter(META_DATA)
+    results = {"Temperature": 70.0, "Setpoint": 72, "Mode": "heat"}
+
+    assert cov_filter.filter(results, START) == (results, True)
+
+
+@pytest.mark.driver_unit
+def test_absolute_and_relative_deadbands():
+    cov_filter = CovFilter(META_DATA, absolute_deadband=0.5, point_deadbands={"Setpoint": {"relative": 0.1}})
+    cov_filter.filter({"Temperature": 70.0, "Setpoint": 70, "Mode": "heat"}, START)
+
+    changed, keyframe = cov_filter.filter({"Temperature": 70.4, "Setpoint": 76, "Mode": "heat"},
+                                          START + timedelta(seconds=60))
+    assert not keyframe
+    assert changed == {}
+
+    changed, _ = cov_filter.filter({"Temperature": 70.6, "Setpoint": 78, "Mode": "cool"},
+                                   START + timedelta(seconds=120))
+    assert changed == {"Temperature": 70.6, "Setpoint": 78, "Mode": "cool"}
+
+
+@pytest.mark.driver_unit
+def test_slow_drift_is_published_once_it_exceeds_the_deadband():
+    cov_filter = CovFilter(META_DATA, absolute_deadband=1.0)
+    cov_filter.filter({"Temperature": 70.0}, START)
+
+    published = [cov_filter.filter({"Temperature": 70.0 + 0.4 * i}, START + timedelta(seconds=60 * i))[0]
+                 for i in range(1, 4)]
+
+    assert published == [{}, {}, {"Temperature": 71.2}]
+
+
+@pytest.mark.driver_unit
+def test_keyframe_publishes_every_point():
+    cov_filter = CovFilter(META_DATA, keyframe_interval=300)
+    results = {"Temperature": 70.0, "Setpoint": 72, "Mode": "heat"}
+    cov_filter.filter(results, START)
+
+    assert cov_filter.filter(results, START + timedelta(seconds=240)) == ({}, False)
+    assert cov_filter.filter(results, START + timedelta(seconds=300)) == (results, True)
@@ -34,6 +34,8 @@ from platform_driver import agent
 from platform_driver.agent import DriverAgent
 from platform_driver.interfaces import BaseInterface
 from platform_driver.interfaces.fakedriver import Interface as FakeInterface
+from platform_driver.scrape_executor import ScrapeExecutor
+from platform_driver.cov_filter import CovFilter
 from volttrontesting.utils.utils import AgentMock
 from volttron.platform.vip.agent import Agent
 from volttron.platform.messaging.utils import Topic
@@ -146,6 +148,14 @@ def test_starting_should_succeed():
         assert isinstance(driver_agent.periodic_read_event, ScheduledEvent)
 
 
+@pytest.mark.driver_unit
+def test_stopping_should_tear_down_interface():
+    with get_driver_agent() as driver_agent:
+        driver_agent.stopping("somesender")
+
+        driver_agent.interface.teardown.assert_called_once()
+
+
 @pytest.mark.driver_unit
 def test_setup_device_should_succeed():
     expected_base_topic = Topic("devices/path/to/my/device/{point}")
@@ -191,6 +201,57 @@ def test_periodic_read_should_return_none_on_scrape_response(scrape_all_response
         assert isinstance(driver_agent.periodic_read_event, ScheduledEvent)
 
 
+@pytest.mark.driver_unit
+def test_periodic_read_should_publish_only_changed_points_in_cov_mode():
+    now = pytz.UTC.localize(datetime.utcnow())
+    meta_data = {"foo": {"type": "float"}, "bar": {"type": "float"}}
+
+    with get_driver_agent(has_core_schedule=True, meta_data=meta_data, has_base_topic=True,
+                          mock_publish_wrapper=True, interface_scrape_all={"foo": 1.0, "bar": 2.0}) as driver_agent:
+        driver_agent.cov_filter = CovFilter(meta_data, absolute_deadband=0.5)
+        driver_agent.periodic_read(now)
+        assert driver_agent._publish_wrapper.call_count == 2
+
+        driver_agent._publish_wrapper.reset_mock()
+        driver_agent.interface.scrape_all.return_value = {"foo": 1.2, "bar": 3.0}
+        driver_agent.periodic_read(now)
+
+        driver_agent._publish_wrapper.assert_called_once()
+        assert driver_agent.parent.scrape_ending.call_count == 2
+
+        driver_agent._publish_wrapper.reset_mock()
+        driver_agent.periodic_read(now)
+
+        driver_agent._publish_wrapper.assert_not_called()
+        assert driver_agent.parent.scrape_ending.call_count == 3
+
+
+@pytest.mark.driver_unit
+def test_periodic_read_should_skip_while_previous_scrape_is_running():
+    now = pytz.UTC.localize(datetime.utcnow())
+
+    with get_driver_agent(has_core_schedule=True, meta_data={"foo": "bar"},
+                          mock_publish_wrapper=True, interface_scrape_all={"foo": "bar"}) as driver_agent:
+        driver_agent._scrape_in_progress = True
+        driver_agent.periodic_read(now)
+
+        driver_agent.parent.scrape_starting.assert_not_called()
+        driver_agent.interface.scrape_all.assert_not_called()
+        assert isinstance(driver_agent.periodic_read_event, ScheduledEvent)
+        statistics = driver_agent.parent.scrape_executor.get_statistics("path/to/my/device")
+        assert statistics["skipped"] == 1
+        assert statistics["last_jitter"] is not None
+
+
+@pytest.mark.driver_unit
+def test_set_scrape_offset_should_wrap_and_reschedule():
+    with get_driver_agent(has_periodic_read_event=True, has_core_schedule=True) as driver_agent:
+        driver_agent.set_scrape_offset(75)
+
+        assert driver_agent.time_slot_offset == 15
+        assert isinstance(driver_agent.periodic_read_event, ScheduledEvent)
+
+
 @pytest.mark.driver_unit
 def test_heart_beat_should_return_none_on_no_heart_beat_point():
     with get_driver_agent() as driver_agent:
@@ -334,6 +395,7 @@ def get_driver_agent(has_base_topic: bool = False,
     # since parent is a mock and not a real instance of a class, we have to set attributes directly
     # create_autospec does not set attributes in a class' constructor
     parent.vip = ""
+    parent.scrape_executor = ScrapeExecutor()
 
     config = {"driver_config": {},
               "driver_type": "fakedriver",
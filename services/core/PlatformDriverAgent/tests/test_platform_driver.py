@@ -240,3 +240,48 @@ def test_default_config(volttron_instance):
         vip_identity="health_test")
 
     assert publish_agent.vip.rpc.call("health_test", "health.get_status").get(timeout=10).get('status') == STATUS_GOOD
+
+
+@pytest.mark.driver_unit
+def test_scrape_executor_shut_down_when_replaced_and_on_stop(monkeypatch):
+    # the driver locks may only be configured once per process
+    monkeypatch.setattr("platform_driver.agent.configure_socket_lock", lambda *args: None)
+    monkeypatch.setattr("platform_driver.agent.configure_publish_lock", lambda *args: None)
+    with get_platform_driver_agent() as platform_driver_agent:
+        platform_driver_agent.instances = {}
+        platform_driver_agent.configure_main("config", "NEW", {"scrape_executor": "thread"})
+        first_executor = platform_driver_agent.scrape_executor
+        first_pool = first_executor._thread_pool
+        assert first_pool is not None
+
+        platform_driver_agent.configure_main("config", "NEW", {"scrape_executor": "thread"})
+        assert platform_driver_agent.scrape_executor is not first_executor
+        assert first_executor._thread_pool is None
+        assert first_pool.size == 0
+
+        platform_driver_agent.onstop(None)
+        assert platform_driver_agent.scrape_executor._thread_pool is None
+
+
+@pytest.mark.driver_unit
+def test_rebalance_only_moves_devices_beyond_tolerance():
+    class FakeDriver:
+        def __init__(self, offset):
+            self.group = 0
+            self.interval = 60
+            self.time_slot_offset = offset
+            self.moved_to = None
+
+        def set_scrape_offset(self, offset):
+            self.moved_to = offset
+
+    with get_platform_driver_agent() as platform_driver_agent:
+        # equal durations spread a, b and c to 0, 20 and 40 seconds
+        platform_driver_agent.instances = {"a": FakeDriver(59.9),
+                                           "b": FakeDriver(21.0),
+                                           "c": FakeDriver(30.0)}
+        platform_driver_agent.rebalance_scrape_schedule()
+
+        assert platform_driver_agent.instances["a"].moved_to is None
+        assert platform_driver_agent.instances["b"].moved_to is None
+        assert platform_driver_agent.instances["c"].moved_to == 40.0
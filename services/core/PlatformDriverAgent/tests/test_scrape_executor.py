@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+import time
+
+import gevent
+import pytest
+
+from platform_driver.scrape_executor import ScrapeExecutor, ScrapeTimeout
+
+
+@pytest.mark.driver_unit
+@pytest.mark.parametrize("executor", ["greenlet", "thread"])
+def test_scrape_returns_result_and_records_statistics(executor):
+    scrape_executor = ScrapeExecutor(executor=executor)
+
+    assert scrape_executor.scrape("campus/device", "fakedriver", lambda: {"point": 1}, interval=60) == {"point": 1}
+
+    statistics = scrape_executor.get_statistics("campus/device")
+    assert statistics["scrapes"] == 1
+    assert statistics["overruns"] == 0
+    assert statistics["last_duration"] is not None
+    scrape_executor.shutdown()
+
+
+@pytest.mark.driver_unit
+@pytest.mark.parametrize("executor, slow_scrape", [("greenlet", lambda: gevent.sleep(1)),
+                                                   ("thread", lambda: time.sleep(1))])
+def test_scrape_deadline_counts_overrun(executor, slow_scrape):
+    scrape_executor = ScrapeExecutor(executor=executor)
+
+    with pytest.raises(ScrapeTimeout):
+        scrape_executor.scrape("campus/device", "fakedriver", slow_scrape, interval=60, timeout=0.1)
+
+    statistics = scrape_executor.get_statistics()["campus/device"]
+    assert statistics["timeouts"] == 1
+    assert statistics["overruns"] == 1
+    scrape_executor.shutdown()
+
+
+@pytest.mark.driver_unit
+def test_blocking_scrapes_run_concurrently_in_thread_executor():
+    scrape_executor = ScrapeExecutor(executor="thread", max_concurrent_scrapes=10)
+
+    start = time.monotonic()
+    greenlets = [gevent.spawn(scrape_executor.scrape, "device{}".format(i), "fakedriver",
+                              lambda: time.sleep(0.2), 60) for i in range(5)]
+    gevent.joinall(greenlets, raise_error=True)
+
+    assert time.monotonic() - start < 0.5
+    scrape_executor.shutdown()
+
+
+@pytest.mark.driver_unit
+def test_interface_scrape_limit():
+    scrape_executor = ScrapeExecutor(interface_scrape_limits={"bacnet": 1})
+    running = []
+    peak = []
+
+    def scrape():
+        running.append(1)
+        peak.append(len(running))
+        gevent.sleep(0.05)
+        running.pop()
+        return {}
+
+    greenlets = [gevent.spawn(scrape_executor.scrape, "device{}".format(i), "bacnet", scrape, 60)
+                 for i in range(3)]
+    gevent.joinall(greenlets, raise_error=True)
+
+    assert max(peak) == 1
+
+
+@pytest.mark.driver_unit
+def test_no_deadline_by_default():
+    scrape_executor = ScrapeExecutor()
+
+    assert scrape_executor.scrape("campus/device", "fakedriver", lambda: gevent.sleep(0.1) or {}, interval=0.05) == {}
+
+    statistics = scrape_executor.get_statistics("campus/device")
+    assert statistics["timeouts"] == 0
+    assert statistics["overruns"] == 1
+
+
+@pytest.mark.driver_unit
+def test_shutdown_stops_thread_pool():
+    scrape_executor = ScrapeExecutor(executor="thread")
+    thread_pool = scrape_executor._thread_pool
+    scrape_executor.scrape("campus/device", "fakedriver", lambda: {}, interval=60)
+
+    scrape_executor.shutdown()
+
+    assert thread_pool.size == 0
+    assert scrape_executor._thread_pool is None
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+import pytest
+
+from platform_driver.scrape_scheduler import spread_scrape_offsets, scrape_offset_distance
+
+
+@pytest.mark.driver_unit
+def test_spread_scrape_offsets_in_proportion_to_duration():
+    devices = [("a", 0, 60, 1.0),
+               ("b", 0, 60, 3.0),
+               ("c", 0, 60, 2.0)]
+
+    offsets = spread_scrape_offsets(devices, group_offset_interval=0.0, default_duration=0.1)
+
+    assert offsets == {"a": 0.0, "b": 10.0, "c": 40.0}
+
+
+@pytest.mark.driver_unit
+def test_spread_scrape_offsets_uses_default_duration_for_new_devices():
+    devices = [("a", 0, 10, None),
+               ("b", 0, 10, None)]
+
+    offsets = spread_scrape_offsets(devices, group_offset_interval=0.0, default_duration=0.5)
+
+    assert offsets == {"a": 0.0, "b": 5.0}
+
+
+@pytest.mark.driver_unit
+def test_spread_scrape_offsets_keeps_groups_and_intervals_separate():
+    devices = [("a", 0, 60, 1.0),
+               ("b", 0, 60, 1.0),
+               ("c", 1, 60, 1.0),
+               ("d", 0, 30, 1.0)]
+
+    offsets = spread_scrape_offsets(devices, group_offset_interval=5.0, default_duration=0.1)
+
+    assert offsets == {"a": 0.0, "b": 30.0, "c": 5.0, "d": 0.0}
+
+
+@pytest.mark.driver_unit
+def test_scrape_offset_distance_wraps_around_interval():
+    assert scrape_offset_distance(10.0, 25.0, 60) == 15.0
+    assert scrape_offset_distance(59.5, 0.5, 60) == 1.0
+    assert scrape_offset_distance(0.0, 59.0, 60) == 1.0
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+
+import pytest
+
+from filewatchpublisher.tailer import FileTailer, LineBatcher
+
+
+def lines_of(read):
+    return [line for line, _ in read]
+
+
+def test_partial_line_waits_for_newline(tmpdir):
+    path = str(tmpdir.join("app.log"))
+    with open(path, "w") as f:
+        f.write("old\n")
+    tailer = FileTailer(path)
+
+    with open(path, "a") as f:
+        f.write("first\nsec")
+        f.flush()
+        assert lines_of(tailer.read_lines()) == ["first"]
+        f.write("ond\n")
+    assert lines_of(tailer.read_lines()) == ["second"]
+
+    # a trailing line is returned once the file stops growing
+    with open(path, "a") as f:
+        f.write("no newline")
+    assert tailer.read_lines() == []
+    assert lines_of(tailer.read_lines()) == ["no newline"]
+
+
+def test_rotation_reads_old_file_to_the_end(tmpdir):
+    path = str(tmpdir.join("app.log"))
+    with open(path, "w") as f:
+        f.write("")
+    tailer = FileTailer(path)
+
+    with open(path, "a") as f:
+        f.write("a\nb\n")
+    os.rename(path, path + ".1")
+    with open(path, "w") as f:
+        f.write("c\n")
+
+    assert lines_of(tailer.read_lines()) == ["a", "b", "c"]
+    assert tailer.position == (os.stat(path).st_ino, 2)
+
+
+def test_truncation_reads_from_the_start(tmpdir):
+    path = str(tmpdir.join("app.log"))
+    with open(path, "w") as f:
+        f.write("one\ntwo\n")
+    tailer = FileTailer(path)
+
+    with open(path, "w") as f:
+        f.write("x\n")
+    assert lines_of(tailer.read_lines()) == ["x"]
+
+
+def test_resume_from_saved_position(tmpdir):
+    path = str(tmpdir.join("app.log"))
+    with open(path, "w") as f:
+        f.write("one\ntwo\n")
+    tailer = FileTailer(path, start_at_end=False)
+    (_, first_position), _ = tailer.read_lines()
+    tailer.close()
+
+    with open(path, "a") as f:
+        f.write("three\n")
+    resumed = FileTailer(path, *first_position)
+    assert lines_of(resumed.read_lines()) == ["two", "three"]
+
+    # a different file at the path is read from its start
+    os.rename(path, path + ".1")
+    with open(path, "w") as f:
+        f.write("new\n")
+    replaced = FileTailer(path, *first_position)
+    assert lines_of(replaced.read_lines()) == ["new"]
+
+
+def test_batcher_caps():
+    batcher = LineBatcher(max_lines=3, max_bytes=10, max_delay=1.0)
+    assert batcher.add("a", 1, now=0) == []
+    assert batcher.add("b", 2, now=0) == []
+    assert batcher.add("c", 3, now=0) == [(["a", "b", "c"], 3)]
+
+    assert batcher.add("12345", 4, now=0) == []
+    assert batcher.add("123456", 5, now=0) == [(["12345"], 4)]
+    assert not batcher.due(now=0.5)
+    assert batcher.due(now=1.0)
+    assert batcher.flush() == (["123456"], 5)
+
+    with pytest.raises(ValueError):
+        LineBatcher(max_lines=0)
+
+
+def test_high_rate_writer_with_rotation_loses_nothing(tmpdir):
+    path = str(tmpdir.join("app.log"))
+    open(path, "w").close()
+    tailer = FileTailer(path)
+    batcher = LineBatcher(max_lines=100, max_bytes=65536, max_delay=0.05)
+    count = 20000
+    done = threading.Event()
+
+    def writer():
+        f = open(path, "a")
+        for i in range(count):
+            f.write("line {}\n".format(i))
+            if i == count // 2:
+                f.close()
+                os.rename(path, path + ".1")
+                f = open(path, "a")
+        f.close()
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+
+    published = []
+    while True:
+        finished = done.is_set()
+        now = time.monotonic()
+        for line, position in tailer.read_lines():
+            published.extend(batcher.add(line, position, now))
+        if batcher.due(now) or (finished and len(batcher)):
+            published.append(batcher.flush())
+        if finished:
+            break
+        time.sleep(0.001)
+    thread.join()
+
+    lines = [line for batch, _ in published for line in batch]
+    assert lines == ["line {}".format(i) for i in range(count)]
+    assert len(published) <= count / 50
+    assert published[-1][1] == (os.stat(path).st_ino, os.path.getsize(path))
@@ -27,20 +27,29 @@
 #}}}
 
 import gevent
+import json
 import logging
 import os.path
 import sys
+import time
 
 from datetime import datetime
-from volttron.platform.agent.utils import watch_file_with_fullpath
 from volttron.platform.vip.agent import Agent, Core
 from volttron.platform.agent import utils
 
+from .tailer import FileTailer, LineBatcher
+
 
 utils.setup_logging()
 _log = logging.getLogger(__name__)
 __version__ = '3.6'
 
+DEFAULT_BATCH_MAX_LINES = 100
+DEFAULT_BATCH_MAX_BYTES = 65536
+DEFAULT_BATCH_MAX_DELAY = 1.0
+DEFAULT_POLL_INTERVAL = 0.25
+STATE_FILE = "filewatchpublisher_state.json"
+
 
 def file_watch_publisher(config_path, **kwargs):
     """
@@ -60,6 +69,10 @@ class FileWatchPublisher(Agent):
     Monitors files from configuration for changes and publishes added lines on corresponding topics.
     Ignores if a file does not exist and move to next file in configuration with an error message.
     Exists if all files does not exist.
+
+    Lines are published in batches capped by line count, bytes and the age of the oldest line. Each
+    file is followed by inode and offset so rotated and truncated files are detected, and the
+    position of the last published line is saved so the agent resumes from it after a restart.
     :param config: Configuration dict
     :type config: dict
 
@@ -77,7 +90,11 @@ class FileWatchPublisher(Agent):
                     "file": "/home/volttron/tempfile.txt",
                     "topic": "temp/filepublisher",
                 }
-            ]
+            ],
+            "batch_max_lines": 100,
+            "batch_max_bytes": 65536,
+            "batch_max_delay": 1.0,
+            "poll_interval": 0.25
         }
     """
     def __init__(self, config, **kwargs):
@@ -85,19 +102,52 @@ class FileWatchPublisher(Agent):
         self.config = config
         items = config.get("files")
         assert isinstance(items, list)
+        self.batch_max_lines = int(config.get("batch_max_lines", DEFAULT_BATCH_MAX_LINES))
+        self.batch_max_bytes = int(config.get("batch_max_bytes", DEFAULT_BATCH_MAX_BYTES))
+        self.batch_max_delay = float(config.get("batch_max_delay", DEFAULT_BATCH_MAX_DELAY))
+        self.poll_interval = float(config.get("poll_interval", DEFAULT_POLL_INTERVAL))
+        self.state_path = config.get("state_file") or self._default_state_path()
         self.file_topic = {}
-        self.file_end_position = {}
-        for item in self.config.get("files"):
+        self.tailers = {}
+        self.batchers = {}
+        self.positions = self._load_positions()
+        self._positions_changed = False
+        for item in list(items):
             file = item["file"]
             self.file_topic[file] = item["topic"]
-            if os.path.isfile(file):
-                with open(file, 'r') as f:
-                    self.file_end_position[file] = self.get_end_position(f)
-            else:
+            if not os.path.isfile(file):
                 _log.error("File " + file + " does not exists. Ignoring this file.")
                 items.remove(item)
         self.files_to_watch = items
 
+    @staticmethod
+    def _default_state_path():
+        # The agent may only write to its agent-data directory once installed.
+        agent_data = os.path.join(os.getcwd(), os.path.basename(os.getcwd()) + ".agent-data")
+        if os.path.isdir(agent_data):
+            return os.path.join(agent_data, STATE_FILE)
+        return os.path.join(os.getcwd(), STATE_FILE)
+
+    def _load_positions(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            _log.error("Unable to read saved file positions from {}: {}".format(self.state_path, e))
+            return {}
+
+    def _save_positions(self):
+        tmp_path = self.state_path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.positions, f)
+            os.replace(tmp_path, self.state_path)
+            self._positions_changed = False
+        except OSError as e:
+            _log.error("Unable to save file positions to {}: {}".format(self.state_path, e))
+
     @Core.receiver('onstart')
     def starting(self, sender, **kwargs):
         _log.info("Starting "+self.__class__.__name__+" agent")
@@ -107,25 +157,54 @@ class FileWatchPublisher(Agent):
         else:
             for item in self.files_to_watch:
                 file = item["file"]
-                self.core.spawn(watch_file_with_fullpath, file, self.read_file)
+                inode, offset = self.positions.get(file, (None, None))
+                self.tailers[file] = FileTailer(file, inode, offset)
+                self.batchers[file] = LineBatcher(self.batch_max_lines, self.batch_max_bytes,
+                                                  self.batch_max_delay)
+            self.core.spawn(self.tail_files)
+
+    @Core.receiver('onstop')
+    def stopping(self, sender, **kwargs):
+        for file, batcher in self.batchers.items():
+            if len(batcher):
+                self.publish_batch(file, *batcher.flush())
+        if self._positions_changed:
+            self._save_positions()
+        for tailer in self.tailers.values():
+            tailer.close()
+
+    def tail_files(self):
+        while True:
+            behind = False
+            for file in self.tailers:
+                self.read_file(file)
+                behind = behind or self.tailers[file].behind
+            if self._positions_changed:
+                self._save_positions()
+            gevent.sleep(0 if behind else self.poll_interval)
 
     def read_file(self, file):
-        _log.debug('loading file %s', file)
-        with open(file, 'r') as f:
-            f.seek(self.file_end_position[file])
-            for line in f:
-                self.publish_file(line.strip(),self.file_topic[file])
-            self.file_end_position[file] = self.get_end_position(f)
-
-    def publish_file(self, line, topic):
+        batcher = self.batchers[file]
+        now = time.monotonic()
+        try:
+            lines = self.tailers[file].read_lines()
+        except OSError as e:
+            _log.error("Unable to read {}: {}".format(file, e))
+            lines = []
+        for line, position in lines:
+            for batch in batcher.add(line, position, now):
+                self.publish_batch(file, *batch)
+        if batcher.due(now):
+            self.publish_batch(file, *batcher.flush())
+
+    def publish_batch(self, file, lines, position):
+        topic = self.file_topic[file]
         message = {'timestamp':  datetime.utcnow().isoformat() + 'Z',
-                   'line': line}
-        _log.debug('publishing message {} on topic {}'.format(message, topic))
+                   'lines': lines}
+        _log.debug('publishing {} lines on topic {}'.format(len(lines), topic))
         self.vip.pubsub.publish(peer="pubsub", topic=topic, message=message)
-
-    def get_end_position(self, f):
-        f.seek(0, 2)
-        return f.tell()
+        self.positions[file] = position
+        self._positions_changed = True
 
 
 def main(argv=sys.argv):
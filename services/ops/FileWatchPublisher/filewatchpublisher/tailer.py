@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+import logging
+import os
+
+_log = logging.getLogger(__name__)
+
+
+class FileTailer:
+    """
+    Follows a file by inode and offset, returning complete lines as they are appended.
+
+    When the path is replaced by a new file (log rotation) the rest of the old file is read before
+    following the new one from its start. When the file shrinks below the current offset
+    (truncation) it is read again from the start. A trailing line without a newline is returned
+    once the file has stopped growing for a whole read.
+
+    :param path: Path of the file to follow
+    :param inode: Inode of a previously saved position, or None
+    :param offset: Offset of a previously saved position, or None
+    :param start_at_end: Start at the end of the file when there is no usable saved position
+    :param max_read: Bytes read per call at most, `behind` is set when more may be waiting
+    """
+    def __init__(self, path, inode=None, offset=None, start_at_end=True, max_read=1048576,
+                 chunk_size=65536):
+        self.path = path
+        self.max_read = max_read
+        self.chunk_size = chunk_size
+        self.behind = False
+        self.inode = None
+        # offset of the next byte to read; bytes of a partial line before it are in _partial
+        self._offset = 0
+        self._partial = b""
+        self._file = None
+        self._open(inode, offset, start_at_end)
+
+    @property
+    def position(self):
+        """(inode, offset) just past the last complete line returned."""
+        return self.inode, self._offset - len(self._partial)
+
+    def _open(self, inode=None, offset=None, start_at_end=False):
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(f.fileno())
+        if inode is not None and stat.st_ino == inode and offset is not None and offset <= stat.st_size:
+            start = offset
+        elif inode is None and start_at_end:
+            start = stat.st_size
+        else:
+            if inode is not None and stat.st_ino != inode:
+                _log.info("%s was replaced while not being followed, reading it from the start", self.path)
+            start = 0
+        f.seek(start)
+        self._file = f
+        self.inode = stat.st_ino
+        self._offset = start
+        self._partial = b""
+        return True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read_lines(self):
+        """
+        Return the complete lines appended since the last call as (line, position) tuples, where
+        position is the (inode, offset) just past the line.
+        """
+        if self._file is None:
+            if not self._open():
+                return []
+            return self._read()
+
+        try:
+            path_inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            path_inode = None
+
+        if path_inode is not None and path_inode != self.inode:
+            _log.info("%s was rotated, following the new file", self.path)
+            lines = self._read(final=True)
+            self.close()
+            self._open()
+            return lines + self._read()
+
+        if os.fstat(self._file.fileno()).st_size < self._offset:
+            _log.info("%s was truncated, reading it from the start", self.path)
+            lines = self._take_partial()
+            self._file.seek(0)
+            self._offset = 0
+            return lines + self._read()
+
+        return self._read()
+
+    def _read(self, final=False):
+        start = self._offset - len(self._partial)
+        chunks = [self._partial]
+        read = 0
+        self.behind = False
+        while True:
+            chunk = self._file.read(self.chunk_size)
+            if not chunk:
+                break
+            read += len(chunk)
+            chunks.append(chunk)
+            if read >= self.max_read and not final:
+                self.behind = True
+                break
+        self._offset += read
+
+        *raw_lines, self._partial = b"".join(chunks).split(b"\n")
+        lines = []
+        for raw in raw_lines:
+            start += len(raw) + 1
+            lines.append((self._decode(raw), (self.inode, start)))
+        if final or not read:
+            lines.extend(self._take_partial())
+        return lines
+
+    def _take_partial(self):
+        if not self._partial:
+            return []
+        line = self._decode(self._partial)
+        self._partial = b""
+        return [(line, (self.inode, self._offset))]
+
+    @staticmethod
+    def _decode(line):
+        return line.decode("utf-8", errors="replace").strip()
+
+
+class LineBatcher:
+    """
+    Groups lines into batches capped by line count, size in bytes and age of the oldest line.
+
+    Each line is added with the file position just past it so the position of a published
+    batch can be saved.
+
+    :param max_lines: Most lines in a batch
+    :param max_bytes: Most bytes of line text in a batch
+    :param max_delay: Seconds a line may wait for its batch to be published
+    """
+    def __init__(self, max_lines=100, max_bytes=65536, max_delay=1.0):
+        if max_lines < 1 or max_bytes < 1 or max_delay < 0:
+            raise ValueError("Batch caps must be positive")
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self._lines = []
+        self._bytes = 0
+        self._started = None
+        self._position = None
+
+    def __len__(self):
+        return len(self._lines)
+
+    def add(self, line, position, now):
+        """
+        Add a line and return the batches it completed as (lines, position) tuples.
+        """
+        batches = []
+        size = len(line.encode("utf-8"))
+        if self._lines and self._bytes + size > self.max_bytes:
+            batches.append(self.flush())
+        if not self._lines:
+            self._started = now
+        self._lines.append(line)
+        self._bytes += size
+        self._position = position
+        if len(self._lines) >= self.max_lines or self._bytes >= self.max_bytes:
+            batches.append(self.flush())
+        return batches
+
+    def due(self, now):
+        return bool(self._lines) and now - self._started >= self.max_delay
+
+    def flush(self):
+        """Return the pending batch as a (lines, position) tuple and start a new one."""
+        batch = self._lines, self._position
+        self._lines = []
+        self._bytes = 0
+        self._started = None
+        return batch
@@ -187,6 +187,18 @@ Querying Data
 - When a request is made for the list of aggregate topics available
   :py:meth:`BaseQueryHistorianAgent.query_aggregate_topics` will be called
 
+Large results can be read in bounded pages with
+:py:meth:`BaseQueryHistorianAgent.query_paged` and
+:py:meth:`BaseQueryHistorianAgent.query_next_page`, or streamed over a VIP
+channel with :py:meth:`BaseQueryHistorianAgent.export`. Both page through
+:py:meth:`BaseQueryHistorianAgent.query_historian` by timestamp, so
+historians get them without implementing anything further.
+
+Results of :py:meth:`BaseQueryHistorianAgent.query` can be kept in an in
+memory LRU cache by setting ``query_cache_size_mb``. Entries are dropped when
+:py:class:`BaseHistorian` publishes records for one of their topics inside
+their time range.
+
 
 Other Notes
 -----------
@@ -201,7 +213,7 @@ the same date over again.
 
 
 from abc import abstractmethod
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
 import logging
@@ -211,6 +223,8 @@ import re
 import sqlite3
 import threading
 from threading import Thread
+import time
+import uuid
 import weakref
 
 from dateutil.parser import parse
@@ -252,6 +266,7 @@ try:
 except ImportError:
     from volttron.platform.jsonapi import dumps, loads
 
+from volttron.platform import jsonapi
 from volttron.platform.agent import utils
 
 _log = logging.getLogger(__name__)
@@ -944,8 +959,7 @@ class BaseHistorianAgent(Agent):
 
     def _capture_data(self, peer, sender, bus, topic, headers, message,
                       device):
-        # Anon the topic if necessary.
-        topic = self.get_renamed_topic(topic)
+        # topic and device are already renamed by the caller.
         timestamp_string = headers.get(headers_mod.SYNC_TIMESTAMP if self._sync_timestamp else headers_mod.TIMESTAMP,
                                        headers.get(headers_mod.DATE))
         timestamp = get_aware_utc_now()
@@ -993,13 +1007,14 @@ class BaseHistorianAgent(Agent):
         if self.gather_timing_data:
             add_timing_data_to_header(headers, self.core.agent_uuid or self.core.identity, "collected")
 
-        for key, value in values.items():
-            point_topic = device + '/' + key
-            self._event_queue.put({'source': source,
-                                   'topic': point_topic,
-                                   'readings': [(timestamp, value)],
-                                   'meta': meta.get(key, {}),
-                                   'headers': headers})
+        # Queue one record for the whole device. The backup database expands
+        # it to one row per point.
+        self._event_queue.put({'source': source,
+                               'device': device,
+                               'timestamp': timestamp,
+                               'values': values,
+                               'meta': meta,
+                               'headers': headers})
 
     def _capture_actuator_data(self, topic, headers, message, match):
         """Capture actuation data and submit it to be published by a historian.
@@ -1233,6 +1248,7 @@ class BaseHistorianAgent(Agent):
                         # this call with check of cache_only_enabled
                         backupdb.remove_successfully_published(
                                 self._successful_published, self._submit_size_limit)
+                        self._records_published(to_publish_list, self._successful_published)
 
                         backlog_count = backupdb.get_backlog_count()
                         old_backlog_state = self._current_status_context[STATUS_KEY_BACKLOGGED]
@@ -1316,6 +1332,15 @@ class BaseHistorianAgent(Agent):
         """
         self._successful_published.add(None)
 
+    def _records_published(self, to_publish_list, successful_published):
+        """
+        Called from the publishing thread after records reported by
+        :py:meth:`BaseHistorianAgent.publish_to_historian` were removed from
+        the cache. :py:class:`BaseHistorian` uses it to keep its query result
+        cache current.
+        """
+        pass
+
     @abstractmethod
     def publish_to_historian(self, to_publish_list):
         """
@@ -1477,31 +1502,17 @@ class BackupDatabase:
         for item in new_publish_list:
             if item is None:
                 continue
+            if 'device' in item:
+                self._backup_device_data(c, item, time_tolerance_check)
+                continue
             source = item['source']
             topic = item['topic']
             meta = item.get('meta', {})
             readings = item['readings']
             headers = item.get('headers', {})
 
-            topic_id = self._backup_cache.get(topic)
-
-            if topic_id is None:
-                c.execute('''INSERT INTO topics values (?,?)''',
-                          (None, topic))
-                c.execute('''SELECT last_insert_rowid()''')
-                row = c.fetchone()
-                topic_id = row[0]
-                self._backup_cache[topic_id] = topic
-                self._backup_cache[topic] = topic_id
-
-            meta_dict = self._meta_data[(source, topic_id)]
-            for name, value in meta.items():
-                current_meta_value = meta_dict.get(name)
-                if current_meta_value != value:
-                    c.execute('''INSERT OR REPLACE INTO metadata
-                                 values(?, ?, ?, ?)''',
-                              (source, topic_id, name, value))
-                    meta_dict[name] = value
+            topic_id = self._get_topic_id(c, topic)
+            self._update_meta(c, source, topic_id, meta)
 
             # Check outside loop so that we do the check inside loop only if necessary
             if time_tolerance_check:
@@ -1629,6 +1640,71 @@ class BackupDatabase:
                 self.time_error_records = True
         return cache_full
 
+    def _get_topic_id(self, c, topic):
+        topic_id = self._backup_cache.get(topic)
+
+        if topic_id is None:
+            c.execute('''INSERT INTO topics values (?,?)''',
+                      (None, topic))
+            c.execute('''SELECT last_insert_rowid()''')
+            row = c.fetchone()
+            topic_id = row[0]
+            self._backup_cache[topic_id] = topic
+            self._backup_cache[topic] = topic_id
+        return topic_id
+
+    def _update_meta(self, c, source, topic_id, meta):
+        meta_dict = self._meta_data[(source, topic_id)]
+        for name, value in meta.items():
+            current_meta_value = meta_dict.get(name)
+            if current_meta_value != value:
+                c.execute('''INSERT OR REPLACE INTO metadata
+                             values(?, ?, ?, ?)''',
+                          (source, topic_id, name, value))
+                meta_dict[name] = value
+
+    def _backup_device_data(self, c, item, time_tolerance_check):
+        """
+        Cache a device record queued by
+        :py:meth:`BaseHistorianAgent._capture_data` as one row per point,
+        inserted with a single statement.
+        """
+        source = item['source']
+        device = item['device']
+        timestamp = item['timestamp']
+        meta = item['meta']
+        headers = item['headers']
+        header_string = dumps(headers)
+
+        rows = []
+        for point, value in item['values'].items():
+            topic_id = self._get_topic_id(c, device + '/' + point)
+            self._update_meta(c, source, topic_id, meta.get(point, {}))
+            rows.append((timestamp, source, topic_id, dumps(value),
+                         header_string))
+
+        if time_tolerance_check and headers.get("time_error"):
+            _log.warning(f"Found data with timestamp {timestamp} that is out of configured tolerance ")
+            table = 'time_error'
+            self.time_error_records = True
+        else:
+            table = 'outstanding'
+        statement = f'''INSERT INTO {table} values(NULL, ?, ?, ?, ?, ?)'''
+        try:
+            c.executemany(statement, rows)
+            inserted = len(rows)
+        except sqlite3.IntegrityError:
+            # Retry row by row so only the conflicting rows are skipped.
+            inserted = 0
+            for row in rows:
+                try:
+                    c.execute(statement, row)
+                    inserted += 1
+                except sqlite3.IntegrityError as e:
+                    _log.warning(f"sqlite3.Integrity error -- {e}")
+        if table == 'outstanding':
+            self._record_count += inserted
+
     def remove_successfully_published(self, successful_publishes,
                                       submit_size):
         """
@@ -1889,12 +1965,180 @@ for method in [BackupDatabase.get_outstanding_to_publish,
     setattr(AsyncBackupDatabase, method.__name__, _using_threadpool(method))
 
 
+class QueryCursor(object):
+    """
+    Server side state of a paged query. Only the query parameters and the
+    position reached in the current topic are kept, not the results.
+    """
+
+    def __init__(self, topics, multi_topic, start, end, agg_type, agg_period,
+                 skip, count, order, page_size):
+        self.topics = list(topics)
+        self.multi_topic = multi_topic
+        self.start = start
+        self.end = end
+        self.agg_type = agg_type
+        self.agg_period = agg_period
+        self.skip = skip
+        self.count = count
+        self.order = order
+        self.page_size = page_size
+        # timestamp of the last row returned for self.topics[0]
+        self.position = None
+        self.returned = 0
+        self.last_access = time.monotonic()
+
+    def next_topic(self):
+        self.topics.pop(0)
+        self.position = None
+        self.returned = 0
+
+
+class QueryResultCache(object):
+    """
+    LRU cache of query results bounded by the size of the serialized
+    results. Entries are found by the normalized query arguments and dropped
+    when data is written for one of their topics inside their time range or
+    after max_age seconds.
+
+    Writes are reported from the publishing thread, so all access is done
+    holding a lock. Each write also bumps a generation for its topics, and a
+    result is only stored if none of its topics were written while it was
+    being queried.
+    """
+
+    def __init__(self, max_size_mb, max_age=60):
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age = max_age
+        # key -> (lower case topics, start, end, created, serialized results)
+        self._entries = OrderedDict()
+        # lower case topic -> set of keys
+        self._topic_keys = defaultdict(set)
+        # lower case topic -> number of invalidating writes
+        self._generations = defaultdict(int)
+        # bumped by clear()
+        self._epoch = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and \
+                    time.monotonic() - entry[3] > self.max_age:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[4]
+        return jsonapi.loads(payload)
+
+    def generation(self, topics):
+        """
+        Get the generation of the topics, taken before querying the results
+        later passed to :py:meth:`put`.
+        """
+        topics = sorted({t.lower() for t in topics})
+        with self._lock:
+            return self._generation(topics)
+
+    def put(self, key, topics, start, end, results, generation=None):
+        """
+        :param topics: Topics of the query.
+        :param start: Start of the range the results cover, None if open.
+        :param end: End of the range the results cover, None if open.
+        :param generation: Value of :py:meth:`generation` before the query,
+                           the results are dropped if it has changed since.
+        """
+        try:
+            payload = jsonapi.dumps(results)
+        except (TypeError, ValueError):
+            return
+        if len(payload) > self.max_bytes:
+            return
+        topics = {t.lower() for t in topics}
+        with self._lock:
+            if generation is not None and \
+                    self._generation(sorted(topics)) != generation:
+                # data was written for the topics during the query
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (topics, start, end, time.monotonic(),
+                                  payload)
+            self._size += len(payload)
+            for topic in topics:
+                self._topic_keys[topic].add(key)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, written):
+        """
+        Drop the entries whose results could include newly written data.
+
+        :param written: Dictionary of topic to the (earliest, latest)
+                        timestamps written for it.
+        """
+        with self._lock:
+            for topic, (earliest, latest) in written.items():
+                self._generations[topic.lower()] += 1
+                for key in list(self._topic_keys.get(topic.lower(), ())):
+                    _, start, end, _, _ = self._entries[key]
+                    if (start is None or latest >= start) and \
+                            (end is None or earliest < end):
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._topic_keys.clear()
+            self._generations.clear()
+            self._epoch += 1
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "evictions": self.evictions,
+                    "invalidations": self.invalidations,
+                    "entries": len(self._entries),
+                    "size_bytes": self._size,
+                    "max_bytes": self.max_bytes}
+
+    def _generation(self, topics):
+        return self._epoch, tuple(self._generations.get(topic, 0)
+                                  for topic in topics)
+
+    def _remove(self, key):
+        topics, _, _, _, payload = self._entries.pop(key)
+        self._size -= len(payload)
+        for topic in topics:
+            keys = self._topic_keys[topic]
+            keys.discard(key)
+            if not keys:
+                del self._topic_keys[topic]
+
+
 class BaseQueryHistorianAgent(Agent):
     """This is the base agent for historian Agents that support querying of
     their data stores.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, query_cursor_timeout=300, query_cache_size_mb=0,
+                 query_cache_max_age=60, **kwargs):
         _log.debug('Constructor of BaseQueryHistorianAgent thread: {}'.format(
             threading.currentThread().getName()
         ))
@@ -1905,10 +2149,18 @@ class BaseQueryHistorianAgent(Agent):
                 for d in os.listdir(os.getcwd()):
                     if d.endswith(".agent-data"):
                         agent_data_dir = os.path.join(os.getcwd(), d)
-                time_parser = yacc.yacc(write_tables=0,
+                time_parser = yacc.yacc(write_tables=0, debug=False,
                                         outputdir=agent_data_dir)
             else:
-                time_parser = yacc.yacc(write_tables=0)
+                # debug output would write parser.out into the source tree
+                time_parser = yacc.yacc(write_tables=0, debug=False)
+        # paged queries not continued within this many seconds are dropped
+        self._query_cursor_timeout = query_cursor_timeout
+        self._query_cursors = {}
+        self._query_cache = None
+        if query_cache_size_mb:
+            self._query_cache = QueryResultCache(query_cache_size_mb,
+                                                 query_cache_max_age)
         super(BaseQueryHistorianAgent, self).__init__(**kwargs)
 
     @RPC.export
@@ -2081,6 +2333,281 @@ class BaseQueryHistorianAgent(Agent):
 
         """
 
+        start_arg, end_arg = start, end
+        start, end, agg_period = self._parse_query_args(topic, start, end,
+                                                        agg_type, agg_period)
+        cache_key = None
+        topics = topic if isinstance(topic, list) else [topic]
+        if self._query_cache is not None:
+            # Relative times are kept as given so that repeated queries such
+            # as "now -1d" find the same entry until it ages out.
+            cache_key = (tuple(topic) if isinstance(topic, list) else topic,
+                         self._cache_time_key(start_arg, start),
+                         self._cache_time_key(end_arg, end),
+                         agg_type.lower() if agg_type else agg_type,
+                         agg_period, skip, count, order)
+            results = self._query_cache.get(cache_key)
+            if results is not None:
+                return results
+            generation = self._query_cache.generation(topics)
+
+        results = self.query_historian(topic, start, end, agg_type,
+                                       agg_period, skip, count, order)
+        metadata = results.get("metadata", None)
+        values = results.get("values", None)
+        if values and metadata is None:
+            results['metadata'] = {}
+
+        if cache_key is not None:
+            # A range ending "now" also grows with data written afterwards.
+            if self._is_relative_time(end_arg):
+                end = None
+            self._query_cache.put(cache_key, topics, start, end, results,
+                                  generation)
+        return results
+
+    @RPC.export
+    def get_query_cache_stats(self):
+        """RPC call to get the hit and miss counters of the query result
+        cache.
+
+        :return: Dictionary of counters, empty if the cache is disabled.
+        :rtype: dict
+        """
+        if self._query_cache is None:
+            return {}
+        return self._query_cache.stats()
+
+    @RPC.export
+    def clear_query_cache(self):
+        """RPC call to drop all entries of the query result cache."""
+        if self._query_cache is not None:
+            self._query_cache.clear()
+
+    def invalidate_query_cache(self, records):
+        """
+        Drop cached query results that could include the given records.
+
+        :param records: Records as passed to
+                        :py:meth:`BaseHistorianAgent.publish_to_historian`
+        :type records: list
+        """
+        if self._query_cache is None or not records:
+            return
+        written = {}
+        for record in records:
+            topic = record['topic']
+            timestamp = record['timestamp']
+            earliest, latest = written.get(topic, (timestamp, timestamp))
+            written[topic] = (min(earliest, timestamp), max(latest, timestamp))
+        self._query_cache.invalidate(written)
+
+    @staticmethod
+    def _is_relative_time(value):
+        return isinstance(value, str) and 'now' in value.lower()
+
+    def _cache_time_key(self, value, parsed):
+        return value if self._is_relative_time(value) else parsed
+
+    @RPC.export
+    def query_paged(self, topic=None, start=None, end=None, agg_type=None,
+                    agg_period=None, skip=0, count=None,
+                    order="FIRST_TO_LAST", page_size=1000):
+        """RPC call to query an Historian for time series data one page at a
+        time. Takes the same arguments as
+        :py:meth:`BaseQueryHistorianAgent.query` and returns the first page
+        in the same format with an additional "cursor" entry. While "cursor"
+        is not None pass it to
+        :py:meth:`BaseQueryHistorianAgent.query_next_page` for the next page.
+
+        Each page holds at most page_size values of a single topic. For a
+        query on multiple topics "values" maps the topic to its values as in
+        :py:meth:`BaseQueryHistorianAgent.query`, and the topics are returned
+        one after another. A cursor that is not used for
+        query_cursor_timeout seconds expires.
+
+        Pages are read by timestamp rather than by offset, so a topic must
+        not have more than one value per timestamp.
+
+        :param page_size: Maximum number of values returned per page.
+        :type page_size: int
+        :return: First page of results
+        :rtype: dict
+        """
+        start, end, agg_period = self._parse_query_args(topic, start, end,
+                                                        agg_type, agg_period)
+        if int(page_size) < 1:
+            raise ValueError("page_size must be at least 1")
+        topics = topic if isinstance(topic, list) else [topic]
+        cursor = QueryCursor(topics, isinstance(topic, list), start, end,
+                             agg_type, agg_period, skip, count, order,
+                             int(page_size))
+        self._expire_query_cursors()
+        token = uuid.uuid4().hex
+        self._query_cursors[token] = cursor
+        return self._next_page(token, cursor)
+
+    @RPC.export
+    def query_next_page(self, cursor):
+        """RPC call to get the next page of a query started with
+        :py:meth:`BaseQueryHistorianAgent.query_paged`.
+
+        :param cursor: "cursor" entry of the previous page
+        :type cursor: str
+        :return: Next page of results
+        :rtype: dict
+        """
+        self._expire_query_cursors()
+        query_cursor = self._query_cursors.get(cursor)
+        if query_cursor is None:
+            raise ValueError("Unknown or expired query cursor {}".format(
+                cursor))
+        return self._next_page(cursor, query_cursor)
+
+    @RPC.export
+    def close_query_cursor(self, cursor):
+        """RPC call to release a paged query before reading all of its
+        pages.
+
+        :param cursor: "cursor" entry of the last page read
+        :type cursor: str
+        """
+        self._query_cursors.pop(cursor, None)
+
+    @RPC.export
+    def export(self, channel_name, topic=None, start=None, end=None,
+               agg_type=None, agg_period=None, skip=0, count=None,
+               order="FIRST_TO_LAST", page_size=1000):
+        """RPC call to stream the results of a query over a VIP channel
+        instead of returning them in the RPC reply. Takes the same query
+        arguments as :py:meth:`BaseQueryHistorianAgent.query_paged`.
+
+        The caller opens the channel before making the call, then sends
+        b"fetch" for every page it is ready to receive. Each page is sent as
+        a JSON object in the format of
+        :py:meth:`BaseQueryHistorianAgent.query_paged` without "cursor". After
+        the last page b"complete" is sent.
+
+        .. code-block:: python
+
+            channel = agent.vip.channel('platform.historian', 'export')
+            result = agent.vip.rpc.call('platform.historian', 'export',
+                                        'export', topic, start, end)
+            while True:
+                channel.send(b"fetch")
+                page = channel.recv()
+                if page == b"complete":
+                    break
+                process(jsonapi.loadb(page))
+            rows = result.get(timeout=10)
+            channel.close(linger=0)
+
+        :param channel_name: name of the channel opened by the caller
+        :type channel_name: str
+        :return: Number of values sent
+        :rtype: int
+        """
+        if self.core.messagebus != 'zmq':
+            raise ValueError("export requires the zmq message bus, "
+                             "use query_paged instead")
+        page = self.query_paged(topic, start, end, agg_type, agg_period,
+                                skip, count, order, page_size)
+        token = page.pop("cursor")
+        peer = self.vip.rpc.context.vip_message.peer
+        channel = self.vip.channel(peer, channel_name)
+        sent = 0
+        try:
+            while True:
+                with gevent.Timeout(30):
+                    request = channel.recv()
+                if request != b"fetch":
+                    raise ValueError("Unexpected export request {}".format(
+                        request))
+                if page is None:
+                    channel.send(b"complete")
+                    break
+                values = page["values"]
+                sent += sum(len(v) for v in values.values()) \
+                    if isinstance(values, dict) else len(values)
+                channel.send(jsonapi.dumpb(page))
+                page = None
+                if token is not None:
+                    page = self.query_next_page(token)
+                    token = page.pop("cursor")
+        except gevent.Timeout:
+            _log.warning("Export to {} timed out waiting for the next "
+                         "fetch".format(peer))
+            raise
+        finally:
+            if token is not None:
+                self.close_query_cursor(token)
+            channel.close(linger=0)
+            del channel
+        return sent
+
+    def _expire_query_cursors(self):
+        deadline = time.monotonic() - self._query_cursor_timeout
+        for token, cursor in list(self._query_cursors.items()):
+            if cursor.last_access < deadline:
+                _log.debug("Query cursor {} expired".format(token))
+                del self._query_cursors[token]
+
+    def _next_page(self, token, cursor):
+        """
+        Reads the next page of a paged query. The following page of a topic
+        starts right after the timestamp of the last value returned, which
+        avoids large offsets in the data store.
+        """
+        cursor.last_access = time.monotonic()
+        values = []
+        metadata = {}
+        topic = None
+        while cursor.topics:
+            topic = cursor.topics[0]
+            limit = cursor.page_size
+            if cursor.count is not None:
+                limit = min(limit, cursor.count - cursor.returned)
+            start, end, skip = cursor.start, cursor.end, 0
+            if cursor.position is None:
+                skip = cursor.skip
+            elif cursor.order == "LAST_TO_FIRST":
+                end = cursor.position
+                if start is not None and end <= start:
+                    # the last page ended at start, querying start == end
+                    # would match the row at start again
+                    cursor.next_topic()
+                    continue
+            else:
+                # start is inclusive, skip the value already returned
+                start, skip = cursor.position, 1
+            results = self.query_historian(topic, start, end,
+                                           cursor.agg_type, cursor.agg_period,
+                                           skip, limit, cursor.order) \
+                if limit > 0 else {}
+            values = results.get("values") or []
+            metadata = results.get("metadata") or {}
+            cursor.returned += len(values)
+            if len(values) < limit or cursor.returned == cursor.count or \
+                    (start is not None and start == end):
+                cursor.next_topic()
+            else:
+                position = values[-1][0]
+                if isinstance(position, str):
+                    position = parse_timestamp_string(position)
+                if position.tzinfo is None:
+                    position = position.replace(tzinfo=pytz.UTC)
+                cursor.position = position
+            if values:
+                break
+
+        page = {"values": {topic: values} if cursor.multi_topic else values,
+                "metadata": {} if cursor.multi_topic else metadata,
+                "cursor": token if cursor.topics else None}
+        if not cursor.topics:
+            self._query_cursors.pop(token, None)
+        return page
+
+    def _parse_query_args(self, topic, start, end, agg_type, agg_period):
         if topic is None:
             raise TypeError('"Topic" required')
 
@@ -2114,15 +2641,7 @@ class BaseQueryHistorianAgent(Agent):
 
         if start:
             _log.debug("start={}".format(start))
-
-        results = self.query_historian(topic, start, end, agg_type,
-                                       agg_period, skip, count, order)
-        metadata = results.get("metadata", None)
-        values = results.get("values", None)
-        if values and metadata is None:
-            results['metadata'] = {}
-
-        return results
+        return start, end, agg_period
 
     @abstractmethod
     def query_historian(self, topic, start=None, end=None, agg_type=None,
@@ -2200,6 +2719,16 @@ class BaseHistorian(BaseHistorianAgent, BaseQueryHistorianAgent):
         ))
         super(BaseHistorian, self).__init__(**kwargs)
 
+    def _records_published(self, to_publish_list, successful_published):
+        if self._query_cache is None:
+            return
+        if None in successful_published:
+            records = to_publish_list
+        else:
+            records = [r for r in to_publish_list
+                       if r['_id'] in successful_published]
+        self.invalidate_query_cache(records)
+
 
 # The following code is
 # Copyright (c) 2011, 2012, Regents of the University of California
@@ -44,6 +44,19 @@ On start calls the following methods
   - :py:meth:`BaseTaggingService.load_valid_tags`
   - :py:meth:`BaseTaggingService.load_tag_refs`
 
+Topic prefix index
+------------------
+Tagging apis that accept a topic name pattern resolve it against an in-memory
+index of the historian's topics. The index is loaded on start and refreshed
+every topic_index_refresh_interval seconds from the historian's
+get_topic_list. A pattern that matches nothing in the index is resolved by
+querying the historian directly and any topics found are added to the index.
+Historians do not report new topics, so a pattern that already has matches in
+the index does not return topics added to the historian since the last
+refresh until the next one, up to topic_index_refresh_interval seconds later.
+Setting topic_index_refresh_interval to 0 disables the index and queries the
+historian on every call.
+
 Querying for topics based on tags
 ---------------------------------
 Base tagging service provides a parser to parse query
@@ -61,6 +74,7 @@ import re
 from abc import abstractmethod
 
 from volttron.platform.agent.known_identities import (PLATFORM_HISTORIAN)
+from volttron.platform.scheduling import periodic
 from volttron.platform.vip.agent import Agent, Core, RPC
 from volttron.platform.vip.agent.errors import Unreachable
 
@@ -68,19 +82,140 @@ from volttron.platform.vip.agent.errors import Unreachable
 _log = logging.getLogger(__name__)
 
 
+class TopicPrefixIndex(object):
+    """
+    In-memory tree of topic names split on '/', used to find the topic
+    prefixes matching a topic pattern without scanning every topic.
+
+    Leading pattern parts without regular expression characters are looked
+    up directly in the tree. Only the prefixes below them are matched
+    against the pattern.
+    """
+
+    _REGEX_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+    def __init__(self, topics=None):
+        self._root = dict()
+        self._topics = set()
+        if topics:
+            self.update(topics)
+
+    def __len__(self):
+        return len(self._topics)
+
+    def __contains__(self, topic):
+        return topic in self._topics
+
+    def add(self, topic):
+        """
+        Adds a topic to the index.
+
+        :return: True if the topic was not in the index before
+        """
+        if topic in self._topics:
+            return False
+        self._topics.add(topic)
+        node = self._root
+        for part in topic.split("/"):
+            node = node.setdefault(part, dict())
+        return True
+
+    def remove(self, topic):
+        """
+        Removes a topic from the index.
+
+        :return: True if the topic was in the index
+        """
+        if topic not in self._topics:
+            return False
+        self._topics.discard(topic)
+        parts = topic.split("/")
+        path = []
+        node = self._root
+        for part in parts:
+            path.append((node, part))
+            node = node[part]
+        # prune nodes that no longer lead to a topic
+        for depth in range(len(parts), 0, -1):
+            parent, part = path[depth - 1]
+            if parent[part] or "/".join(parts[:depth]) in self._topics:
+                break
+            del parent[part]
+        return True
+
+    def update(self, topics):
+        """
+        Brings the index in line with the given complete list of topics,
+        adding new topics and removing topics no longer present.
+
+        :return: tuple of number of topics added and removed
+        """
+        topics = set(topics)
+        added = [topic for topic in topics if self.add(topic)]
+        removed = [topic for topic in self._topics - topics]
+        for topic in removed:
+            self.remove(topic)
+        return len(added), len(removed)
+
+    def match(self, topic_pattern):
+        """
+        Returns the topic prefixes with as many parts as topic_pattern,
+        or shorter topic names, that fully match topic_pattern.
+
+        :param topic_pattern: regular expression matched against topic prefixes
+        :type topic_pattern: str
+        :return: set of topic prefixes
+        """
+        pattern_parts = topic_pattern.split("/")
+        regex = re.compile(topic_pattern + "$")
+        node = self._root
+        literal_parts = []
+        for part in pattern_parts:
+            if self._REGEX_CHARS.intersection(part):
+                break
+            node = node.get(part)
+            if node is None:
+                return set()
+            literal_parts.append(part)
+
+        matches = set()
+        stack = [(node, literal_parts)]
+        while stack:
+            node, parts = stack.pop()
+            prefix = "/".join(parts)
+            if len(parts) == len(pattern_parts) or (parts and prefix in self._topics):
+                if regex.match(prefix):
+                    matches.add(prefix)
+                if len(parts) == len(pattern_parts):
+                    continue
+            for part, child in node.items():
+                stack.append((child, parts + [part]))
+        return matches
+
+
 class BaseTaggingService(Agent):
     """This is the base class for tagging service implementations. There can
     be different implementations based on backend/data store used to persist
     the tag details
+
+    Topic name patterns are resolved against an index of the historian's
+    topics refreshed every topic_index_refresh_interval seconds (default
+    300, 0 disables the index). Topics added to the historian since the last
+    refresh are only returned for patterns with no match in the index, so
+    other patterns can miss them for up to that interval.
     """
 
-    def __init__(self, historian_vip_identity=None, **kwargs):
+    def __init__(self, historian_vip_identity=None,
+                 topic_index_refresh_interval=300, **kwargs):
         super(BaseTaggingService, self).__init__(**kwargs)
         self.valid_tags = dict()
         self.tag_refs = dict()
         self.historian_vip_identity = historian_vip_identity
         if historian_vip_identity is None:
             self.historian_vip_identity = PLATFORM_HISTORIAN
+        self.topic_index_refresh_interval = topic_index_refresh_interval
+        # None until the historian's topic list was loaded once
+        self.topic_index = None
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.resource_sub_dir = os.path.join(current_dir, "../../..",
                                              "volttron_data/tagging_resources")
@@ -110,6 +245,32 @@ class BaseTaggingService(Agent):
         self.setup()
         self.load_valid_tags()
         self.load_tag_refs()
+        if self.topic_index_refresh_interval:
+            self.core.schedule(periodic(self.topic_index_refresh_interval),
+                               self.refresh_topic_index)
+
+    def refresh_topic_index(self):
+        """
+        Loads the historian's topic list into the topic prefix index, adding
+        new and removing deleted topics. If the historian cannot be reached
+        the current index is kept.
+        """
+        try:
+            topics = self.vip.rpc.call(self.historian_vip_identity,
+                                       "get_topic_list").get(timeout=30)
+        except Exception as e:
+            _log.warning("Unable to refresh topic index from {}. "
+                         "Exception:{}".format(self.historian_vip_identity,
+                                               e.args))
+            return
+        if self.topic_index is None:
+            self.topic_index = TopicPrefixIndex(topics)
+            _log.debug("Loaded topic index with {} topics".format(
+                len(self.topic_index)))
+        else:
+            added, removed = self.topic_index.update(topics)
+            _log.debug("Refreshed topic index. {} topics added, {} "
+                       "removed".format(added, removed))
 
     @abstractmethod
     def setup(self):
@@ -573,6 +734,12 @@ class BaseTaggingService(Agent):
         """
         # replace * with .* so regex would match correctly
         topic_pattern = topic_pattern.replace("*", ".*")
+        if self.topic_index is not None:
+            topic_prefixes = self.topic_index.match(topic_pattern)
+            if topic_prefixes:
+                _log.debug("topic prefixes from index {}".format(
+                    topic_prefixes))
+                return topic_prefixes
         topic_prefixes = set()
         try:
             _log.debug("Querying {} for matching topics for pattern "
@@ -582,6 +749,10 @@ class BaseTaggingService(Agent):
                 "get_topics_by_pattern",
                 topic_pattern=topic_pattern).get(timeout=5)
             point_topics = list(topic_map.keys())
+            if self.topic_index is not None:
+                # topics the historian added since the last index refresh
+                for topic in point_topics:
+                    self.topic_index.add(topic)
             if len(point_topics) == 1 and point_topics[0] == topic_pattern:
                 # fixed string topic name
                 topic_prefixes.add(topic_pattern)
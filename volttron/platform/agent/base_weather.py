@@ -28,6 +28,8 @@ import csv
 import sqlite3
 import datetime
 import os
+import threading
+from collections import OrderedDict
 from functools import wraps
 from abc import abstractmethod
 from gevent import get_hub
@@ -66,6 +68,17 @@ CREATE_STMT_FORECAST = """CREATE TABLE {table}
                          FORECAST_TIME TIMESTAMP NOT NULL,
                          POINTS TEXT NOT NULL);"""
 
+CREATE_STMT_CURRENT_INDEX = """CREATE INDEX IF NOT EXISTS {table}_LOCATION_TIME
+                               ON {table} (LOCATION, OBSERVATION_TIME);"""
+
+CREATE_STMT_FORECAST_INDEX = """CREATE INDEX IF NOT EXISTS {table}_LOCATION_TIME
+                                ON {table} (LOCATION, GENERATION_TIME,
+                                            FORECAST_TIME);"""
+
+# sqlite versions prior to 3.32 limit the number of host parameters in a
+# statement to 999
+MAX_LOCATIONS_PER_QUERY = 500
+
 AGENT_DATA_DIR = os.path.basename(os.getcwd()) + ".agent-data"
 
 CACHE_READ_ERROR = "Cache read failed"
@@ -544,14 +557,18 @@ class BaseWeatherAgent(Agent):
 
         """
         result = []
-        for location in locations:
-            record_dict = self.validate_location_dict(SERVICE_CURRENT_WEATHER,
-                                                      location)
+        invalid = [self.validate_location_dict(SERVICE_CURRENT_WEATHER,
+                                               location)
+                   for location in locations]
+        # Attempt getting from cache, all valid locations in one read
+        cached = iter(self.get_cached_current_data_bulk(
+            [location for location, error in zip(locations, invalid)
+             if not error]))
+        for location, record_dict in zip(locations, invalid):
             if record_dict:
                 result.append(record_dict)
                 continue
-            # Attempt getting from cache
-            record_dict = self.get_cached_current_data(location)
+            record_dict = next(cached)
             cache_warning = record_dict.get(WEATHER_WARN)
             # if there was no data in cache or if data is old, query api
             if not record_dict.get(WEATHER_RESULTS):
@@ -579,21 +596,37 @@ class BaseWeatherAgent(Agent):
         :param location: location to retrieve current stored data for.
         :return: current weather data dictionary
         """
-        result = location.copy()
+        return self.get_cached_current_data_bulk([location])[0]
+
+    def get_cached_current_data_bulk(self, locations):
+        """
+        Retrieves current weather data stored in cache for several locations
+        with a single cache read. Data is only included if it is current (the
+        timestamp is within the update interval).
+        :param locations: list of locations to retrieve current stored data
+        for.
+        :return: list of current weather data dictionaries in the same order
+        as locations
+        """
+        results = [location.copy() for location in locations]
+        if not locations:
+            return results
         try:
-            observation_time, data = \
-                self._cache.get_current_data(SERVICE_CURRENT_WEATHER,
-                                             jsonapi.dumps(location))
-            if observation_time and data:
-                interval = self._api_services[SERVICE_CURRENT_WEATHER][
-                    "update_interval"]
-                # ts in cache is tz aware utc
-                current_time = get_aware_utc_now()
-                next_update_at = observation_time + interval
-                if current_time < next_update_at:
-                    result["observation_time"] = \
-                        format_timestamp(observation_time)
-                    result[WEATHER_RESULTS] = jsonapi.loads(data)
+            keys = [jsonapi.dumps(location) for location in locations]
+            cached = self._cache.get_current_data_bulk(
+                SERVICE_CURRENT_WEATHER, keys)
+            interval = self._api_services[SERVICE_CURRENT_WEATHER][
+                "update_interval"]
+            # ts in cache is tz aware utc
+            current_time = get_aware_utc_now()
+            for key, result in zip(keys, results):
+                observation_time, data = cached.get(key, (None, None))
+                if observation_time and data:
+                    next_update_at = observation_time + interval
+                    if current_time < next_update_at:
+                        result["observation_time"] = \
+                            format_timestamp(observation_time)
+                        result[WEATHER_RESULTS] = jsonapi.loads(data)
         except Exception as error:
             bad_cache_message = "Weather agent failed to read from " \
                                 "cache"
@@ -604,12 +637,14 @@ class BaseWeatherAgent(Agent):
             _log.error("{}. Exception:{}".format(bad_cache_message,
                                                  error))
             self.cache_read_error = True
-            result[WEATHER_WARN] = [bad_cache_message]
+            results = [location.copy() for location in locations]
+            for result in results:
+                result[WEATHER_WARN] = [bad_cache_message]
         else:
             if self.cache_read_error:
                 self.vip.health.set_status(STATUS_GOOD)
                 self.cache_read_error = False
-        return result
+        return results
 
     def get_current_weather_remote(self, location):
         """
@@ -732,19 +767,20 @@ class BaseWeatherAgent(Agent):
         """
         request_time = get_aware_utc_now()
         result = []
-        for location in locations:
-            record_dict = self.validate_location_dict(service,
-                                                      location)
+        invalid = [self.validate_location_dict(service, location)
+                   for location in locations]
+        # check if we have enough recent data in cache, all valid locations
+        # in one read
+        cached = iter(self.get_cached_forecast_by_service_bulk(
+            [location for location, error in zip(locations, invalid)
+             if not error],
+            quantity, request_time, service, service_length))
+        for location, record_dict in zip(locations, invalid):
             if record_dict:
                 result.append(record_dict)
                 continue
 
-            # check if we have enough recent data in cache
-            record_dict = self.get_cached_forecast_by_service(location,
-                                                              quantity,
-                                                              request_time,
-                                                              service,
-                                                              service_length)
+            record_dict = next(cached)
             cache_warning = record_dict.get(WEATHER_WARN)
             # if cache didn't work out query remote api
             if not record_dict.get(WEATHER_RESULTS):
@@ -849,40 +885,41 @@ class BaseWeatherAgent(Agent):
         :param service_length:
         :return: dictionary of forecast weather data for the location
         """
-        record_dict = location.copy()
+        return self.get_cached_forecast_by_service_bulk(
+            [location], quantity, request_time, service, service_length)[0]
+
+    def get_cached_forecast_by_service_bulk(self, locations, quantity,
+                                            request_time, service,
+                                            service_length):
+        """
+        Retrieves forecast weather data stored in cache for several locations
+        with a single cache read. Data is only included if it is current (the
+        generation timestamp is within the update interval).
+        :param locations: list of locations for which to retrieve forecast
+        weather records
+        :param quantity: number of time series data points of data to include
+        with each location's records
+        :param request_time: time at which the request for data was made,
+        used for checking if the data is current.
+        :param service: service for which to retrieve cached forecast records
+        :param service_length:
+        :return: list of dictionaries of forecast weather data in the same
+        order as locations
+        """
+        record_dicts = [location.copy() for location in locations]
+        if not locations:
+            return record_dicts
         interval = \
             self._api_services[service]["update_interval"]
-        # format [(generation_time, forecast_time, points), ...]
+        # format {location: [(generation_time, forecast_time, points), ...]}
         try:
-            most_recent_for_location = \
-                self._cache.get_forecast_data(service, service_length,
-                                              jsonapi.dumps(location),
-                                              quantity, request_time)
-            location_data = []
-            if most_recent_for_location:
-                _log.debug("from cache")
-
-                generation_time = most_recent_for_location[0][0]
-                next_update_at = generation_time + interval
-                _log.debug("request_time {}".format(request_time))
-                _log.debug("next_update_at {}".format(next_update_at))
-                _log.debug("generation_time time {}".format(generation_time))
-
-                if request_time < next_update_at and \
-                        len(most_recent_for_location) >= quantity:
-                    # Enough to just check for length since cache is querying
-                    # records between expected forecast start and end time
-                    i = 0
-                    while i < quantity:
-                        record = most_recent_for_location[i]
-                        # record = (forecast time, points)
-                        entry = [format_timestamp(record[1]),
-                                 jsonapi.loads(record[2])]
-                        location_data.append(entry)
-                        i = i + 1
-                    record_dict["generation_time"] = format_timestamp(
-                        generation_time)
-                    record_dict[WEATHER_RESULTS] = location_data
+            keys = [jsonapi.dumps(location) for location in locations]
+            cached = self._cache.get_forecast_data_bulk(service,
+                                                        service_length, keys,
+                                                        quantity, request_time)
+            for key, record_dict in zip(keys, record_dicts):
+                self._apply_cached_forecast(record_dict, cached.get(key),
+                                            quantity, request_time, interval)
         except Exception as error:
             bad_read_message = "Weather agent failed to read from cache"
             self.vip.health.set_status(STATUS_BAD,
@@ -891,14 +928,47 @@ class BaseWeatherAgent(Agent):
             self.vip.health.send_alert(CACHE_READ_ERROR, status)
             _log.error("{}. Exception:{}".format(bad_read_message,
                                                  error))
-            record_dict[WEATHER_WARN] = [bad_read_message]
+            record_dicts = [location.copy() for location in locations]
+            for record_dict in record_dicts:
+                record_dict[WEATHER_WARN] = [bad_read_message]
             self.cache_read_error = True
         else:
             if self.cache_read_error:
                 self.vip.health.set_status(STATUS_GOOD)
                 self.cache_read_error = False
 
-        return record_dict
+        return record_dicts
+
+    @staticmethod
+    def _apply_cached_forecast(record_dict, most_recent_for_location,
+                               quantity, request_time, interval):
+        """
+        Adds the cached forecast records for a location to its record
+        dictionary if there are enough of them and they are current.
+        """
+        if not most_recent_for_location:
+            return
+        _log.debug("from cache")
+
+        generation_time = most_recent_for_location[0][0]
+        next_update_at = generation_time + interval
+        _log.debug("request_time {}".format(request_time))
+        _log.debug("next_update_at {}".format(next_update_at))
+        _log.debug("generation_time time {}".format(generation_time))
+
+        if request_time < next_update_at and \
+                len(most_recent_for_location) >= quantity:
+            # Enough to just check for length since cache is querying
+            # records between expected forecast start and end time
+            location_data = []
+            for record in most_recent_for_location[:quantity]:
+                # record = (generation time, forecast time, points)
+                entry = [format_timestamp(record[1]),
+                         jsonapi.loads(record[2])]
+                location_data.append(entry)
+            record_dict["generation_time"] = format_timestamp(
+                generation_time)
+            record_dict[WEATHER_RESULTS] = location_data
 
     @abstractmethod
     def query_forecast_service(self, service, location, quantity, forecast_start):
@@ -1213,7 +1283,8 @@ class WeatherCache:
                  calls_limit=None,
                  calls_period=None,
                  max_size_gb=1,
-                 check_same_thread=True):
+                 check_same_thread=True,
+                 max_recent_observations=1000):
         """
 
         :param database_file: path sqlite file to use for cache
@@ -1225,6 +1296,8 @@ class WeatherCache:
         :param check_same_thread: True to allow multiple threads to connect
         to the sqlite object, else false (see
         https://docs.python.org/3/library/sqlite3.html)
+        :param max_recent_observations: number of (service, location) entries
+        to keep in the in-memory cache of most recent current observations
         """
         self._calls_limit = calls_limit
         self._calls_period = calls_period
@@ -1233,6 +1306,18 @@ class WeatherCache:
         self._max_size_gb = max_size_gb
         self._sqlite_conn = None
         self._max_pages = None
+        self._max_recent_observations = max_recent_observations
+        # (service name, location) -> (observation time, points) of the most
+        # recent observation read from the database, in LRU order. The cache
+        # is used from AsyncWeatherCache threadpool threads, so it is guarded
+        # by _recent_observations_lock.
+        self._recent_observations = OrderedDict()
+        self._recent_observations_lock = threading.Lock()
+        # Bumped when stored records invalidate a key (or the whole cache),
+        # so a read that raced with the store does not remember the row it
+        # read before the store committed.
+        self._observation_generations = {}
+        self._observation_epoch = 0
         self._setup_cache(check_same_thread)
         self.pending_calls = []
 
@@ -1306,8 +1391,36 @@ class WeatherCache:
                 _log.error("Unable to create database table: {}".format(err))
             if table_exists:
                 self.validate_and_fix_cache_tables(service_name, table_type)
+            else:
+                self.create_indexes(service_name, table_type)
         cursor.close()
 
+    def create_indexes(self, service_name, table_type):
+        """
+        Creates the (LOCATION, time) index used by the cache lookups for a
+        service's table if it does not already exist.
+        :param service_name: api service function name used as the table name
+        :param table_type: forecast, history, or current
+        """
+        if table_type == "forecast":
+            create_index = CREATE_STMT_FORECAST_INDEX.format(
+                table=service_name)
+        elif table_type == "current" or table_type == "history":
+            create_index = CREATE_STMT_CURRENT_INDEX.format(
+                table=service_name)
+        else:
+            return
+        cursor = self._sqlite_conn.cursor()
+        try:
+            _log.debug(create_index)
+            cursor.execute(create_index)
+            self._sqlite_conn.commit()
+        except sqlite3.Error as err:
+            _log.error("Unable to create index for table {}: {}".format(
+                service_name, err))
+        finally:
+            cursor.close()
+
     def validate_and_fix_cache_tables(self, service_name, table_type):
         """
         Ensures that the proper columns are in the service's table.
@@ -1349,6 +1462,9 @@ class WeatherCache:
                     cursor.execute(create_table)
                     self._sqlite_conn.commit()
                     break
+        cursor.close()
+        if service_name != "API_CALLS":
+            self.create_indexes(service_name, table_type)
 
     def api_calls_available(self, num_calls=1):
         """
@@ -1413,20 +1529,91 @@ class WeatherCache:
         :param location: location to query by
         :return: a single current weather observation record
         """
-        query = ""
+        return self._read_current_data(service_name, [location]).get(
+            location, (None, None))
+
+    def get_current_data_bulk(self, service_name, locations):
+        """
+        Retrieves the most recent current data for several locations. Recently
+        read observations are served from memory, the remaining locations are
+        read with a single query per MAX_LOCATIONS_PER_QUERY locations.
+        :param service_name: name of the api service for table lookup
+        :param locations: list of locations to query by
+        :return: dictionary of location to (observation time, points) for
+        each location that has data in the cache
+        """
+        return self._read_current_data(service_name, locations)
+
+    def _read_current_data(self, service_name, locations):
+        results = {}
+        missing = []
+        generations = {}
+        with self._recent_observations_lock:
+            for location in locations:
+                key = (service_name, location)
+                observation = self._recent_observations.get(key)
+                if observation is None:
+                    missing.append(location)
+                    generations[location] = self._observation_generation(key)
+                else:
+                    self._recent_observations.move_to_end(key)
+                    results[location] = observation
+        if not missing:
+            return results
 
         cursor = self._sqlite_conn.cursor()
-        query = """SELECT max(OBSERVATION_TIME), POINTS
-                   FROM {table}
-                   WHERE LOCATION = ?;""".format(table=service_name)
-        _log.debug(query)
-        cursor.execute(query, (location,))
-        data = cursor.fetchone()
+        for chunk in _chunks(list(OrderedDict.fromkeys(missing)),
+                             MAX_LOCATIONS_PER_QUERY):
+            query = """SELECT LOCATION, max(OBSERVATION_TIME), POINTS
+                       FROM {table}
+                       WHERE LOCATION IN ({params})
+                       GROUP BY LOCATION;""".format(
+                table=service_name, params=", ".join("?" * len(chunk)))
+            _log.debug(query)
+            cursor.execute(query, chunk)
+            for location, observation_time, points in cursor.fetchall():
+                if observation_time:
+                    observation = (parse_timestamp_string(observation_time),
+                                   points)
+                    results[location] = observation
+                    self._remember_observation(service_name, location,
+                                               observation,
+                                               generations[location])
         cursor.close()
-        if data and data[0]:
-            return parse_timestamp_string(data[0]), data[1]
-        else:
-            return None, None
+        return results
+
+    def _observation_generation(self, key):
+        # callers hold _recent_observations_lock
+        return self._observation_epoch, self._observation_generations.get(key,
+                                                                          0)
+
+    def _remember_observation(self, service_name, location, observation,
+                              generation):
+        if not self._max_recent_observations:
+            return
+        key = (service_name, location)
+        with self._recent_observations_lock:
+            if self._observation_generation(key) != generation:
+                # records were stored since the observation was read
+                return
+            self._recent_observations[key] = observation
+            while (len(self._recent_observations) >
+                   self._max_recent_observations):
+                self._recent_observations.popitem(last=False)
+
+    def _forget_observations(self, service_name, locations):
+        with self._recent_observations_lock:
+            for location in locations:
+                key = (service_name, location)
+                self._recent_observations.pop(key, None)
+                self._observation_generations[key] = \
+                    self._observation_generations.get(key, 0) + 1
+
+    def _forget_all_observations(self):
+        with self._recent_observations_lock:
+            self._recent_observations.clear()
+            self._observation_generations.clear()
+            self._observation_epoch += 1
 
     def get_forecast_data(self, service_name, service_length, location,
                           quantity, request_time):
@@ -1441,28 +1628,59 @@ class WeatherCache:
         compare with generation time.
         :return: list of up-to-date forecast records for the location
         """
+        return self._read_forecast_data(service_name, [location], quantity,
+                                        request_time).get(location, [])
+
+    def get_forecast_data_bulk(self, service_name, service_length, locations,
+                               quantity, request_time):
+        """
+        Retrieves the most recent forecast record set for several locations
+        with a single query per MAX_LOCATIONS_PER_QUERY locations.
+        :param service_name: name of the api service for table lookup
+        :param service_length: indicates the length of time between records
+        :param locations: list of locations to query by
+        :param quantity: number of records to query for
+        :param request_time: time at which the data was requested, used to
+        compare with generation time.
+        :return: dictionary of location to list of up-to-date
+        (generation time, forecast time, points) records
+        """
+        return self._read_forecast_data(service_name, locations, quantity,
+                                        request_time)
+
+    def _read_forecast_data(self, service_name, locations, quantity,
+                            request_time):
         # get records that have forecast time between the hour immediately
         # after when user requested the data and endtime < start+hours
         # do this to avoid returning data for hours 4 to 10 instead of
         # 2-8 when the request time is hour 1.
         forecast_start, forecast_end = get_forecast_start_stop(request_time, quantity, service_name)
+        results = {}
         cursor = self._sqlite_conn.cursor()
-        query = """SELECT GENERATION_TIME, FORECAST_TIME, POINTS
-                   FROM {table}
-                   WHERE LOCATION = ?
-                   AND FORECAST_TIME >= ?
-                   AND FORECAST_TIME < ?
-                   AND GENERATION_TIME =
-                   (SELECT MAX(GENERATION_TIME)
-                    FROM {table}
-                    WHERE LOCATION = ?)
-                   ORDER BY FORECAST_TIME ASC;""".format(table=service_name)
-        _log.debug(query)
-        cursor.execute(query, (location, forecast_start, forecast_end,
-                               location))
-        data = cursor.fetchall()
+        for chunk in _chunks(list(OrderedDict.fromkeys(locations)),
+                             MAX_LOCATIONS_PER_QUERY):
+            query = """SELECT F.LOCATION, F.GENERATION_TIME, F.FORECAST_TIME,
+                              F.POINTS
+                       FROM {table} AS F
+                       JOIN (SELECT LOCATION,
+                                    MAX(GENERATION_TIME) AS GENERATION_TIME
+                             FROM {table}
+                             WHERE LOCATION IN ({params})
+                             GROUP BY LOCATION) AS LATEST
+                       ON F.LOCATION = LATEST.LOCATION
+                       AND F.GENERATION_TIME = LATEST.GENERATION_TIME
+                       WHERE F.FORECAST_TIME >= ?
+                       AND F.FORECAST_TIME < ?
+                       ORDER BY F.LOCATION, F.FORECAST_TIME ASC;""".format(
+                table=service_name, params=", ".join("?" * len(chunk)))
+            _log.debug(query)
+            cursor.execute(query, chunk + [forecast_start, forecast_end])
+            for location, generation_time, forecast_time, points in \
+                    cursor.fetchall():
+                results.setdefault(location, []).append(
+                    (generation_time, forecast_time, points))
         cursor.close()
-        return data
+        return results
 
     # def get_historical_data(self, service_name, location, date_timestamp):
     #     """
@@ -1516,9 +1734,13 @@ class WeatherCache:
 
         if request_type == "current":
             cursor.execute(query, records)
+            locations = [records[0]]
         else:
             cursor.executemany(query, records)
+            locations = {record[0] for record in records}
         self._sqlite_conn.commit()
+        # invalidate once the new rows are visible to readers
+        self._forget_observations(service_name, locations)
 
         cache_full = False
         if self._max_size_gb is not None and \
@@ -1554,6 +1776,8 @@ class WeatherCache:
             if page_count < self._max_pages:
                 return
 
+            # rows are about to be removed, drop anything read from them
+            self._forget_all_observations()
             attempt = 1
             records_deleted = 0
             now = datetime.datetime.utcnow()
@@ -1604,10 +1828,17 @@ class WeatherCache:
 
     def close(self):
         """Close the sqlite database connection when the agent stops"""
+        self._forget_all_observations()
         self._sqlite_conn.close()
         self._sqlite_conn = None
 
 
+def _chunks(items, size):
+    """Yields successive lists of at most size items."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
 # Code reimplemented from https://github.com/gilesbrown/gsqlite3
 def _using_threadpool(method):
     """Used by agents for threading."""
@@ -1629,7 +1860,9 @@ class AsyncWeatherCache(WeatherCache):
 
 # Cache methods to make available for threading.
 for method in [WeatherCache.get_current_data,
+               WeatherCache.get_current_data_bulk,
                WeatherCache.get_forecast_data,
+               WeatherCache.get_forecast_data_bulk,
                # WeatherCache.get_historical_data,
                WeatherCache._setup_cache,
                WeatherCache.store_weather_records]:
@@ -23,7 +23,7 @@
 # }}}
 
 from volttron.platform.auth.auth import AuthService
-from volttron.platform.auth.auth_entry import AuthEntry, AuthEntryInvalid
+from volttron.platform.auth.auth_entry import AuthEntry, AuthEntryIndex, AuthEntryInvalid
 from volttron.platform.auth.auth_file import (
     AuthFile, AuthFileEntryAlreadyExists,
     AuthFileUserIdAlreadyExists, AuthFileIndexError
@@ -35,6 +35,7 @@ __all__ = [ # Auth Service
             "AuthService",
             # Auth Entry
             "AuthEntry",
+            "AuthEntryIndex",
             "AuthEntryInvalid",
             # Auth File
             "AuthFile",
@@ -32,7 +32,7 @@ from gevent.fileobject import FileObject
 
 from volttron.platform.agent.known_identities import CONTROL_CONNECTION, PROCESS_IDENTITIES
 from volttron.platform.agent.utils import create_file_if_missing, get_messagebus, watch_file
-from volttron.platform.auth.auth_entry import AuthEntry
+from volttron.platform.auth.auth_entry import AuthEntry, AuthEntryIndex
 from volttron.platform.auth.auth_file import AuthFile
 from volttron.platform.auth.auth_utils import load_user
 from volttron.platform.jsonrpc import RemoteError
@@ -65,6 +65,11 @@ class AuthService(Agent):
         self.zap_socket = None
         self._zap_greenlet = None
         self.auth_entries = []
+        self.auth_entry_index = AuthEntryIndex(self.auth_entries)
+        # Version of the capabilities last sent to peers. Each auth.update
+        # carries only the users changed since the previous version.
+        self._capabilities_version = 0
+        self._sent_user_to_caps = {}
         self._is_connected = False
         self._protected_topics_file = protected_topics_file
         self._protected_topics_file_path = os.path.abspath(
@@ -451,7 +456,11 @@ class AuthService(Agent):
         # sort the entries so the regex credentials follow the concrete creds
         entries.sort()
         self.auth_entries = entries
-        if self._is_connected:
+        self.auth_entry_index = AuthEntryIndex(entries)
+        if not self._is_connected:
+            # No peer has been sent a version yet
+            self._sent_user_to_caps = self.get_user_to_capabilities()
+        else:
             try:
                 _log.debug("Sending auth updates to peers")
                 # Give it few seconds for platform to startup or for the
@@ -515,10 +524,25 @@ class AuthService(Agent):
 
         _log.debug("after getting peerlist to send auth updates")
 
-        for peer in peers:
-            if peer not in [self.core.identity, CONTROL_CONNECTION]:
-                _log.debug(f"Sending auth update to peers {peer}")
-                self.vip.rpc.call(peer, "auth.update", user_to_caps)
+        changed, removed = self._capabilities_delta(user_to_caps)
+        if changed or removed:
+            self._capabilities_version += 1
+            self._sent_user_to_caps = user_to_caps
+            results = []
+            for peer in peers:
+                if peer not in [self.core.identity, CONTROL_CONNECTION]:
+                    _log.debug(f"Sending auth update to peers {peer}")
+                    results.append((peer, self.vip.rpc.call(
+                        peer, "auth.update", changed,
+                        version=self._capabilities_version, removed=removed)))
+            # The calls are all in flight, wait for them together
+            gevent.wait([result for _, result in results], timeout=10)
+            for peer, result in results:
+                if not result.ready():
+                    _log.warning(f"Timed out sending auth update to {peer}")
+                elif not result.successful():
+                    _log.warning(f"Error sending auth update to {peer}: "
+                                 f"{result.exception}")
 
         # Update RPC method authorizations on agents
         if modified_entries:
@@ -530,6 +554,33 @@ class AuthService(Agent):
         self.authorization_server.update_user_capabilites(
             self.get_user_to_capabilities())
 
+    def _capabilities_delta(self, user_to_caps):
+        """
+        Compare user capabilities with the ones last sent to peers.
+
+        :returns: users with new or changed capabilities, removed users
+        :rtype: tuple
+        """
+        sent = self._sent_user_to_caps
+        changed = {user_id: caps for user_id, caps in user_to_caps.items()
+                   if user_id not in sent or sent[user_id] != caps}
+        removed = [user_id for user_id in sent if user_id not in user_to_caps]
+        return changed, removed
+
+    @RPC.export
+    def get_versioned_user_to_capabilities(self):
+        """RPC method
+
+        Gets a mapping of all users to their capabilities with the version of
+        the last update sent to peers. Peers use it to resync when they miss
+        an update.
+
+        :returns: dictionary with version and capabilities keys
+        :rtype: dict
+        """
+        return {"version": self._capabilities_version,
+                "capabilities": self.get_user_to_capabilities()}
+
     @RPC.export
     def get_user_to_capabilities(self):
         """RPC method
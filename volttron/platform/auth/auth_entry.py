@@ -266,3 +266,65 @@ class AuthEntry(object):
     def _check_validity(self):
         """Raises AuthEntryInvalid if entry is invalid."""
         AuthEntry.valid_credentials(self.credentials, self.mechanism)
+
+
+def _exact_values(field):
+    """Returns the values of a String or List field if none are regular
+    expressions, otherwise None."""
+    if field is None:
+        return None
+    values = [field] if isinstance(field, str) else list(field)
+    if any(hasattr(value, "regex") for value in values):
+        return None
+    return values
+
+
+class AuthEntryIndex(object):
+    """
+    Finds the first of a sorted list of auth entries that matches a
+    connection without calling match on every entry.
+
+    Entries with exact credentials are found by mechanism and credential,
+    NULL mechanism entries with exact addresses by address. Only the
+    remaining entries, with regular expressions in those fields, are
+    scanned. The index is built once from the list and must be rebuilt
+    when the list changes.
+
+    :param entries: Auth entries in the order they should be matched
+    :type entries: list
+    """
+
+    def __init__(self, entries):
+        self._by_credential = {}
+        self._by_address = {}
+        self._scanned = []
+        for position, entry in enumerate(entries):
+            credentials = _exact_values(entry.credentials)
+            addresses = _exact_values(entry.address)
+            if entry.mechanism != "NULL" and credentials:
+                for credential in credentials:
+                    self._by_credential.setdefault(
+                        (entry.mechanism, credential), []).append((position, entry))
+            elif entry.mechanism == "NULL" and addresses:
+                for address in addresses:
+                    self._by_address.setdefault(address, []).append((position, entry))
+            else:
+                self._scanned.append((position, entry))
+
+    def __len__(self):
+        return (sum(len(entries) for entries in self._by_credential.values()) +
+                sum(len(entries) for entries in self._by_address.values()) +
+                len(self._scanned))
+
+    def match(self, domain, address, mechanism, credentials):
+        """Returns the first entry that matches, or None."""
+        candidates = list(self._scanned)
+        if mechanism == "NULL":
+            candidates.extend(self._by_address.get(address, ()))
+        elif credentials:
+            candidates.extend(self._by_credential.get((mechanism, credentials[0]), ()))
+        candidates.sort(key=lambda candidate: candidate[0])
+        for _, entry in candidates:
+            if entry.match(domain, address, mechanism, credentials):
+                return entry
+        return None
@@ -112,6 +112,8 @@ class ControlService(BaseAgent):
         self.vip.rpc.export(self._tracker.enable, "stats.enable")
         self.vip.rpc.export(self._tracker.disable, "stats.disable")
         self.vip.rpc.export(lambda: self._tracker.stats, "stats.get")
+        self.vip.rpc.export(self._tracker.get_metrics, "stats.metrics")
+        self.vip.rpc.export(self._tracker.prometheus, "stats.prometheus")
 
     @Core.receiver("onstart")
     def onstart(self, sender, **kwargs):
@@ -448,6 +448,12 @@ def do_stats(opts):
             pprint.pprint(stats, _stdout)
         else:
             _stdout.writelines([str(stats), "\n"])
+    elif opts.op == "metrics":
+        import pprint
+
+        pprint.pprint(call("stats.metrics"), _stdout)
+    elif opts.op == "prometheus":
+        _stdout.write(call("stats.prometheus"))
     else:
         call("stats." + opts.op)
         _stdout.write("%sabled\n" % ("en" if call("stats.enabled") else "dis"))
@@ -790,7 +796,7 @@ def main():
                        help="manage router message statistics tracking")
     op = stats.add_argument(
         "op",
-        choices=["status", "enable", "disable", "dump", "pprint"],
+        choices=["status", "enable", "disable", "dump", "pprint", "metrics", "prometheus"],
         nargs="?")
     stats.set_defaults(func=do_stats, op="status")
 
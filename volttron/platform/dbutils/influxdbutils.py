@@ -81,9 +81,10 @@ def get_client(connection_params):
     port = connection_params['port']
     user = connection_params.get('user', None)
     passwd = connection_params.get('passwd', None)
+    gzip = bool(connection_params.get('gzip', False))
 
     try:
-        client = InfluxDBClient(host, port, user, passwd, db)
+        client = InfluxDBClient(host, port, user, passwd, db, gzip=gzip)
         dbs = client.get_list_database()
         if {"name": db} not in dbs:
             _log.error("Database {} does not exist.".format(db))
@@ -277,9 +278,9 @@ def insert_meta(client, topic_id, topic, meta, updated_time):
     client.write_points(json_body)
 
 
-def insert_data_point(client, time, topic_id, source, value, value_string):
+def build_data_point(time, topic_id, source, value, value_string):
     """
-    Insert one data point of a specific topic into the database.
+    Build the point written for one data point of a specific topic.
     Measurement name is parsed from topic_id.
 
 
@@ -295,17 +296,28 @@ def insert_data_point(client, time, topic_id, source, value, value_string):
 
     tags_dict["source"] = source
 
-    json_body = [
-        {
-            "measurement": measurement,
-            "tags": tags_dict,
-            "time": time,
-            "fields": {
-                "value": value,
-                "value_string": value_string
-            }
+    return {
+        "measurement": measurement,
+        "tags": tags_dict,
+        "time": time,
+        "fields": {
+            "value": value,
+            "value_string": value_string
         }
-    ]
+    }
+
+
+def insert_data_point(client, time, topic_id, source, value, value_string):
+    """
+    Insert one data point of a specific topic into the database.
+    If the value type conflicts with the type already stored for the
+    measurement the value is cast to the stored type.
+
+
+    See Schema description for InfluxDB Historian in README
+    """
+    json_body = [build_data_point(time, topic_id, source, value, value_string)]
+    measurement = json_body[0]["measurement"]
 
     try:
         client.write_points(json_body)
@@ -330,6 +342,47 @@ def insert_data_point(client, time, topic_id, source, value, value_string):
         client.write_points(json_body)
 
 
+def insert_data_points(client, data_points, batch_size=5000):
+    """
+    Insert data points into the database, writing at most batch_size points
+    per line protocol request.
+
+    A rejected batch is retried one point at a time with
+    :py:func:`insert_data_point` so only the points that still fail, for
+    example because of an unresolvable field type conflict, are lost from
+    the batch. Rewriting points of a partially written batch is harmless as
+    InfluxDB overwrites a point with the same series and time.
+
+    :param client: InfluxDB client connected in historian_setup method.
+    :param data_points: list of (time, topic_id, source, value, value_string)
+    :param batch_size: maximum number of points per write request
+    :return: indexes into data_points of the points that were not written
+    :raises ConnectionError: if the database cannot be reached. Nothing
+        is known to be written in that case.
+    """
+    batch_size = max(int(batch_size), 1)
+    failed = []
+
+    for start in range(0, len(data_points), batch_size):
+        batch = data_points[start:start + batch_size]
+        try:
+            client.write_points([build_data_point(*data_point) for data_point in batch])
+            continue
+        except InfluxDBClientError as e:
+            _log.warning('Write of {} points rejected, retrying points individually: {}'.format(len(batch), e))
+
+        for index, data_point in enumerate(batch, start):
+            try:
+                insert_data_point(client, *data_point)
+            except (InfluxDBClientError, ValueError, IndexError) as e:
+                _log.error('Failed to insert data point for topic {} at {}: {}'.format(data_point[1],
+                                                                                       data_point[0],
+                                                                                       e))
+                failed.append(index)
+
+    return failed
+
+
 def get_topics_by_pattern(client, pattern):
     """
 
@@ -22,6 +22,7 @@
 # ===----------------------------------------------------------------------===
 # }}}
 import ast
+import calendar
 import contextlib
 import logging
 from collections import defaultdict
@@ -29,6 +30,8 @@ from collections import defaultdict
 import pytz
 import re
 from .basedb import DbDriver
+from .partitions import (expired_partitions, next_partition_start, parse_partition_name, partition_name,
+                         partition_start, validate_partition_period)
 from mysql.connector import Error as MysqlError
 from mysql.connector import errorcode as mysql_errorcodes
 from volttron.platform.agent import utils
@@ -62,6 +65,11 @@ class MySqlFuncts(DbDriver):
             self.meta_table = table_names['meta_table']
             self.agg_topics_table = table_names.get('agg_topics_table', None)
             self.agg_meta_table = table_names.get('agg_meta_table', None)
+        # Optional native range partitioning of the data table by day, week or month. MySQL prunes the partitions
+        # outside a query's time range.
+        connect_params = dict(connect_params)
+        self.partition_period = validate_partition_period(connect_params.pop('partition_period', None))
+        self._partitions = None
         # This is needed when reusing the same connection. Else cursor returns
         # cached data even if we create a new cursor for each query and
         # close the cursor after fetching results
@@ -94,6 +102,10 @@ class MySqlFuncts(DbDriver):
         if rows:
             _log.debug("Found table {}. Historian table exists".format(
                 self.data_table))
+            if self.partition_period and not self._get_partitions(refresh=True):
+                _log.warning("Data table {} was created without partitioning, ignoring partition_period".format(
+                    self.data_table))
+                self.partition_period = None
             rows = self.select(f"""SELECT 1 FROM information_schema.COLUMNS
             WHERE TABLE_SCHEMA = '{self.db_name}' AND
             TABLE_NAME = '{self.topics_table}' AND
@@ -105,6 +117,11 @@ class MySqlFuncts(DbDriver):
                 self.meta_table = self.topics_table
             return
 
+        partitioning = ''
+        if self.partition_period:
+            # The first partition also holds all older rows, later ones are added as data for them arrives.
+            start = partition_start(utils.get_aware_utc_now(), self.partition_period)
+            partitioning = ' PARTITION BY RANGE (UNIX_TIMESTAMP(ts)) ({})'.format(self._partition_definition(start))
         try:
             if self.MICROSECOND_SUPPORT:
                 self.execute_stmt(
@@ -112,14 +129,14 @@ class MySqlFuncts(DbDriver):
                     ' (ts timestamp(6) NOT NULL,\
                      topic_id INTEGER NOT NULL, \
                      value_string TEXT NOT NULL, \
-                     UNIQUE(topic_id, ts))')
+                     UNIQUE(topic_id, ts))' + partitioning)
             else:
                 self.execute_stmt(
                     'CREATE TABLE ' + self.data_table +
                     ' (ts timestamp NOT NULL,\
                      topic_id INTEGER NOT NULL, \
                      value_string TEXT NOT NULL, \
-                     UNIQUE(topic_id, ts))')
+                     UNIQUE(topic_id, ts))' + partitioning)
 
             self.execute_stmt('''CREATE INDEX data_idx
                                     ON ''' + self.data_table + ''' (ts ASC)''')
@@ -298,6 +315,8 @@ class MySqlFuncts(DbDriver):
         yield insert_data
 
         if records:
+            if self.partition_period:
+                self._ensure_partition(max(record[0] for record in records))
             query = f"""
 INSERT INTO {self.data_table} (ts, topic_id, value_string) VALUES(%s, %s, %s)
 ON DUPLICATE KEY UPDATE value_string=VALUES(value_string);
@@ -305,6 +324,98 @@ ON DUPLICATE KEY UPDATE value_string=VALUES(value_string);
             _log.debug(f"calling execute many with records {len(records)}")
             self.execute_many(query, records)
 
+    def insert_data(self, ts, topic_id, data):
+        if self.partition_period:
+            self._ensure_partition(ts)
+        return super(MySqlFuncts, self).insert_data(ts, topic_id, data)
+
+    def _partition_definition(self, start):
+        end = next_partition_start(start, self.partition_period)
+        return 'PARTITION {} VALUES LESS THAN ({})'.format(partition_name('p', start), calendar.timegm(end.timetuple()))
+
+    def _get_partitions(self, refresh=False):
+        """Returns the set of partition start times of the data table."""
+        if self._partitions is None or refresh:
+            rows = self.select('''SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+                                  WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL''',
+                               [self.db_name, self.data_table])
+            starts = (parse_partition_name('p', row[0]) for row in rows)
+            self._partitions = {start for start in starts if start is not None}
+        return self._partitions
+
+    def _ensure_partition(self, ts):
+        """
+        Adds partitions up to the one holding ts. Range partitions can only be added after the newest one, rows older
+        than the first partition are stored in it.
+        """
+        partitions = self._get_partitions()
+        needed = partition_start(ts, self.partition_period)
+        newest = max(partitions)
+        while newest < needed:
+            newest = next_partition_start(newest, self.partition_period)
+            self.execute_stmt('ALTER TABLE ' + self.data_table +
+                              ' ADD PARTITION (' + self._partition_definition(newest) + ')')
+            partitions.add(newest)
+            _log.debug("Created data partition {}".format(partition_name('p', newest)))
+
+    def _drop_partition(self, start):
+        self.execute_stmt('ALTER TABLE ' + self.data_table + ' DROP PARTITION ' + partition_name('p', start))
+        self._get_partitions().discard(start)
+        _log.info("Dropped data partition {} of {}".format(partition_name('p', start), self.data_table))
+
+    def manage_db_size(self, history_limit_timestamp, storage_limit_gb):
+        """
+        Manage database size by dropping whole partitions of a partitioned data table. Partitions lying before
+        history_limit_timestamp are dropped and older rows in the partition it falls into are deleted. While the
+        database is larger than storage_limit_gb the oldest partition is dropped, the newest partition is always kept.
+        An unpartitioned data table is left as is.
+        """
+        if not self.partition_period:
+            return
+        _log.debug("Managing store - timestamp limit: {}  GB size limit: {}".format(
+            history_limit_timestamp, storage_limit_gb))
+        partitions = self._get_partitions(refresh=True)
+        if history_limit_timestamp is not None:
+            expired, straddling = expired_partitions(partitions, self.partition_period, history_limit_timestamp)
+            for start in expired:
+                if len(partitions) > 1:
+                    self._drop_partition(start)
+                else:
+                    straddling = start
+            if straddling is not None:
+                count = self.execute_stmt('DELETE FROM ' + self.data_table + ' PARTITION (' +
+                                          partition_name('p', straddling) + ') WHERE ts < %s',
+                                          [history_limit_timestamp])
+                _log.debug("Deleted {} old items from historian. (TTL exceeded)".format(count))
+
+        if storage_limit_gb is not None:
+            max_storage_bytes = storage_limit_gb * 1024 ** 3
+            # Table statistics are cached (information_schema_stats_expiry defaults to a day in MySQL 8) and do not
+            # shrink right after a partition is dropped, so the database size is read once and the size of each
+            # dropped partition is subtracted from it.
+            rows = self.select('''SELECT SUM(DATA_LENGTH + INDEX_LENGTH) FROM information_schema.TABLES
+                                  WHERE TABLE_SCHEMA = %s''', [self.db_name])
+            if not rows or rows[0][0] is None:
+                return
+            size = rows[0][0]
+            partition_sizes = self._get_partition_sizes()
+            while len(partitions) > 1 and size >= max_storage_bytes:
+                oldest = min(partitions)
+                self._drop_partition(oldest)
+                size -= partition_sizes.get(oldest, 0)
+
+    def _get_partition_sizes(self):
+        """Returns the data and index size in bytes of each partition of the data table by partition start."""
+        rows = self.select('''SELECT PARTITION_NAME, DATA_LENGTH + INDEX_LENGTH FROM information_schema.PARTITIONS
+                              WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL''',
+                           [self.db_name, self.data_table])
+        sizes = {}
+        for name, size in rows:
+            start = parse_partition_name('p', name)
+            if start is not None:
+                sizes[start] = size or 0
+        return sizes
+
     @contextlib.contextmanager
     def bulk_insert_meta(self):
         """
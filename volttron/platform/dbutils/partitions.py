@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*- {{{
+# ===----------------------------------------------------------------------===
+#
+#                 Component of Eclipse VOLTTRON
+#
+# ===----------------------------------------------------------------------===
+#
+# Copyright 2023 Battelle Memorial Institute
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy
+# of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# ===----------------------------------------------------------------------===
+# }}}
+
+"""
+Time partition arithmetic shared by the SQL historian drivers.
+
+A partitioned data table is split into one partition per day, week (starting on Monday) or month. Partitions are
+named after the data table and the UTC start of their period, for example ``data_20230102``, so the covered time range
+of a partition can always be recovered from its name.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+import pytz
+
+from volttron.platform.agent.utils import parse_timestamp_string
+
+PARTITION_PERIODS = ("day", "week", "month")
+
+_SUFFIX_FORMAT = "%Y%m%d"
+
+
+def validate_partition_period(period):
+    """Returns the normalized partition period, or None if partitioning is not enabled."""
+    if not period:
+        return None
+    period = str(period).lower()
+    if period not in PARTITION_PERIODS:
+        raise ValueError("Invalid partition_period {}, must be one of {}".format(period, PARTITION_PERIODS))
+    return period
+
+
+def _as_naive_utc(ts):
+    if isinstance(ts, str):
+        ts = parse_timestamp_string(ts)
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(pytz.UTC).replace(tzinfo=None)
+    return ts
+
+
+def partition_start(ts, period):
+    """Returns the naive UTC start of the partition containing ts."""
+    ts = _as_naive_utc(ts)
+    start = datetime(ts.year, ts.month, ts.day)
+    if period == "week":
+        start -= timedelta(days=start.weekday())
+    elif period == "month":
+        start = start.replace(day=1)
+    return start
+
+
+def next_partition_start(start, period):
+    """Returns the start of the partition following the one starting at start."""
+    if period == "day":
+        return start + timedelta(days=1)
+    if period == "week":
+        return start + timedelta(days=7)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(table_name, start):
+    return "{}_{}".format(table_name, start.strftime(_SUFFIX_FORMAT))
+
+
+def parse_partition_name(table_name, name):
+    """Returns the start of the partition named name, or None if name is not a partition of table_name."""
+    match = re.fullmatch(re.escape(table_name) + r"_(\d{8})", name)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(1), _SUFFIX_FORMAT)
+
+
+def overlapping_partitions(starts, period, start=None, end=None):
+    """
+    Returns the partition starts, in ascending order, whose period overlaps the half open range [start, end).
+    A start equal to end selects the single partition containing that instant.
+    """
+    start = _as_naive_utc(start) if start is not None else None
+    end = _as_naive_utc(end) if end is not None else None
+    selected = []
+    for partition in sorted(starts):
+        partition_end = next_partition_start(partition, period)
+        if start is not None and partition_end <= start:
+            continue
+        if end is not None and (partition > end or (partition == end and end != start)):
+            continue
+        selected.append(partition)
+    return selected
+
+
+def expired_partitions(starts, period, history_limit_timestamp):
+    """
+    Splits partition starts by a retention limit into the partitions lying entirely before it, which can be dropped,
+    and the partition the limit falls into, which needs a row level delete. The latter is None if the limit falls on
+    a partition boundary or outside all partitions.
+    """
+    limit = _as_naive_utc(history_limit_timestamp)
+    expired = []
+    straddling = None
+    for partition in sorted(starts):
+        if next_partition_start(partition, period) <= limit:
+            expired.append(partition)
+        elif partition < limit:
+            straddling = partition
+    return expired, straddling
@@ -18,8 +18,12 @@
 
 import ast
 import contextlib
+import csv
+import io
 import logging
 import copy
+import time
+from datetime import datetime
 
 import pytz
 import psycopg2
@@ -31,10 +35,15 @@ from volttron.platform.agent import utils
 from volttron.platform import jsonapi
 
 from .basedb import DbDriver
+from .partitions import (expired_partitions, next_partition_start, parse_partition_name, partition_name,
+                         partition_start, validate_partition_period)
 
 utils.setup_logging()
 _log = logging.getLogger(__name__)
 
+INSERT_BULK_INSERT = "insert"
+COPY_BULK_INSERT = "copy"
+
 
 """
 Implementation of PostgreSQL database operation for
@@ -58,6 +67,17 @@ class PostgreSqlFuncts(DbDriver):
             del connect_params["timescale_dialect"]
         else:
             self.timescale_dialect = False
+        self.bulk_insert_mode = connect_params.pop("bulk_insert_mode", INSERT_BULK_INSERT)
+        if self.bulk_insert_mode not in (INSERT_BULK_INSERT, COPY_BULK_INSERT):
+            raise ValueError("Invalid bulk_insert_mode {}, must be {} or {}".format(
+                self.bulk_insert_mode, INSERT_BULK_INSERT, COPY_BULK_INSERT))
+        # Optional native range partitioning of the data table by day, week or month. The query planner prunes the
+        # partitions outside a query's time range.
+        self.partition_period = validate_partition_period(connect_params.pop("partition_period", None))
+        if self.partition_period and self.timescale_dialect:
+            raise ValueError("partition_period cannot be used with timescale_dialect, hypertables are already "
+                             "partitioned by time")
+        self._partitions = None
         def connect():
             connection = psycopg2.connect(**connect_params)
             connection.autocommit = True
@@ -97,11 +117,67 @@ class PostgreSqlFuncts(DbDriver):
         yield insert_data
 
         if records:
-            query = SQL('INSERT INTO {} VALUES %s '
-                        'ON CONFLICT (ts, topic_id) DO UPDATE '
-                        'SET value_string = EXCLUDED.value_string').format(
-                            Identifier(self.data_table))
-            execute_values(self.cursor(), query, records)
+            start = time.perf_counter()
+            if self.partition_period:
+                for ts in {partition_start(record[0], self.partition_period) for record in records}:
+                    self._ensure_partition(ts)
+            if self.bulk_insert_mode == COPY_BULK_INSERT:
+                self._copy_insert(records)
+            else:
+                query = SQL('INSERT INTO {} VALUES %s '
+                            'ON CONFLICT (ts, topic_id) DO UPDATE '
+                            'SET value_string = EXCLUDED.value_string').format(
+                                Identifier(self.data_table))
+                execute_values(self.cursor(), query, records)
+            elapsed = time.perf_counter() - start
+            _log.debug("Bulk inserted {} rows in {:.3f}s ({:.0f} rows/s, {} mode)".format(
+                len(records), elapsed, len(records) / elapsed if elapsed else 0, self.bulk_insert_mode))
+
+    def _copy_insert(self, records):
+        """
+        Streams records into a temporary staging table with COPY and merges them into the data table in one statement.
+        Existing rows for the same topic and time are overwritten as with the INSERT mode, and of several rows for the
+        same topic and time within one batch the last one wins.
+
+        The staging table is private to the connection and dropped when the transaction holding the COPY and the merge
+        commits, so several writers to the same data table do not see each other's staged rows.
+        """
+        staging_table = self.data_table + '_staging'
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for ts, topic_id, value in records:
+            if isinstance(ts, datetime) and ts.tzinfo is not None:
+                ts = ts.astimezone(pytz.UTC).replace(tzinfo=None)
+            writer.writerow((ts, topic_id, value))
+        buffer.seek(0)
+
+        cursor = self.cursor()
+        # The connection is in autocommit mode, the transaction is opened explicitly.
+        cursor.execute('BEGIN')
+        try:
+            cursor.execute(SQL(
+                'CREATE TEMP TABLE {} ('
+                    'seq BIGSERIAL, '
+                    'ts TIMESTAMP NOT NULL, '
+                    'topic_id INTEGER NOT NULL, '
+                    'value_string TEXT NOT NULL'
+                ') ON COMMIT DROP').format(Identifier(staging_table)))
+            cursor.copy_expert(SQL('COPY {} (ts, topic_id, value_string) FROM STDIN WITH (FORMAT csv)').format(
+                Identifier(staging_table)).as_string(cursor), buffer)
+            cursor.execute(SQL(
+                'INSERT INTO {} (ts, topic_id, value_string) '
+                'SELECT DISTINCT ON (ts, topic_id) ts, topic_id, value_string FROM {} '
+                'ORDER BY ts, topic_id, seq DESC '
+                'ON CONFLICT (ts, topic_id) DO UPDATE '
+                'SET value_string = EXCLUDED.value_string').format(
+                    Identifier(self.data_table), Identifier(staging_table)))
+        except Exception:
+            try:
+                cursor.execute('ROLLBACK')
+            except psycopg2.Error as e:
+                _log.warning("Unable to roll back failed COPY bulk insert: {}".format(e))
+            raise
+        cursor.execute('COMMIT')
 
     @contextlib.contextmanager
     def bulk_insert_meta(self):
@@ -140,6 +216,68 @@ class PostgreSqlFuncts(DbDriver):
                             Identifier(self.meta_table))
             execute_values(self.cursor(), query, records)
 
+    def insert_data(self, ts, topic_id, data):
+        if self.partition_period:
+            self._ensure_partition(partition_start(ts, self.partition_period))
+        return super(PostgreSqlFuncts, self).insert_data(ts, topic_id, data)
+
+    def _get_partitions(self, refresh=False):
+        """Returns the set of partition start times of the data table."""
+        if self._partitions is None or refresh:
+            rows = self.select('SELECT child.relname FROM pg_inherits '
+                               'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+                               'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+                               'WHERE parent.relname = %s', (self.data_table,))
+            starts = (parse_partition_name(self.data_table, row[0]) for row in rows)
+            self._partitions = {start for start in starts if start is not None}
+        return self._partitions
+
+    def _ensure_partition(self, start):
+        partitions = self._get_partitions()
+        if start in partitions:
+            return
+        self.execute_stmt(SQL(
+            'CREATE TABLE IF NOT EXISTS {} PARTITION OF {} FOR VALUES FROM ({}) TO ({})').format(
+                Identifier(partition_name(self.data_table, start)), Identifier(self.data_table),
+                Literal(start), Literal(next_partition_start(start, self.partition_period))))
+        partitions.add(start)
+        _log.debug("Created data partition {}".format(partition_name(self.data_table, start)))
+
+    def _drop_partition(self, start):
+        table_name = partition_name(self.data_table, start)
+        self.execute_stmt(SQL('DROP TABLE IF EXISTS {}').format(Identifier(table_name)))
+        self._get_partitions().discard(start)
+        _log.info("Dropped data partition {}".format(table_name))
+
+    def manage_db_size(self, history_limit_timestamp, storage_limit_gb):
+        """
+        Manage database size by dropping whole partitions of a partitioned data table. Partitions lying before
+        history_limit_timestamp are dropped and older rows in the partition it falls into are deleted. While the
+        database is larger than storage_limit_gb the oldest partition is dropped, the newest partition is always kept.
+        An unpartitioned data table is left as is.
+        """
+        if not self.partition_period:
+            return
+        _log.debug("Managing store - timestamp limit: {}  GB size limit: {}".format(
+            history_limit_timestamp, storage_limit_gb))
+        partitions = self._get_partitions(refresh=True)
+        if history_limit_timestamp is not None:
+            expired, straddling = expired_partitions(partitions, self.partition_period, history_limit_timestamp)
+            for start in expired:
+                self._drop_partition(start)
+            if straddling is not None:
+                if history_limit_timestamp.tzinfo is not None:
+                    history_limit_timestamp = history_limit_timestamp.astimezone(pytz.UTC).replace(tzinfo=None)
+                count = self.execute_stmt(SQL('DELETE FROM {} WHERE ts < {}').format(
+                    Identifier(partition_name(self.data_table, straddling)), Literal(history_limit_timestamp)))
+                _log.debug("Deleted {} old items from historian. (TTL exceeded)".format(count))
+
+        if storage_limit_gb is not None:
+            max_storage_bytes = storage_limit_gb * 1024 ** 3
+            while len(partitions) > 1 and \
+                    self.select('SELECT pg_database_size(current_database())')[0][0] >= max_storage_bytes:
+                self._drop_partition(min(partitions))
+
     def rollback(self):
         try:
             return super(PostgreSqlFuncts, self).rollback()
@@ -153,6 +291,13 @@ class PostgreSqlFuncts(DbDriver):
         if rows:
             _log.debug("Found table {}. Historian table exists".format(
                 self.data_table))
+            if self.partition_period and not self.select(
+                    'SELECT 1 FROM pg_partitioned_table '
+                    'JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid '
+                    'WHERE pg_class.relname = %s', (self.data_table,)):
+                _log.warning("Data table {} was created without partitioning, ignoring partition_period".format(
+                    self.data_table))
+                self.partition_period = None
             rows = self.select(f"""SELECT column_name FROM information_schema.columns
                                 WHERE table_name = '{self.topics_table}' and column_name = 'metadata'""")
             if rows:
@@ -165,7 +310,8 @@ class PostgreSqlFuncts(DbDriver):
                     'topic_id INTEGER NOT NULL, '
                     'value_string TEXT NOT NULL, '
                     'UNIQUE (topic_id, ts)'
-                ')').format(Identifier(self.data_table)))
+                '){}').format(Identifier(self.data_table),
+                              SQL(' PARTITION BY RANGE (ts)' if self.partition_period else '')))
             if self.timescale_dialect:
                 _log.debug("trying to create hypertable")
                 self.execute_stmt(SQL(
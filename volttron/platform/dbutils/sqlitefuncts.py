@@ -23,6 +23,7 @@
 # }}}
 
 import ast
+import contextlib
 import errno
 import logging
 import sqlite3
@@ -31,6 +32,8 @@ import threading
 import os
 import re
 from .basedb import DbDriver
+from .partitions import (expired_partitions, overlapping_partitions, parse_partition_name, partition_name,
+                         partition_start, validate_partition_period)
 from collections import defaultdict
 from datetime import datetime
 from math import ceil
@@ -45,6 +48,9 @@ _log = logging.getLogger(__name__)
 # Make sure sqlite3 datetime adapters are updated.
 fix_sqlite3_datetime()
 
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
 
 class SqlLiteFuncts(DbDriver):
     """
@@ -88,6 +94,22 @@ class SqlLiteFuncts(DbDriver):
         if 'timeout' not in connect_params.keys():
             connect_params['timeout'] = 10
 
+        # Connection pragmas. In WAL mode a query in progress does not block inserts, and synchronous NORMAL is safe
+        # against corruption while only syncing at checkpoints.
+        connect_params = dict(connect_params)
+        journal_mode = str(connect_params.pop('journal_mode', 'WAL')).upper()
+        synchronous = str(connect_params.pop('synchronous', 'NORMAL')).upper()
+        cache_size = connect_params.pop('cache_size', None)
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError("Invalid journal_mode {}, must be one of {}".format(journal_mode, JOURNAL_MODES))
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError("Invalid synchronous {}, must be one of {}".format(synchronous, SYNCHRONOUS_MODES))
+        if cache_size is not None:
+            cache_size = int(cache_size)
+        # Optional time partitioned layout, one data table per day, week or month.
+        self.partition_period = validate_partition_period(connect_params.pop('partition_period', None))
+        self._partitions = None
+
         self.data_table = None
         self.topics_table = None
         self.meta_table = None
@@ -101,7 +123,115 @@ class SqlLiteFuncts(DbDriver):
             self.agg_topics_table = table_names['agg_topics_table']
             self.agg_meta_table = table_names['agg_meta_table']
         _log.debug("In sqlitefuncts connect params {}".format(connect_params))
-        super(SqlLiteFuncts, self).__init__('sqlite3', **connect_params)
+
+        def connect():
+            connection = sqlite3.connect(**connect_params)
+            connection.execute("PRAGMA journal_mode={}".format(journal_mode))
+            connection.execute("PRAGMA synchronous={}".format(synchronous))
+            if cache_size is not None:
+                connection.execute("PRAGMA cache_size={}".format(cache_size))
+            return connection
+        connect.__name__ = 'sqlite3'
+        super(SqlLiteFuncts, self).__init__(connect)
+
+    @contextlib.contextmanager
+    def bulk_insert(self):
+        """
+        This function implements the bulk insert requirements for sqlite historian by overriding the
+        DbDriver::bulk_insert() in basedb.py and yields necessary data insertion method needed for bulk inserts
+
+        :yields: insert method
+        """
+        records = []
+
+        def insert_data(ts, topic_id, data):
+            """
+            Inserts data records to the list
+
+            :param ts: time stamp
+            :type string
+            :param topic_id: topic ID
+            :type string
+            :param data: data value
+            :type any valid JSON serializable value
+            :return: Returns True after insert
+            :rtype: bool
+            """
+            records.append((ts, topic_id, jsonapi.dumps(data)))
+            return True
+
+        yield insert_data
+
+        if records:
+            if not self.partition_period:
+                self.execute_many(self.insert_data_query(), records)
+                return
+            partitioned = defaultdict(list)
+            for record in records:
+                partitioned[self._ensure_partition(record[0])].append(record)
+            for table_name, table_records in partitioned.items():
+                self.execute_many(self.insert_data_query(table_name), table_records)
+
+    def insert_data(self, ts, topic_id, data):
+        if not self.partition_period:
+            return super(SqlLiteFuncts, self).insert_data(ts, topic_id, data)
+        self.execute_stmt(self.insert_data_query(self._ensure_partition(ts)), (ts, topic_id, jsonapi.dumps(data)),
+                          commit=False)
+        return True
+
+    def _get_partitions(self, refresh=False):
+        """
+        Returns the set of partition start times of the data table. Partitions are created by the historian's
+        background thread, so readers on other connections pass refresh=True to pick up new ones.
+        """
+        if self._partitions is None or refresh:
+            rows = self.select("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ?",
+                               (self.data_table + '_%',))
+            starts = (parse_partition_name(self.data_table, row[0]) for row in rows)
+            self._partitions = {start for start in starts if start is not None}
+        return self._partitions
+
+    def _ensure_partition(self, ts):
+        """Creates the partition for ts if it does not exist yet and returns its table name."""
+        start = partition_start(ts, self.partition_period)
+        table_name = partition_name(self.data_table, start)
+        partitions = self._get_partitions()
+        if start not in partitions:
+            self.execute_stmt(
+                '''CREATE TABLE IF NOT EXISTS ''' + table_name +
+                ''' (ts timestamp NOT NULL,
+                     topic_id INTEGER NOT NULL,
+                     value_string TEXT NOT NULL,
+                     UNIQUE(topic_id, ts))''', commit=False)
+            self.execute_stmt(
+                '''CREATE INDEX IF NOT EXISTS idx_''' + table_name +
+                ''' ON ''' + table_name + ''' (ts ASC)''', commit=False)
+            partitions.add(start)
+            _log.debug("Created data partition {}".format(table_name))
+        return table_name
+
+    def _drop_partition(self, start):
+        table_name = partition_name(self.data_table, start)
+        self.execute_stmt('''DROP TABLE IF EXISTS ''' + table_name)
+        self.commit()
+        self._get_partitions().discard(start)
+        _log.info("Dropped data partition {}".format(table_name))
+
+    def _data_source(self, start=None, end=None):
+        """
+        Returns the table expression raw data is read from. In the partitioned layout this is the union of the data
+        table, which keeps any rows written before partitioning was enabled, and the partitions overlapping the query's
+        time range. SQLite pushes the query's WHERE clause down into each branch so every partition is read by index.
+        """
+        if not self.partition_period:
+            return self.data_table
+        tables = [self.data_table] + [partition_name(self.data_table, partition) for partition in
+                                      overlapping_partitions(self._get_partitions(refresh=True),
+                                                             self.partition_period, start, end)]
+        if len(tables) == 1:
+            return self.data_table
+        return '(' + ' UNION ALL '.join('SELECT ts, topic_id, value_string FROM ' + table
+                                        for table in tables) + ')'
 
     def setup_historian_tables(self):
 
@@ -182,7 +312,7 @@ class SqlLiteFuncts(DbDriver):
         @param count:
         @param order:
         """
-        table_name = self.data_table
+        table_name = self._data_source(start, end)
         value_col = 'value_string'
         if agg_type and agg_period:
             table_name = agg_type + "_" + agg_period
@@ -273,6 +403,9 @@ class SqlLiteFuncts(DbDriver):
 
         commit = False
 
+        if self.partition_period:
+            self._drop_expired_partitions(history_limit_timestamp, storage_limit_gb)
+
         if history_limit_timestamp is not None:
             count = self.execute_stmt(
                 '''DELETE FROM ''' + self.data_table +
@@ -292,14 +425,17 @@ class SqlLiteFuncts(DbDriver):
                 result = self.select("PRAGMA page_count")
                 return result[0][0]
 
+            table_name = self._storage_table()
             while page_count() >= max_pages:
                 count = self.execute_stmt(
-                    '''DELETE FROM ''' + self.data_table +
+                    '''DELETE FROM ''' + table_name +
                     '''
                     WHERE ts IN
-                    (SELECT ts FROM ''' + self.data_table +
+                    (SELECT ts FROM ''' + table_name +
                     '''
                     ORDER BY ts ASC LIMIT 100)''')
+                if not count:
+                    break
 
                 _log.debug("Deleted 100 old items from historian. (Managing store size)".format(count))
                 commit = True
@@ -308,6 +444,39 @@ class SqlLiteFuncts(DbDriver):
             _log.debug("Committing changes for manage_db_size.")
             self.commit()
 
+    def _drop_expired_partitions(self, history_limit_timestamp, storage_limit_gb):
+        """
+        Drops whole partitions that lie before the retention limit and, oldest first, while the database exceeds its
+        storage limit. The newest partition is never dropped. Rows in the partition the retention limit falls into,
+        rows in the unpartitioned data table, and any storage excess left with a single partition are removed row by
+        row by manage_db_size.
+        """
+        partitions = self._get_partitions(refresh=True)
+        if history_limit_timestamp is not None:
+            expired, straddling = expired_partitions(partitions, self.partition_period, history_limit_timestamp)
+            for start in expired:
+                self._drop_partition(start)
+            if straddling is not None:
+                count = self.execute_stmt(
+                    '''DELETE FROM ''' + partition_name(self.data_table, straddling) +
+                    ''' WHERE ts < ?''', (history_limit_timestamp,), commit=True)
+                _log.debug("Deleted {} old items from partition {}. (TTL exceeded)".format(
+                    count, partition_name(self.data_table, straddling)))
+
+        if storage_limit_gb is not None:
+            page_size = self.select('''PRAGMA page_size''')[0][0]
+            max_pages = int(ceil(storage_limit_gb * 1024 ** 3 / page_size))
+            while len(partitions) > 1 and self.select("PRAGMA page_count")[0][0] >= max_pages:
+                self._drop_partition(min(partitions))
+
+    def _storage_table(self):
+        """Returns the table the row by row storage limit enforcement deletes the oldest rows from."""
+        if self.partition_period and not self.select('''SELECT 1 FROM ''' + self.data_table + ''' LIMIT 1'''):
+            partitions = self._get_partitions()
+            if partitions:
+                return partition_name(self.data_table, min(partitions))
+        return self.data_table
+
     def insert_meta_query(self):
         return '''INSERT OR REPLACE INTO ''' + self.meta_table + \
                ''' values(?, ?)'''
@@ -316,8 +485,8 @@ class SqlLiteFuncts(DbDriver):
         return '''UPDATE ''' + self.meta_table + ''' SET metadata = ?
             WHERE topic_id = ?'''
 
-    def insert_data_query(self):
-        return '''INSERT OR REPLACE INTO ''' + self.data_table + \
+    def insert_data_query(self, table_name=None):
+        return '''INSERT OR REPLACE INTO ''' + (table_name or self.data_table) + \
                ''' values(?, ?, ?)'''
 
     def insert_topic_query(self):
@@ -497,7 +666,7 @@ class SqlLiteFuncts(DbDriver):
             if agg_type.upper() not in ['AVG', 'MIN', 'MAX', 'COUNT', 'SUM']:
                 raise ValueError("Invalid aggregation type {}".format(agg_type))
         query = '''SELECT ''' + agg_type + '''(value_string), count(value_string) FROM ''' + \
-                self.data_table + ''' {where}'''
+                self._data_source(start, end) + ''' {where}'''
 
         where_clauses = ["WHERE topic_id = ?"]
         args = [topic_ids[0]]
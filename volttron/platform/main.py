@@ -48,6 +48,7 @@ import struct
 import subprocess
 import sys
 import threading
+from time import perf_counter
 import uuid
 from logging import handlers
 from typing import Optional
@@ -386,7 +387,7 @@ class Router(BaseRouter):
                                            self._addr, self._instance_name)
 
         self.pubsub = PubSubService(self.socket, self._protected_topics,
-                                    self._ext_routing)
+                                    self._ext_routing, tracker=self._tracker)
         self.ext_rpc = ExternalRPCService(self.socket, self._ext_routing)
         self._poller.register(sock, zmq.POLLIN)
         _log.debug("ZMQ version: {}".format(zmq.zmq_version()))
@@ -531,7 +532,12 @@ class Router(BaseRouter):
             if sock == self.socket:
                 if sockets[sock] == zmq.POLLIN:
                     frames = sock.recv_multipart(copy=False)
-                    self.route(deserialize_frames(frames))
+                    if self._tracker and self._tracker.enabled:
+                        started = perf_counter()
+                        self.route(deserialize_frames(frames))
+                        self._tracker.routed(started, sock)
+                    else:
+                        self.route(deserialize_frames(frames))
             elif sock in self._ext_routing._vip_sockets:
                 if sockets[sock] == zmq.POLLIN:
                     # _log.debug("From Ext Socket: ")
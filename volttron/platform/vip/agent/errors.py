@@ -27,7 +27,8 @@
 import errno
 
 
-__all__ = ['VIPError', 'Unreachable', 'Again', 'UnknownSubsystem']
+__all__ = ['VIPError', 'Unreachable', 'Again', 'UnknownSubsystem',
+           'DeadlineExceeded']
 
 
 class VIPError(Exception):
@@ -67,3 +68,7 @@ class UnknownSubsystem(VIPError):
     def __str__(self):
         return '%s: %s' % (
             super(UnknownSubsystem, self).__str__(), self.subsystem)
+
+
+class DeadlineExceeded(Exception):
+    """Raised in an exported method when the caller's deadline has passed."""
@@ -58,6 +58,8 @@ class Auth(SubsystemBase):
         self._core = weakref.ref(core)
         self._rpc = weakref.ref(rpc)
         self._user_to_capabilities = {}
+        # Version of the capabilities held, None until fetched from auth
+        self._capabilities_version = None
         self._dirty = True
         self._csr_certs = dict()
         self.remote_certs_dir = None
@@ -107,11 +109,14 @@ class Auth(SubsystemBase):
         while self._dirty:
             self._dirty = False
             try:
-                self._user_to_capabilities = (
+                versioned = (
                     self._rpc()
-                    .call(AUTH, "get_user_to_capabilities")
+                    .call(AUTH, "get_versioned_user_to_capabilities")
                     .get(timeout=10)
                 )
+                self._user_to_capabilities = versioned["capabilities"]
+                self._capabilities_version = versioned["version"]
+                self._rpc().clear_auth_cache()
                 _log.debug("self. user to cap %s", self._user_to_capabilities)
             except RemoteError:
                 self._dirty = True
@@ -128,11 +133,37 @@ class Auth(SubsystemBase):
         self._fetch_capabilities()
         return self._user_to_capabilities.get(user_id, [])
 
-    def _update_capabilities(self, user_to_capabilities):
+    def _update_capabilities(self, user_to_capabilities, version=None,
+                             removed=None):
+        """
+        Apply an update from the auth service.
+
+        Versioned updates only hold the users whose capabilities changed since
+        the previous version. When an update is missed the full mapping is
+        fetched again on the next lookup.
+        """
         identity = self._rpc().context.vip_message.peer
-        if identity == AUTH:
+        if identity != AUTH:
+            return
+        if version is None:
             self._user_to_capabilities = user_to_capabilities
             self._dirty = True
+        elif self._capabilities_version is not None and \
+                version <= self._capabilities_version:
+            # Already included in what was fetched
+            return
+        elif self._capabilities_version is not None and \
+                version == self._capabilities_version + 1:
+            self._user_to_capabilities.update(user_to_capabilities)
+            for user_id in removed or ():
+                self._user_to_capabilities.pop(user_id, None)
+            self._capabilities_version = version
+        else:
+            _log.debug("Missed auth update before version %s, resyncing",
+                       version)
+            self._capabilities_version = None
+            self._dirty = True
+        self._rpc().clear_auth_cache()
 
     def get_rpc_exports(self):
         """
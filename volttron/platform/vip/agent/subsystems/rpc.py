@@ -27,10 +27,12 @@ import inspect
 import logging
 import os
 import sys
+import time
 import traceback
 import weakref
 import re
 
+import gevent
 import gevent.local
 from gevent.event import AsyncResult
 from volttron.platform import jsonapi
@@ -38,6 +40,7 @@ from volttron.platform import jsonapi
 from .base import SubsystemBase
 from ..results import counter, ResultsDictionary
 from ..decorators import annotate, annotations, dualmethod, spawn
+from ..errors import DeadlineExceeded
 from .... import jsonrpc
 
 from zmq import ZMQError
@@ -92,13 +95,20 @@ class Dispatcher(jsonrpc.Dispatcher):
             methods.append((ident, method, args, kwargs))
         return super(Dispatcher, self).batch_call(methods), results
 
-    def call(self, method, args=None, kwargs=None):
+    def call(self, method, args=None, kwargs=None, deadline=None):
         # pylint: disable=arguments-differ
         result = next(self._results)
-        return (
-            super(Dispatcher, self).call(result.ident, method, args, kwargs),
-            result,
-        )
+        if deadline is None:
+            return (
+                super(Dispatcher, self).call(result.ident, method, args, kwargs),
+                result,
+            )
+        request = jsonrpc.json_method(
+            result.ident, method, args or (), kwargs or {})
+        # Absolute wall clock time, so it survives forwarding through the
+        # router and remains meaningful to the callee.
+        request["deadline"] = deadline
+        return self.serialize(request), result
 
     def result(self, response, ident, value, context=None):
         try:
@@ -160,8 +170,20 @@ class Dispatcher(jsonrpc.Dispatcher):
         local.vip_message = context
         local.request = request
         local.batch = batch
+        local.deadline = deadline = request.get("deadline")
         try:
+            if deadline is None:
+                return method(*args, **kwargs)
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise DeadlineExceeded(name)
+            if getattr(method, "interruptible", False):
+                with gevent.Timeout(remaining, DeadlineExceeded(name)):
+                    return method(*args, **kwargs)
             return method(*args, **kwargs)
+        except DeadlineExceeded:
+            _log.debug("deadline passed for JSON-RPC method %r", name)
+            raise
         except Exception as exc:  # pylint: disable=broad-except
             exc_tb = traceback.format_exc()
             _log.error(
@@ -174,6 +196,19 @@ class Dispatcher(jsonrpc.Dispatcher):
             del local.vip_message
             del local.request
             del local.batch
+            del local.deadline
+
+    def _dispatch_one(self, msg, batch, context):
+        response = super(Dispatcher, self)._dispatch_one(msg, batch, context)
+        if response is not None and isinstance(msg, dict) and "method" in msg:
+            deadline = msg.get("deadline")
+            if deadline is not None and time.time() >= deadline:
+                # Nobody is waiting for it any more; don't serialize or send.
+                _log.debug(
+                    "dropping late reply to JSON-RPC method %r", msg["method"]
+                )
+                return None
+        return response
 
     @staticmethod
     def _inspect(method):
@@ -218,6 +253,7 @@ class RPC(SubsystemBase):
         self._dispatcher = None
         self._counter = counter()
         self._outstanding = weakref.WeakValueDictionary()
+        self._auth_cache = {}
         core.register("RPC", self._handle_subsystem, self._handle_error)
         core.register(
             "external_rpc",
@@ -285,6 +321,12 @@ class RPC(SubsystemBase):
         """
         Adds an authorization check to verify the calling agent has the
         required capabilities.
+
+        The decision for each (user, method) pair is computed once and kept
+        in the authorization cache until the agent's capabilities are
+        updated (see :py:meth:`clear_auth_cache`). Argument restrictions are
+        precompiled with the decision so only the parameter comparison is
+        done per call.
         """
 
         def checked_method(*args, **kwargs):
@@ -293,92 +335,117 @@ class RPC(SubsystemBase):
                 # remove platform instance name. rmq user names are of the format <instance name>.<user>
                 user = user[user.index(".")+1:]
 
-            user_capabilites = self._owner.vip.auth.get_capabilities(user)
-            _log.debug("**user caps is: {}".format(user_capabilites))
-            if user_capabilites:
-                user_capabilities_names = set(user_capabilites.keys())
-            else:
-                user_capabilities_names = set()
-            if required_caps == {""}:
-                pass
-            elif not required_caps.issubset(user_capabilities_names):
-                msg = (
-                    "method '{}' requires capabilities {}, but capability {} "
-                    "was provided for user {}"
-                ).format(
-                    method.__name__,
-                    required_caps,
-                    user_capabilites,
-                    user
+            key = (user, checked_method)
+            try:
+                error, restrictions = self._auth_cache[key]
+            except KeyError:
+                error, restrictions = self._authorize(
+                    user, method, required_caps
                 )
-                raise jsonrpc.exception_from_json(jsonrpc.UNAUTHORIZED, msg)
-            else:
-                # Now check if args passed to method are the ones allowed.
+                self._auth_cache[key] = (error, restrictions)
 
-                for cap_name, param_dict in user_capabilites.items():
-                    if (
-                            param_dict
-                            and required_caps
-                            and cap_name in required_caps
-                    ):
-                        # if the method has required capabilities and
-                        # if the user capability has argument restrictions,
-                        # check if the args passed to method match the
-                        # requirement
-                        _log.debug("args = {} kwargs= {}".format(args, kwargs))
-                        args_dict = inspect.getcallargs(method, *args, **kwargs)
-                        _log.debug("dict = {}".format(args_dict))
-                        _log.debug(
-                            "name= %r parameters allowed=%r",
-                            cap_name,
-                            param_dict
+            if error is not None:
+                raise jsonrpc.exception_from_json(jsonrpc.UNAUTHORIZED, error)
+
+            if restrictions:
+                # Now check if args passed to method are the ones allowed.
+                args_dict = inspect.getcallargs(method, *args, **kwargs)
+                for name, value, regex in restrictions:
+                    if name not in args_dict:
+                        raise jsonrpc.exception_from_json(
+                            jsonrpc.UNAUTHORIZED,
+                            "User {} capability is not defined "
+                            "properly. method {} does not have "
+                            "a parameter {}".format(
+                                user, method.__name__, name
+                            ),
+                        )
+                    if regex is not None:
+                        if not regex.match(args_dict[name]):
+                            raise jsonrpc.exception_from_json(
+                                jsonrpc.UNAUTHORIZED,
+                                "User {} can call method {} only "
+                                "with {} matching pattern {} but "
+                                "called with {}={}".format(
+                                    user,
+                                    method.__name__,
+                                    name,
+                                    value,
+                                    name,
+                                    args_dict[name],
+                                ),
+                            )
+                    elif args_dict[name] != value:
+                        raise jsonrpc.exception_from_json(
+                            jsonrpc.UNAUTHORIZED,
+                            "User {} can call method {} only "
+                            "with {}={} but called with "
+                            "{}={}".format(
+                                user,
+                                method.__name__,
+                                name,
+                                value,
+                                name,
+                                args_dict[name],
+                            ),
                         )
-                        for name, value in param_dict.items():
-                            _log.debug("name= {} value={}".format(name, value))
-                            if name not in args_dict:
-                                raise jsonrpc.exception_from_json(
-                                    jsonrpc.UNAUTHORIZED,
-                                    "User {} capability is not defined "
-                                    "properly. method {} does not have "
-                                    "a parameter {}".format(
-                                        user, method.__name__, name
-                                    ),
-                                )
-                            if _isregex(value):
-                                regex = re.compile("^" + value[1:-1] + "$")
-                                if not regex.match(args_dict[name]):
-                                    raise jsonrpc.exception_from_json(
-                                        jsonrpc.UNAUTHORIZED,
-                                        "User {} can call method {} only "
-                                        "with {} matching pattern {} but "
-                                        "called with {}={}".format(
-                                            user,
-                                            method.__name__,
-                                            name,
-                                            value,
-                                            name,
-                                            args_dict[name],
-                                        ),
-                                    )
-                            elif args_dict[name] != value:
-                                raise jsonrpc.exception_from_json(
-                                    jsonrpc.UNAUTHORIZED,
-                                    "User {} can call method {} only "
-                                    "with {}={} but called with "
-                                    "{}={}".format(
-                                        user,
-                                        method.__name__,
-                                        name,
-                                        value,
-                                        name,
-                                        args_dict[name],
-                                    ),
-                                )
 
             return method(*args, **kwargs)
 
+        checked_method.interruptible = getattr(method, "interruptible", False)
         return checked_method
 
+    def _authorize(self, user, method, required_caps):
+        """
+        Computes the authorization decision for a user calling method.
+
+        :returns: a tuple of (error message or None, list of argument
+            restrictions as (parameter name, value, compiled regex or None))
+        """
+        user_capabilites = self._owner.vip.auth.get_capabilities(user)
+        _log.debug("**user caps is: {}".format(user_capabilites))
+        if user_capabilites:
+            user_capabilities_names = set(user_capabilites.keys())
+        else:
+            user_capabilities_names = set()
+        if required_caps == {""}:
+            return None, []
+        if not required_caps.issubset(user_capabilities_names):
+            msg = (
+                "method '{}' requires capabilities {}, but capability {} "
+                "was provided for user {}"
+            ).format(
+                method.__name__,
+                required_caps,
+                user_capabilites,
+                user
+            )
+            return msg, []
+
+        restrictions = []
+        for cap_name, param_dict in user_capabilites.items():
+            if param_dict and cap_name in required_caps:
+                # if the method has required capabilities and
+                # if the user capability has argument restrictions,
+                # the args passed to method must match the requirement
+                _log.debug(
+                    "name= %r parameters allowed=%r", cap_name, param_dict
+                )
+                for name, value in param_dict.items():
+                    if _isregex(value):
+                        regex = re.compile("^" + value[1:-1] + "$")
+                    else:
+                        regex = None
+                    restrictions.append((name, value, regex))
+        return None, restrictions
+
+    def clear_auth_cache(self):
+        """
+        Discards all cached authorization decisions. Called whenever the
+        capabilities known to this agent change.
+        """
+        self._auth_cache.clear()
+
     @spawn
     def _handle_external_rpc_subsystem(self, message):
         ret_msg = dict()
@@ -551,8 +618,21 @@ class RPC(SubsystemBase):
         return results or None
 
     def call(self, peer, method, *args, **kwargs):
+        """
+        Calls an exported method on peer and returns an AsyncResult.
+
+        If the reserved keyword argument ``rpc_timeout`` is given, a deadline
+        of that many seconds from now is sent along with the request. The
+        callee can check it with :py:meth:`remaining`, methods decorated with
+        :py:meth:`interruptible` are stopped when it passes, and a reply
+        produced after the deadline is dropped instead of being sent back.
+        The caller should still wait on the result with a matching timeout.
+        """
         platform = kwargs.pop("external_platform", "")
-        request, result = self._dispatcher.call(method, args, kwargs)
+        rpc_timeout = kwargs.pop("rpc_timeout", None)
+        deadline = None if rpc_timeout is None else time.time() + rpc_timeout
+        request, result = self._dispatcher.call(method, args, kwargs,
+                                                deadline=deadline)
         ident = f"{next(self._counter)}.{hash(result)}"
         self._outstanding[ident] = result
         subsystem = None
@@ -666,12 +746,54 @@ class RPC(SubsystemBase):
                     peer, "RPC", args=[request], platform=platform
                 )
 
+    def remaining(self):
+        """
+        Returns the seconds left before the deadline of the RPC request
+        being handled, or None if the caller did not set one.
+
+        Only meaningful inside an exported method.
+        """
+        deadline = getattr(self.context, "deadline", None)
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.time())
+
+    def check_deadline(self):
+        """
+        Raises DeadlineExceeded if the caller's deadline for the RPC request
+        being handled has passed. Long running exported methods can call
+        this between steps to stop doing work nobody will receive.
+        """
+        if self.remaining() == 0:
+            raise DeadlineExceeded(self.context.request.get("method"))
+
+    @staticmethod
+    def interruptible(method):
+        """
+        Decorator allowing an exported method to be interrupted with
+        DeadlineExceeded, at its next cooperative yield, once the caller's
+        deadline passes.
+
+        .. code-block:: python
+
+            @RPC.export
+            @RPC.interruptible
+            def query(self, topic):
+                ...
+
+        Only use this for methods that leave no state half updated when
+        stopped part way.
+        """
+        method.interruptible = True
+        return method
+
     @dualmethod
     def allow(self, method, capabilities):
         if isinstance(capabilities, str):
             cap = set([capabilities])
         else:
             cap = set(capabilities)
+        self.clear_auth_cache()
         # Necessary if you have provided an alias for the rpc method.
         if isinstance(method, str):
             if method in self._exports:
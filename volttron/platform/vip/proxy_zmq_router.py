@@ -25,7 +25,7 @@
 import logging
 
 from zmq import green as zmq
-from zmq.green import ZMQError, ENOTSOCK
+from zmq.green import ZMQError, ENOTSOCK, EHOSTUNREACH
 
 from volttron.platform import jsonapi
 from volttron.utils.frame_serialization import deserialize_frames, serialize_frames
@@ -60,6 +60,8 @@ class ZMQProxyRouter(Agent):
         self._rpc_handler_queue = "{user}.zmq.outbound.subsystem".format(user=rmq_user)
         self._vip_loop_running = False
         self._zmq_peers = set()
+        # Routing keys of ZMQ peers already bound to the outbound response queue
+        self._response_bindings = set()
 
     @Core.receiver('onstart')
     def startup(self, sender, **kwargs):
@@ -77,6 +79,8 @@ class ZMQProxyRouter(Agent):
 
         connection = self.core.connection
         channel = connection.channel
+        # The outbound response queue is declared again with no bindings
+        self._response_bindings.clear()
 
         # ----------------------------------------------------------------------------------
         # Create a queue to receive messages from local platform
@@ -188,7 +192,13 @@ class ZMQProxyRouter(Agent):
         try:
             self.zmq_router.socket.send_multipart(frames, copy=True)
         except ZMQError as ex:
-            _log.error("ZMQ Error {}".format(ex))
+            if ex.errno == EHOSTUNREACH:
+                # The ZMQ peer disconnected without sending agentstop
+                _log.debug("ZMQ peer {} is unreachable".format(to_identity))
+                self._zmq_peers.discard(to_identity)
+                self._unbind_response(to_identity)
+            else:
+                _log.error("ZMQ Error {}".format(ex))
 
     def rpc_message_handler(self, ch, method, props, body):
         """
@@ -268,7 +278,8 @@ class ZMQProxyRouter(Agent):
                     self._zmq_peers.add(sender)
                 elif subsystem == 'agentstop':
                     self.vip.peerlist.drop_peer(sender, 'zmq')
-                    self._zmq_peers.remove(sender)
+                    self._zmq_peers.discard(sender)
+                    self._unbind_response(sender)
                 if not recipient or recipient in self._zmq_peers:
                     # Handle router specific messages or route to ZMQ peer
                     self.zmq_router.route(frames)
@@ -281,6 +292,22 @@ class ZMQProxyRouter(Agent):
                     break
         self._vip_loop_running = False
 
+    def _unbind_response(self, peer):
+        """
+        Remove the outbound response queue binding of a ZMQ peer that has stopped, or
+        that could not be reached with a response. A peer that drops without agentstop
+        keeps its binding until a response for it fails to be delivered.
+        :param peer: identity of the ZMQ peer
+        """
+        app_id = "{instance}.{identity}".format(instance=self.core.instance_name,
+                                                identity=peer)
+        if app_id in self._response_bindings:
+            self._response_bindings.discard(app_id)
+            connection = self.core.connection
+            connection.channel.queue_unbind(self._outbound_response_queue,
+                                            connection.exchange,
+                                            routing_key=app_id)
+
     def _route_to_agent(self, frames):
         """
         Send the message to local agent using internal RabbitMQ message bus
@@ -299,11 +326,14 @@ class ZMQProxyRouter(Agent):
         # After sending the message (request) on behalf of ZMQ client, the response has to
         # routed back to the caller. Queue binding is modified for that purpose.
         # outbound_response_handler() gets called (based on the binding) to reformat response
-        # message and send over zmq bus
-        connection.channel.queue_bind(self._outbound_response_queue,
-                                      connection.exchange,
-                                      routing_key=app_id,
-                                      callback=None)
+        # message and send over zmq bus. The binding is made once per sender and kept until
+        # the sender stops.
+        if app_id not in self._response_bindings:
+            connection.channel.queue_bind(self._outbound_response_queue,
+                                          connection.exchange,
+                                          routing_key=app_id,
+                                          callback=None)
+            self._response_bindings.add(app_id)
 
         # Set the destination routing key to destination agent
         destination_routing_key = "{0}.{1}".format(self.core.instance_name, recipient)
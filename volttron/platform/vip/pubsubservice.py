@@ -53,8 +53,9 @@ _ROUTE_ERRORS = {
 _log = logging.getLogger(__name__)
 
 class PubSubService:
-    def __init__(self, socket, protected_topics, routing_service, *args, **kwargs):
+    def __init__(self, socket, protected_topics, routing_service, *args, tracker=None, **kwargs):
         self._logger = logging.getLogger(__name__)
+        self._tracker = tracker
 
         def platform_subscriptions():
             return defaultdict(subscriptions)
@@ -296,7 +297,10 @@ class PubSubService:
                 return 0
             if self._rabbitmq_agent:
                 self._publish_on_rmq_bus(frames)
-            return self._distribute(frames, user_id)
+            count = self._distribute(frames, user_id)
+            if self._tracker is not None:
+                self._tracker.fanout(frames[7], count)
+            return count
 
     def _peer_list(self, frames):
         """Returns a list of subscriptions for a specific bus. If bus is None, then it returns list of subscriptions
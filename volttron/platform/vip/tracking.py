@@ -26,26 +26,48 @@
 # }}}
 #}}}
 
-'''Utilities for tracking VIP message statistics at the router.'''
+'''Utilities for tracking VIP message statistics at the router.
 
+Besides message counts, an enabled :class:`Tracker` keeps histograms of the
+time the router spends on each message by subsystem, of the router backlog
+and pubsub fan-out counts by topic prefix. :meth:`Tracker.get_metrics`
+returns them with message rates and :meth:`Tracker.prometheus` formats them
+in the Prometheus text exposition format.
+'''
 
 
+from bisect import bisect_left
+from time import perf_counter
 
 import gevent
+import zmq
 
 from .router import UNROUTABLE, ERROR, INCOMING
 
-__all__ = ['Tracker']
+__all__ = ['Tracker', 'Histogram']
+
+# Upper bounds, in seconds, of the router dwell time histogram buckets.
+DWELL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                 0.025, 0.05, 0.1, 0.25, 1.0)
+# Upper bounds of the router backlog histogram buckets.
+BACKLOG_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
 
 
 def pick(frames, index):
-    '''Return the frame at index, converted to bytes, or None.'''
+    '''Return the frame at index, converted to a string, or None.'''
     try:
-        return bytes(frames[index])
+        return text(frames[index])
     except IndexError:
         return None
 
 
+def text(frame):
+    '''Return a frame, bytes or string as a string.'''
+    if isinstance(frame, str):
+        return frame
+    return bytes(frame).decode('utf-8', 'replace')
+
+
 def increment(prop, key):
     '''Increment or set to 1 the value in prop[key].'''
     try:
@@ -54,9 +76,43 @@ def increment(prop, key):
         prop[key] = 1
 
 
+class Histogram:
+    '''Cumulative histogram with fixed bucket upper bounds.'''
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # The last count is for values above the largest bound.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        '''Return (upper bound, count of values <= bound) pairs.'''
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self):
+        return {'buckets': [[bound if bound != float('inf') else '+Inf', count]
+                            for bound, count in self.cumulative()],
+                'sum': self.sum,
+                'count': self.count}
+
+
 class Tracker:
     '''Object for sharing data between the router and control objects.'''
 
+    # Number of topic levels pubsub fan-out is counted by.
+    fanout_prefix_depth = 2
+
     def __init__(self):
         self._reset()
         self.enabled = False
@@ -74,6 +130,11 @@ class Tracker:
             'incoming': {'peer': {}, 'user': {}, 'subsystem': {}},
             'outgoing': {'peer': {}, 'user': {}, 'subsystem': {}},
         }
+        self._dwell = {}
+        self._backlog = Histogram(BACKLOG_BUCKETS)
+        self._fanout = {}
+        self._subsystem = None
+        self._run_length = 0
 
     def hit(self, topic, frames, extra):
         '''Increment counters for given topic and frames.'''
@@ -86,14 +147,128 @@ class Tracker:
                 subsystem = pick(frames, 5)
                 if topic == ERROR:
                     stat = self.stats['error']
-                    increment(stat['error'], bytes(extra[0]))
+                    increment(stat['error'], text(extra[0]))
                 else:
                     stat = self.stats[
                         'incoming' if topic == INCOMING else 'outgoing']
+                    if topic == INCOMING:
+                        self._subsystem = subsystem
                 increment(stat['user'], user)
                 increment(stat['subsystem'], subsystem)
             increment(stat['peer'], pick(frames, 0))
 
+    def routed(self, started, socket=None):
+        '''Record the time since started spent routing the last incoming
+        message.
+
+        When the router socket is given, the number of messages routed
+        back to back while it still had input waiting is recorded as the
+        router backlog. ZeroMQ does not expose the length of its queues.
+        '''
+        if not self.enabled:
+            return
+        subsystem = self._subsystem
+        self._subsystem = None
+        try:
+            histogram = self._dwell[subsystem]
+        except KeyError:
+            histogram = self._dwell[subsystem] = Histogram(DWELL_BUCKETS)
+        histogram.observe(perf_counter() - started)
+        if socket is not None:
+            self._run_length += 1
+            if not socket.getsockopt(zmq.EVENTS) & zmq.POLLIN:
+                self._backlog.observe(self._run_length)
+                self._run_length = 0
+
+    def fanout(self, topic, subscribers):
+        '''Count a pubsub message on topic delivered to subscribers.'''
+        if not self.enabled:
+            return
+        prefix = '/'.join(topic.split('/', self.fanout_prefix_depth)[
+                          :self.fanout_prefix_depth])
+        try:
+            counts = self._fanout[prefix]
+        except KeyError:
+            counts = self._fanout[prefix] = [0, 0]
+        counts[0] += 1
+        counts[1] += subscribers
+
+    def get_metrics(self):
+        '''Return message rates and histograms as a dictionary.'''
+        start = self.stats.get('start')
+        end = self.stats.get('end')
+        if end is None:
+            loop = gevent.get_hub().loop
+            loop.update_now()
+            end = loop.now()
+        elapsed = end - start if start is not None else 0
+
+        def rates(counts):
+            if not elapsed:
+                return {}
+            return {key: count / elapsed for key, count in counts.items()}
+
+        return {
+            'enabled': self.enabled,
+            'elapsed': elapsed,
+            'rates': {direction: {'peer': rates(self.stats[direction]['peer']),
+                                  'subsystem': rates(self.stats[direction]['subsystem'])}
+                      for direction in ('incoming', 'outgoing')},
+            'dwell': {subsystem: histogram.to_dict()
+                      for subsystem, histogram in self._dwell.items()},
+            'backlog': self._backlog.to_dict(),
+            'fanout': {prefix: {'messages': messages, 'deliveries': deliveries}
+                       for prefix, (messages, deliveries) in self._fanout.items()},
+        }
+
+    def prometheus(self):
+        '''Return the metrics in the Prometheus text exposition format.'''
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append('# HELP {} {}'.format(name, help_text))
+            lines.append('# TYPE {} {}'.format(name, kind))
+
+        def labels(**values):
+            return ','.join('{}="{}"'.format(
+                key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                for key, value in values.items())
+
+        def histogram(name, histogram, **values):
+            for bound, count in histogram.cumulative():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append('{}_bucket{{{}}} {}'.format(
+                    name, labels(le=le, **values), count))
+            prefix = '{' + labels(**values) + '}' if values else ''
+            lines.append('{}_sum{} {}'.format(name, prefix, histogram.sum))
+            lines.append('{}_count{} {}'.format(name, prefix, histogram.count))
+
+        metric('volttron_router_messages_total', 'counter',
+               'Messages seen by the router.')
+        for direction in ('incoming', 'outgoing'):
+            for kind in ('peer', 'subsystem'):
+                for key, count in self.stats[direction][kind].items():
+                    lines.append('volttron_router_messages_total{{{}}} {}'.format(
+                        labels(direction=direction, **{kind: key}), count))
+        metric('volttron_router_dwell_seconds', 'histogram',
+               'Time spent routing a message.')
+        for subsystem, dwell in self._dwell.items():
+            histogram('volttron_router_dwell_seconds', dwell, subsystem=subsystem)
+        metric('volttron_router_backlog', 'histogram',
+               'Messages routed back to back while more were waiting.')
+        histogram('volttron_router_backlog', self._backlog)
+        metric('volttron_pubsub_messages_total', 'counter',
+               'Pubsub messages published by topic prefix.')
+        for prefix, (messages, _) in self._fanout.items():
+            lines.append('volttron_pubsub_messages_total{{{}}} {}'.format(
+                labels(prefix=prefix), messages))
+        metric('volttron_pubsub_deliveries_total', 'counter',
+               'Pubsub messages delivered to subscribers by topic prefix.')
+        for prefix, (_, deliveries) in self._fanout.items():
+            lines.append('volttron_pubsub_deliveries_total{{{}}} {}'.format(
+                labels(prefix=prefix), deliveries))
+        return '\n'.join(lines) + '\n'
+
     def enable(self):
         '''Enable tracking.'''
         if not self.enabled:
@@ -1,7 +1,9 @@
 import json
 from weakref import WeakValueDictionary
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
+import gevent
+from gevent.event import Event
 from ws4py.server.geventserver import WebSocketWSGIApplication
 from ws4py.websocket import WebSocket
 import logging
@@ -15,6 +17,7 @@ class VUIPubsubManager:
         self.subscription_websockets = WeakValueDictionary() # Websockets for all topics with current subscriptions.
         self.publication_websockets = {}  # Websockets for all topics with current publication queue.
         self.user_websockets = defaultdict(dict)  # References to all websockets for each user access_token.
+        self.subscription_groups = {}  # Shared bus subscriptions by topic prefix.
 
     def get_socket_routes(self, access_token, topic=None):
         _log.debug('In get_socket_routes. User_websockets is: ')
@@ -57,50 +60,84 @@ class VUIPubsubManager:
         return ws_app
 
     def client_opened(self, ws, topic, access_token):
-        _log.debug(f'VUIPubsubManager: Subscribing to {topic}')
-        self._agent.vip.pubsub.subscribe('pubsub', topic, ws.on_topic)
+        group = self._find_group(topic)
+        if group is None:
+            _log.debug(f'VUIPubsubManager: Subscribing to {topic}')
+            group = SubscriptionGroup(self._agent.vip.pubsub, topic)
+            # A new group for a shorter prefix takes over the clients of the groups it covers.
+            for prefix in [p for p in self.subscription_groups if p.startswith(topic)]:
+                covered = self.subscription_groups.pop(prefix)
+                covered.unsubscribe()
+                group.websockets.update(covered.websockets)
+            self.subscription_groups[topic] = group
+        group.add(ws, topic)
         self.user_websockets[access_token][topic] = ws
 
-        # if topic not in self.subscription_websockets:
-        #     err = f'Websocket opened for unintialized topic: {topic}'
-        #     _log.error(err)
-        #     ws.close(reason=err)
-        #     return
-
-        # TODO: Use this if we need to look over websockets connected to one subscription.
-        # if ws in  self.subscription_websockets[topic]:
-        #     _log.debug("IDENTITY,CLIENT: {} already in endpoint set".format(identity))
-        # else:
-        #     _log.debug("IDENTITY,CLIENT: {} added to endpoint set".format(identity))
-        #     self.subscription_websockets[endpoint].add((identity, ws))
-#
-# class SubscriptionGroup:
-#     def __init__(self, pubsub_interface, topic: str):
-#         self.topic = topic
-#         self.websockets = []
-#         self.pubsub = pubsub_interface
-#         self.pubsub.subscribe('pubsub', topic, self.on_publish)
-#
-#
-#     def add(self, ws: WebSocket):
-#         self.websockets.append(ws)
-#
-#     def on_publish(self, peer, sender, bus, topic, headers, message):
-#         for ws in self.websockets:
-#             if not ws.terminated:
-#                 try:
-#                     ws.send(message)
-#                 except Exception as e:
-#                     _log.warning(f'Error sending subscription data: {e}')
-#
-#     def remove(self, ):
-#         pass
+    def client_closed(self, ws, topic, access_token):
+        group = self._find_group(topic)
+        if group is not None and group.remove(ws):
+            _log.debug(f'VUIPubsubManager: Unsubscribing from {group.prefix}')
+            group.unsubscribe()
+            del self.subscription_groups[group.prefix]
+        if self.user_websockets.get(access_token, {}).get(topic) is ws:
+            del self.user_websockets[access_token][topic]
+
+    def _find_group(self, topic):
+        for prefix, group in self.subscription_groups.items():
+            if topic.startswith(prefix):
+                return group
+        return None
+
+
+class SubscriptionGroup:
+    """One bus subscription shared by all websockets whose topic starts with the prefix of the group.
+
+    Each message is serialized once and queued on every websocket whose topic it matches.
+    """
+    def __init__(self, pubsub_interface, prefix: str):
+        self.prefix = prefix
+        self.websockets = {}  # Websocket -> topic it was opened for.
+        self.pubsub = pubsub_interface
+        self.pubsub.subscribe('pubsub', prefix, self.on_publish)
+
+    def add(self, ws: WebSocket, topic: str):
+        self.websockets[ws] = topic
+
+    def remove(self, ws: WebSocket) -> bool:
+        """Remove a websocket, returns True when the group has none left."""
+        self.websockets.pop(ws, None)
+        return not self.websockets
+
+    def unsubscribe(self):
+        self.pubsub.unsubscribe('pubsub', self.prefix, self.on_publish)
+
+    def on_publish(self, peer, sender, bus, topic, headers, message):
+        frame = None
+        for ws, ws_topic in list(self.websockets.items()):
+            if ws.terminated or not topic.startswith(ws_topic):
+                continue
+            if frame is None:
+                try:
+                    frame = json.dumps(message)
+                except (TypeError, ValueError) as e:
+                    _log.warning(f'Error serializing subscription data for {topic}: {e}')
+                    return
+            ws.queue_frame(topic, frame)
 
 
 class VUIWebSocket(WebSocket):
+    # Most topics with an unsent frame. Only the newest frame of a topic is kept, and the oldest topic is dropped
+    # when a slow client has this many waiting.
+    max_pending_frames = 100
+
     def __init__(self, *args, **kwargs):
         super(VUIWebSocket, self).__init__(*args, **kwargs)
         _log = logging.getLogger(self.__class__.__name__)
+        self._pending = OrderedDict()
+        self._frames_ready = Event()
+        self._sender = None
+        self.coalesced_frames = 0
+        self.dropped_frames = 0
 
     def _get_topic(self):
         from volttron.platform.web import get_bearer
@@ -113,6 +150,7 @@ class VUIWebSocket(WebSocket):
         _log.info('Socket opened')
         app = self.environ['ws4py.app']
         topic, access_token = self._get_topic()
+        self._sender = gevent.spawn(self._send_pending)
         app.client_opened(self, topic, access_token)
 
     def received_message(self, m):
@@ -126,18 +164,34 @@ class VUIWebSocket(WebSocket):
         pass
 
     def closed(self, code, reason="A client left the room without a proper explanation."):
-        # _log.info('Socket closed!')
-        # app = self.environ.pop('ws4py.app')
-        # identity, endpoint = self._get_identity_and_endpoint()
-        # app.client_closed(self, endpoint, identity, reason)
-        pass
-
-    def on_topic(self, peer, sender, bus, topic, headers, message):
-        _log.debug('VUIWebSocket: in _on_topic')
-        _log.debug(f'topic is: {topic}')
-        _log.debug(f'message is: {message}')
-        if not self.terminated:
-            try:
-                self.send(json.dumps(message))
-            except Exception as e:
-                _log.warning(f'Error sending subscription data: {e}')
+        _log.info('Socket closed')
+        if self._sender is not None:
+            self._sender.kill(block=False)
+            self._sender = None
+        self._pending.clear()
+        app = self.environ.get('ws4py.app')
+        if app is not None:
+            topic, access_token = self._get_topic()
+            app.client_closed(self, topic, access_token)
+
+    def queue_frame(self, topic, frame):
+        """Queue a serialized message without blocking the bus subscription on a slow client."""
+        if topic in self._pending:
+            self.coalesced_frames += 1
+        elif len(self._pending) >= self.max_pending_frames:
+            self._pending.popitem(last=False)
+            self.dropped_frames += 1
+        self._pending[topic] = frame
+        self._frames_ready.set()
+
+    def _send_pending(self):
+        while not self.terminated:
+            self._frames_ready.wait()
+            self._frames_ready.clear()
+            while self._pending and not self.terminated:
+                _, frame = self._pending.popitem(last=False)
+                try:
+                    self.send(frame)
+                except Exception as e:
+                    _log.warning(f'Error sending subscription data: {e}')
+                    return
@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+from volttron.platform.agent.known_identities import AUTH
+from volttron.platform.vip.agent.subsystems.auth import Auth
+
+
+def make_auth(version=3, capabilities=None):
+    rpc = MagicMock()
+    rpc.context.vip_message.peer = AUTH
+    auth = Auth(MagicMock(), MagicMock(), rpc)
+    auth._rpc = lambda: rpc
+    rpc.call.return_value.get.return_value = {
+        "version": version,
+        "capabilities": capabilities or {"agent1": {"cap1": None}, "agent2": {"cap2": None}}}
+    return auth, rpc
+
+
+def test_delta_is_applied_to_fetched_capabilities():
+    auth, rpc = make_auth()
+    assert auth.get_capabilities("agent1") == {"cap1": None}
+
+    auth._update_capabilities({"agent1": {"cap3": None}, "agent3": {"cap1": None}},
+                              version=4, removed=["agent2"])
+    assert auth.get_capabilities("agent1") == {"cap3": None}
+    assert auth.get_capabilities("agent3") == {"cap1": None}
+    assert auth.get_capabilities("agent2") == []
+    # only the initial fetch went to the auth service
+    assert rpc.call.call_count == 1
+
+
+def test_old_update_is_ignored():
+    auth, rpc = make_auth()
+    auth.get_capabilities("agent1")
+    auth._update_capabilities({"agent1": {"old": None}}, version=3, removed=[])
+    assert auth.get_capabilities("agent1") == {"cap1": None}
+
+
+def test_gap_causes_resync():
+    auth, rpc = make_auth()
+    auth.get_capabilities("agent1")
+
+    rpc.call.return_value.get.return_value = {"version": 6, "capabilities": {"agent1": {"cap6": None}}}
+    auth._update_capabilities({"agent1": {"cap5": None}}, version=5, removed=[])
+    assert auth.get_capabilities("agent1") == {"cap6": None}
+    assert rpc.call.call_count == 2
+
+    auth._update_capabilities({"agent1": {"cap7": None}}, version=7, removed=[])
+    assert auth.get_capabilities("agent1") == {"cap7": None}
+    assert rpc.call.call_count == 2
+
+
+def test_update_from_other_peer_is_ignored():
+    auth, rpc = make_auth()
+    auth.get_capabilities("agent1")
+    rpc.context.vip_message.peer = "not.auth"
+    auth._update_capabilities({"agent1": {"bad": None}}, version=4, removed=[])
+    assert auth.get_capabilities("agent1") == {"cap1": None}
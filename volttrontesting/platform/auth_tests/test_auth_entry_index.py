@@ -0,0 +1,54 @@
+import pytest
+
+from volttron.platform.auth import AuthEntry, AuthEntryIndex
+
+KEY1 = "A" * 43
+KEY2 = "B" * 43
+
+
+def scan(entries, *connection):
+    for entry in entries:
+        if entry.match(*connection):
+            return entry
+    return None
+
+
+@pytest.fixture(scope="module")
+def entries():
+    entries = [
+        AuthEntry(credentials=KEY1, user_id="key1"),
+        AuthEntry(credentials=KEY2, address="10.0.0.1", user_id="key2-host1"),
+        AuthEntry(credentials=KEY2, address="/10.0.0.*/", user_id="key2-subnet"),
+        AuthEntry(credentials="/C+/", user_id="any-c-key"),
+        AuthEntry(mechanism="NULL", address="127.0.0.1", user_id="null-local"),
+        AuthEntry(mechanism="NULL", address=["10.0.0.5", "10.0.0.6"], user_id="null-hosts"),
+        AuthEntry(mechanism="NULL", address="/192\\.168\\..*/", user_id="null-lan"),
+        AuthEntry(mechanism="PLAIN", credentials="secret", user_id="plain"),
+    ]
+    entries.sort()
+    return entries
+
+
+@pytest.mark.parametrize("connection", [
+    ("vip", "10.0.0.9", "CURVE", [KEY1]),
+    ("vip", "10.0.0.1", "CURVE", [KEY2]),
+    ("vip", "10.0.0.2", "CURVE", [KEY2]),
+    ("vip", "10.1.0.2", "CURVE", [KEY2]),
+    ("vip", "10.0.0.2", "CURVE", ["C" * 43]),
+    ("vip", "10.0.0.2", "CURVE", ["D" * 43]),
+    ("vip", "127.0.0.1", "NULL", []),
+    ("vip", "10.0.0.6", "NULL", []),
+    ("vip", "192.168.1.4", "NULL", []),
+    ("vip", "172.16.1.4", "NULL", []),
+    ("vip", "10.0.0.2", "PLAIN", ["secret"]),
+    ("vip", "10.0.0.2", "PLAIN", [KEY1]),
+])
+def test_match_is_same_as_scan(entries, connection):
+    index = AuthEntryIndex(entries)
+    assert index.match(*connection) is scan(entries, *connection)
+
+
+def test_only_regex_entries_are_scanned(entries):
+    index = AuthEntryIndex(entries)
+    assert len(index) == len(entries) + 1
+    assert {entry.user_id for _, entry in index._scanned} == {"any-c-key", "null-lan"}
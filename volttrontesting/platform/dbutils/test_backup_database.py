@@ -183,6 +183,27 @@ def test_get_outstanding_to_publish_should_return_unique_records_on_multiple_tra
     assert backup_database.get_outstanding_to_publish(SIZE_LIMIT) == []
 
 
+def test_backup_new_data_should_expand_device_records(backup_database):
+    timestamp = datetime(2020, 6, 1, 12, 31, tzinfo=UTC)
+    device_record = {
+        "source": "scrape",
+        "device": "campus/building/device",
+        "timestamp": timestamp,
+        "values": {"p1": 1, "p2": 2.5},
+        "meta": {"p1": {"units": "F"}, "p2": {"units": "C"}},
+        "headers": {},
+    }
+
+    assert not backup_database.backup_new_data([device_record])
+
+    actual_records = backup_database.get_outstanding_to_publish(SIZE_LIMIT)
+    assert [(r["topic"], r["value"], r["meta"], r["timestamp"]) for r in actual_records] == [
+        ("campus/building/device/p1", 1, {"units": "F"}, timestamp),
+        ("campus/building/device/p2", 2.5, {"units": "C"}, timestamp),
+    ]
+    assert backup_database._record_count == 2
+
+
 def init_db_with_dupes(backup_database, new_publish_list_dupes):
     backup_database.backup_new_data(new_publish_list_dupes)
 
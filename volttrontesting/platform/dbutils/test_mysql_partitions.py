@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+try:
+    import mysql.connector
+except ImportError:
+    pytest.skip(
+        "Required imports for testing are not installed; thus, not running tests. "
+        "Install imports with: python bootstrap.py --mysql",
+        allow_module_level=True
+    )
+from volttron.platform.dbutils.mysqlfuncts import MySqlFuncts
+from volttron.platform.dbutils.partitions import partition_name
+
+pytestmark = [pytest.mark.mysqlfuncts, pytest.mark.dbutils, pytest.mark.unit]
+
+GB = 1024 ** 3
+TABLE_NAMES = {"data_table": "data", "topics_table": "topics", "meta_table": "meta"}
+
+
+class CachedStatistics:
+    """
+    Answers the information_schema queries of manage_db_size the way MySQL 8 does with cached statistics: the
+    database size does not change after a partition is dropped.
+    """
+
+    def __init__(self, partition_sizes):
+        self.partition_sizes = dict(partition_sizes)
+        self.database_size = sum(self.partition_sizes.values())
+        self.dropped = []
+
+    def select(self, query, args=None):
+        if "information_schema.TABLES" in query:
+            return [(self.database_size,)]
+        return [(partition_name('p', start), size) for start, size in self.partition_sizes.items()]
+
+    def execute_stmt(self, stmt, args=None, commit=False):
+        assert " DROP PARTITION " in stmt
+        self.dropped.append(stmt.rsplit(" ", 1)[1])
+
+
+@pytest.fixture
+def partitioned_functs(monkeypatch):
+    sqlfuncts = MySqlFuncts({"database": "test_historian", "partition_period": "day"}, TABLE_NAMES)
+    statistics = CachedStatistics({datetime(2023, 1, day): GB for day in range(1, 6)})
+    monkeypatch.setattr(sqlfuncts, "select", statistics.select)
+    monkeypatch.setattr(sqlfuncts, "execute_stmt", statistics.execute_stmt)
+    sqlfuncts._partitions = set(statistics.partition_sizes)
+    monkeypatch.setattr(sqlfuncts, "_get_partitions", lambda refresh=False: sqlfuncts._partitions)
+    return sqlfuncts, statistics
+
+
+def test_storage_limit_drops_oldest_partitions_until_under_limit(partitioned_functs):
+    sqlfuncts, statistics = partitioned_functs
+
+    sqlfuncts.manage_db_size(None, 2.5)
+
+    assert statistics.dropped == ["p_20230101", "p_20230102", "p_20230103"]
+    assert sqlfuncts._partitions == {datetime(2023, 1, 4), datetime(2023, 1, 5)}
+
+
+def test_storage_limit_keeps_newest_partition(partitioned_functs):
+    sqlfuncts, statistics = partitioned_functs
+
+    sqlfuncts.manage_db_size(None, 0.1)
+
+    assert len(statistics.dropped) == 4
+    assert sqlfuncts._partitions == {datetime(2023, 1, 5)}
+
+
+def test_storage_under_limit_drops_nothing(partitioned_functs):
+    sqlfuncts, statistics = partitioned_functs
+
+    sqlfuncts.manage_db_size(None, 10)
+
+    assert statistics.dropped == []
@@ -4,6 +4,7 @@ import logging
 
 import gevent
 import pytest
+import pytz
 
 try:
     import psycopg2
@@ -219,6 +220,89 @@ def test_insert_data_should_return_true(setup_functs):
     cleanup_tables(truncate_tables=[DATA_TABLE], drop_tables=False)
 
 
+@pytest.mark.parametrize("bulk_insert_mode", ["insert", "copy"])
+def test_bulk_insert_should_overwrite_existing_rows(setup_functs, bulk_insert_mode):
+    cleanup_tables(truncate_tables=[DATA_TABLE], drop_tables=False)
+    params = dict(historian_config["connection"]["params"], bulk_insert_mode=bulk_insert_mode)
+    sqlfuncts = PostgreSqlFuncts(params, table_names)
+    sqlfuncts.insert_data("2001-09-11 08:46:00", 11, "old")
+    expected_data = [(datetime.datetime(2001, 9, 11, 8, 46), 11, '"new"'),
+                     (datetime.datetime(2001, 9, 11, 8, 47), 11, '"other"')]
+
+    with sqlfuncts.bulk_insert() as insert_data:
+        assert insert_data(datetime.datetime(2001, 9, 11, 8, 46, tzinfo=pytz.UTC), 11, "new")
+        assert insert_data("2001-09-11 08:47:00", 11, "other")
+    sqlfuncts.commit()
+
+    assert sorted(get_data_in_table(DATA_TABLE)) == expected_data
+    cleanup_tables(truncate_tables=[DATA_TABLE], drop_tables=False)
+
+
+def test_copy_bulk_insert_should_keep_last_duplicate_in_batch(setup_functs):
+    cleanup_tables(truncate_tables=[DATA_TABLE], drop_tables=False)
+    params = dict(historian_config["connection"]["params"], bulk_insert_mode="copy")
+    sqlfuncts = PostgreSqlFuncts(params, table_names)
+    expected_data = [(datetime.datetime(2001, 9, 11, 8, 46), 11, '"second"')]
+
+    with sqlfuncts.bulk_insert() as insert_data:
+        insert_data("2001-09-11 08:46:00", 11, "first")
+        insert_data("2001-09-11 08:46:00", 11, "second")
+    sqlfuncts.commit()
+
+    assert get_data_in_table(DATA_TABLE) == expected_data
+    cleanup_tables(truncate_tables=[DATA_TABLE], drop_tables=False)
+
+
+def test_copy_bulk_insert_should_stage_rows_privately(setup_functs):
+    cleanup_tables(truncate_tables=[DATA_TABLE], drop_tables=False)
+    params = dict(historian_config["connection"]["params"], bulk_insert_mode="copy")
+    other_writer = PostgreSqlFuncts(params, table_names)
+    sqlfuncts = PostgreSqlFuncts(params, table_names)
+    expected_data = [(datetime.datetime(2001, 9, 11, 8, 46), 11, '"mine"')]
+
+    # Another writer is part way through a batch with a row staged.
+    cursor = other_writer.cursor()
+    cursor.execute("BEGIN")
+    cursor.execute(SQL("CREATE TEMP TABLE {} (seq BIGSERIAL, ts TIMESTAMP NOT NULL, topic_id INTEGER NOT NULL, "
+                       "value_string TEXT NOT NULL) ON COMMIT DROP").format(Identifier(DATA_TABLE + "_staging")))
+    cursor.execute(SQL("INSERT INTO {} (ts, topic_id, value_string) VALUES ('2001-09-11 08:47:00', 12, '\"theirs\"')")
+                   .format(Identifier(DATA_TABLE + "_staging")))
+
+    with sqlfuncts.bulk_insert() as insert_data:
+        insert_data("2001-09-11 08:46:00", 11, "mine")
+    cursor.execute("ROLLBACK")
+
+    assert get_data_in_table(DATA_TABLE) == expected_data
+    cursor = db_connection.cursor()
+    cursor.execute("SELECT tablename FROM pg_tables WHERE tablename = %s", (DATA_TABLE + "_staging",))
+    assert cursor.fetchall() == []
+    cursor.close()
+    cleanup_tables(truncate_tables=[DATA_TABLE], drop_tables=False)
+
+
+def test_partitioned_data_table_should_drop_expired_partitions(setup_functs):
+    partitioned_table = "partitioned_data"
+    params = dict(historian_config["connection"]["params"], partition_period="day")
+    sqlfuncts = PostgreSqlFuncts(params, dict(table_names, data_table=partitioned_table))
+    sqlfuncts.setup_historian_tables()
+    start = datetime.datetime(2023, 1, 1, tzinfo=pytz.UTC)
+
+    with sqlfuncts.bulk_insert() as insert_data:
+        for hour in range(3 * 24):
+            insert_data(start + datetime.timedelta(hours=hour), 11, hour)
+    sqlfuncts.commit()
+    assert sorted(sqlfuncts._get_partitions(refresh=True)) == [datetime.datetime(2023, 1, day) for day in (1, 2, 3)]
+
+    values = sqlfuncts.query([11], {11: "topic"}, start=start + datetime.timedelta(hours=23),
+                             end=start + datetime.timedelta(hours=25))
+    assert [value for _, value in values["topic"]] == [23, 24]
+
+    sqlfuncts.manage_db_size(start + datetime.timedelta(days=1, hours=12), None)
+    assert sorted(sqlfuncts._get_partitions(refresh=True)) == [datetime.datetime(2023, 1, day) for day in (2, 3)]
+    assert min(row[0] for row in get_data_in_table(partitioned_table)) == datetime.datetime(2023, 1, 2, 12)
+    cleanup_tables(truncate_tables=[partitioned_table], drop_tables=True)
+
+
 def test_update_topic_should_return_true(setup_functs):
     sqlfuncts, historian_version = setup_functs
 
@@ -1,5 +1,7 @@
 import sqlite3
+from datetime import datetime, timedelta
 
+import pytz
 from gevent import subprocess
 import pytest
 import os
@@ -144,6 +146,77 @@ def test_insert_data(get_sqlitefuncts):
     assert get_all_data(DATA_TABLE) == expected_data
 
 
+@pytest.mark.sqlitefuncts
+@pytest.mark.dbutils
+def test_bulk_insert(get_sqlitefuncts):
+    sqlitefuncts, historain_version = get_sqlitefuncts
+    expected_data = [("2001-09-11 08:46:00", 11, '"replaced"'),
+                     ("2001-09-11 08:47:00", 11, '"2wtc"'),
+                     ("2001-09-11 08:47:00", 12, '3.5')]
+
+    with sqlitefuncts.bulk_insert() as insert_data:
+        assert insert_data("2001-09-11 08:46:00", 11, "1wtc")
+        assert insert_data("2001-09-11 08:47:00", 11, "2wtc")
+        assert insert_data("2001-09-11 08:47:00", 12, 3.5)
+        assert insert_data("2001-09-11 08:46:00", 11, "replaced")
+    sqlitefuncts.commit()
+
+    rows = sqlitefuncts.select(f"SELECT CAST(ts AS TEXT), topic_id, value_string FROM {DATA_TABLE} "
+                               f"ORDER BY ts, topic_id")
+    assert rows == expected_data
+
+
+@pytest.mark.sqlitefuncts
+@pytest.mark.dbutils
+def test_connection_pragmas(sqlitefuncts_db_not_initialized):
+    assert sqlitefuncts_db_not_initialized.select("PRAGMA journal_mode") == [("wal",)]
+    assert sqlitefuncts_db_not_initialized.select("PRAGMA synchronous") == [(1,)]
+
+    table_names = {"data_table": DATA_TABLE, "topics_table": TOPICS_TABLE, "meta_table": META_TABLE,
+                   "agg_topics_table": AGG_TOPICS_TABLE, "agg_meta_table": AGG_META_TABLE}
+    client = SqlLiteFuncts(dict(CONNECT_PARAMS, journal_mode="delete", synchronous="full", cache_size=-4000),
+                           table_names)
+    assert client.select("PRAGMA journal_mode") == [("delete",)]
+    assert client.select("PRAGMA synchronous") == [(2,)]
+    assert client.select("PRAGMA cache_size") == [(-4000,)]
+    client.close()
+
+
+@pytest.mark.sqlitefuncts
+@pytest.mark.dbutils
+def test_partitioned_data_table(sqlitefuncts_db_not_initialized):
+    table_names = {"data_table": DATA_TABLE, "topics_table": TOPICS_TABLE, "meta_table": META_TABLE,
+                   "agg_topics_table": AGG_TOPICS_TABLE, "agg_meta_table": AGG_META_TABLE}
+    client = SqlLiteFuncts(dict(CONNECT_PARAMS, partition_period="day"), table_names)
+    client.setup_historian_tables()
+    start = datetime(2023, 1, 1, tzinfo=pytz.UTC)
+    with client.bulk_insert() as insert_data:
+        for hour in range(4 * 24):
+            assert insert_data(start + timedelta(hours=hour), 11, hour)
+    client.commit()
+
+    assert get_partitions(client) == ["data_20230101", "data_20230102", "data_20230103", "data_20230104"]
+    assert client.select(f"SELECT * FROM {DATA_TABLE}") == []
+
+    # Only the partitions overlapping the requested range are read.
+    assert "data_20230101" not in client._data_source(start + timedelta(days=1), start + timedelta(days=2))
+    values = client.query([11], {11: "topic"}, start=start + timedelta(hours=23), end=start + timedelta(hours=26))
+    assert [value for _, value in values["topic"]] == [23, 24, 25]
+    values = client.query([11], {11: "topic"}, count=2, order="LAST_TO_FIRST")
+    assert [value for _, value in values["topic"]] == [95, 94]
+
+    # Retention drops whole partitions and trims the one the limit falls into.
+    client.manage_db_size(start + timedelta(days=2, hours=12), None)
+    assert get_partitions(client) == ["data_20230103", "data_20230104"]
+    values = client.query([11], {11: "topic"}, count=1)
+    assert values["topic"][0][1] == 60
+
+    # The size cap drops the oldest partition but keeps the newest one.
+    client.manage_db_size(None, 1e-9)
+    assert get_partitions(client) == ["data_20230104"]
+    client.close()
+
+
 @pytest.mark.sqlitefuncts
 @pytest.mark.dbutils
 def test_insert_topic(get_sqlitefuncts):
@@ -418,6 +491,12 @@ def test_collect_aggregate(get_sqlitefuncts):
     assert actual_aggregate == expected_aggregate
 
 
+def get_partitions(client):
+    rows = client.select("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ? ORDER BY name",
+                         (DATA_TABLE + "_%",))
+    return [row[0] for row in rows]
+
+
 def get_indexes(table):
     res = query_db(f"""PRAGMA index_list({table})""")
     return res.splitlines()
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from volttron.platform import jsonapi
+from volttron.platform.agent.base_historian import BaseQueryHistorianAgent
+from volttron.platform.agent.utils import format_timestamp
+from volttron.platform.vip.agent import Agent
+from volttrontesting.utils.utils import AgentMock
+
+BaseQueryHistorianAgent.__bases__ = (AgentMock.imitate(Agent, Agent()),)
+
+START = datetime(2023, 1, 1, tzinfo=pytz.UTC)
+
+
+class CountingQueryHistorian(BaseQueryHistorianAgent):
+    def __init__(self, **kwargs):
+        super(CountingQueryHistorian, self).__init__(**kwargs)
+        self.calls = 0
+
+    def query_historian(self, topic, start=None, end=None, agg_type=None,
+                        agg_period=None, skip=0, count=None, order=None):
+        self.calls += 1
+        values = [(format_timestamp(START), self.calls)]
+        if isinstance(topic, list):
+            return {"values": {t: values for t in topic}, "metadata": {}}
+        return {"values": values, "metadata": {"units": "F"}}
+
+
+def ts(minutes):
+    return format_timestamp(START + timedelta(minutes=minutes))
+
+
+def record(topic, minutes):
+    return {"topic": topic, "timestamp": START + timedelta(minutes=minutes)}
+
+
+def test_cache_disabled_by_default():
+    historian = CountingQueryHistorian()
+    historian.query("a", ts(0), ts(10))
+    historian.query("a", ts(0), ts(10))
+    assert historian.calls == 2
+    assert historian.get_query_cache_stats() == {}
+
+
+def test_repeated_query_is_served_from_cache():
+    historian = CountingQueryHistorian(query_cache_size_mb=1)
+    first = historian.query("a", ts(0), ts(10))
+    # the same times in another format normalize to the same entry
+    second = historian.query("a", START.isoformat(), ts(10))
+    assert historian.calls == 1
+    # hits are decoded from the stored json, as the result would be over rpc
+    assert jsonapi.loads(jsonapi.dumps(first)) == second
+    second["values"].append("changed")
+    assert historian.query("a", ts(0), ts(10)) == jsonapi.loads(jsonapi.dumps(first))
+
+    historian.query("a", ts(0), ts(10), count=5)
+    historian.query(["a", "b"], ts(0), ts(10))
+    stats = historian.get_query_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 3, 3)
+
+
+def test_writes_invalidate_overlapping_ranges():
+    historian = CountingQueryHistorian(query_cache_size_mb=1)
+    historian.query("a", ts(0), ts(10))
+    historian.query("a", ts(20), ts(30))
+    historian.query("a", ts(20))
+    historian.query(["A", "b"], ts(0), ts(10))
+
+    historian.invalidate_query_cache([record("a", 5), record("c", 25)])
+    stats = historian.get_query_cache_stats()
+    assert (stats["invalidations"], stats["entries"]) == (2, 2)
+
+    historian.query("a", ts(20), ts(30))
+    historian.query("a", ts(20))
+    assert historian.calls == 4
+
+    historian.invalidate_query_cache([record("a", 40)])
+    historian.query("a", ts(20), ts(30))
+    historian.query("a", ts(20))
+    assert historian.calls == 5
+
+
+def test_relative_end_is_invalidated_by_new_data():
+    historian = CountingQueryHistorian(query_cache_size_mb=1)
+    historian.query("a", "now -1h", "now")
+    historian.query("a", "now -1h", "now")
+    assert historian.calls == 1
+
+    historian.invalidate_query_cache([{"topic": "a",
+                                       "timestamp": datetime.now(pytz.UTC) + timedelta(seconds=5)}])
+    historian.query("a", "now -1h", "now")
+    assert historian.calls == 2
+
+
+def test_entries_expire_and_are_evicted_by_size():
+    historian = CountingQueryHistorian(query_cache_size_mb=1, query_cache_max_age=0)
+    historian.query("a", ts(0), ts(10))
+    historian.query("a", ts(0), ts(10))
+    assert historian.calls == 2
+
+    historian = CountingQueryHistorian(query_cache_size_mb=1)
+    historian._query_cache.max_bytes = 200
+    for minutes in range(10):
+        historian.query("a", ts(minutes), ts(minutes + 1))
+    stats = historian.get_query_cache_stats()
+    assert stats["size_bytes"] <= 200
+    assert stats["evictions"] == 10 - stats["entries"]
+    historian.query("a", ts(9), ts(10))
+    assert historian.calls == 10
+    historian.query("a", ts(0), ts(1))
+    assert historian.calls == 11
+
+
+def test_results_read_before_a_concurrent_write_are_not_cached():
+    class RacingQueryHistorian(CountingQueryHistorian):
+        def query_historian(self, *args, **kwargs):
+            results = super(RacingQueryHistorian, self).query_historian(*args, **kwargs)
+            if self.calls == 1:
+                # the publishing thread writes and invalidates while the
+                # query is still running
+                self.invalidate_query_cache([record("a", 5)])
+            return results
+
+    historian = RacingQueryHistorian(query_cache_size_mb=1)
+    historian.query("a", ts(0), ts(10))
+    assert historian.get_query_cache_stats()["entries"] == 0
+    historian.query("a", ts(0), ts(10))
+    historian.query("a", ts(0), ts(10))
+    assert historian.calls == 2
+
+    # writes for other topics do not keep results from being cached
+    historian.invalidate_query_cache([record("b", 5)])
+    historian.query("a", ts(20), ts(30))
+    historian.query("a", ts(20), ts(30))
+    assert historian.calls == 3
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from volttron.platform.agent.base_historian import BaseQueryHistorianAgent
+from volttron.platform.agent.utils import format_timestamp
+from volttron.platform.vip.agent import Agent
+from volttrontesting.utils.utils import AgentMock
+
+BaseQueryHistorianAgent.__bases__ = (AgentMock.imitate(Agent, Agent()),)
+
+START = datetime(2023, 1, 1, tzinfo=pytz.UTC)
+
+
+class MemoryQueryHistorian(BaseQueryHistorianAgent):
+    def __init__(self, data, **kwargs):
+        super(MemoryQueryHistorian, self).__init__(**kwargs)
+        self.data = data
+        self.calls = []
+
+    def query_historian(self, topic, start=None, end=None, agg_type=None,
+                        agg_period=None, skip=0, count=None, order=None):
+        self.calls.append((topic, start, end, skip, count))
+        if start is not None and start == end:
+            # exact timestamp match, like the sql historians
+            rows = [(ts, value) for ts, value in self.data[topic] if ts == start]
+        else:
+            rows = [(ts, value) for ts, value in self.data[topic]
+                    if (start is None or ts >= start) and (end is None or ts < end)]
+        if order == "LAST_TO_FIRST":
+            rows.reverse()
+        rows = rows[skip:]
+        if count is not None:
+            rows = rows[:count]
+        return {"values": [(format_timestamp(ts), value) for ts, value in rows],
+                "metadata": {"units": "F"}}
+
+
+def make_data(topics, rows):
+    return {topic: [(START + timedelta(minutes=i), i) for i in range(rows)]
+            for topic in topics}
+
+
+def read_all(historian, page):
+    pages = [page]
+    while page["cursor"] is not None:
+        page = historian.query_next_page(page["cursor"])
+        pages.append(page)
+    return pages
+
+
+def test_single_topic_pages():
+    historian = MemoryQueryHistorian(make_data(["a"], 10))
+    pages = read_all(historian, historian.query_paged("a", page_size=4))
+
+    assert [len(page["values"]) for page in pages] == [4, 4, 2]
+    assert [value for page in pages for _, value in page["values"]] == list(range(10))
+    assert all(page["metadata"] == {"units": "F"} for page in pages)
+    # later pages continue from the last timestamp instead of using an offset
+    assert historian.calls[1][1] == START + timedelta(minutes=3)
+    assert historian.calls[1][3] == 1
+    assert historian._query_cursors == {}
+
+
+def test_multi_topic_pages_with_count_and_order():
+    historian = MemoryQueryHistorian(make_data(["a", "b"], 10))
+    pages = read_all(historian, historian.query_paged(["a", "b"], count=5, order="LAST_TO_FIRST",
+                                                      page_size=3))
+
+    values = {}
+    for page in pages:
+        for topic, topic_values in page["values"].items():
+            values.setdefault(topic, []).extend(value for _, value in topic_values)
+    assert values == {"a": [9, 8, 7, 6, 5], "b": [9, 8, 7, 6, 5]}
+    assert all(len(page["values"]) == 1 for page in pages)
+
+
+def test_last_to_first_page_ending_at_start():
+    historian = MemoryQueryHistorian(make_data(["a"], 4))
+    pages = read_all(historian, historian.query_paged("a", start=format_timestamp(START),
+                                                      order="LAST_TO_FIRST", page_size=2))
+
+    # the second page ends on the row at start, it is not returned again
+    assert [value for page in pages for _, value in page["values"]] == [3, 2, 1, 0]
+    assert len(historian.calls) == 2
+    assert historian._query_cursors == {}
+
+
+def test_cursor_expires():
+    historian = MemoryQueryHistorian(make_data(["a"], 10), query_cursor_timeout=0)
+    page = historian.query_paged("a", page_size=4)
+    with pytest.raises(ValueError):
+        historian.query_next_page(page["cursor"])
+
+    historian = MemoryQueryHistorian(make_data(["a"], 10))
+    page = historian.query_paged("a", page_size=4)
+    historian.close_query_cursor(page["cursor"])
+    with pytest.raises(ValueError):
+        historian.query_next_page(page["cursor"])
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+from mock import MagicMock
+
+pytest.importorskip("pika")
+
+from zmq.green import ZMQError, ENOTSOCK, EHOSTUNREACH
+
+from volttron.platform.vip.agent import Agent
+from volttron.platform.vip.proxy_zmq_router import ZMQProxyRouter
+from volttrontesting.utils.utils import AgentMock
+
+ZMQProxyRouter.__bases__ = (AgentMock.imitate(Agent, Agent()),)
+
+
+def make_router():
+    router = ZMQProxyRouter(address="tcp://127.0.0.1:22916", identity="proxy",
+                            zmq_router=MagicMock())
+    router.core = MagicMock(instance_name="volttron1", identity="proxy")
+    router.vip = MagicMock()
+    return router
+
+
+def run_vip_loop(router, messages):
+    # the loop ends once the router socket is closed
+    router.zmq_router.socket.recv_multipart.side_effect = \
+        messages + [ZMQError(ENOTSOCK)]
+    router.vip_loop()
+
+
+def message(sender, recipient, subsystem, *args):
+    return [sender, recipient, "VIP1", "", "1", subsystem] + list(args)
+
+
+def response_bindings(router, method):
+    channel = router.core.connection.channel
+    return [call[1]["routing_key"] for call in getattr(channel, method).call_args_list
+            if call[0][0] == router._outbound_response_queue]
+
+
+def test_response_binding_made_once_per_sender_and_removed_on_agentstop():
+    router = make_router()
+    channel = router.core.connection.channel
+    run_vip_loop(router,
+                 [message("zmq.agent{}".format(i), "", "hello") for i in range(2)] +
+                 [message("zmq.agent{}".format(i % 2), "rmq.agent", "RPC", "{}")
+                  for i in range(10)] +
+                 [message("zmq.agent0", "", "agentstop")])
+
+    assert channel.basic_publish.call_count == 10
+    assert sorted(response_bindings(router, "queue_bind")) == \
+        ["volttron1.zmq.agent0", "volttron1.zmq.agent1"]
+    assert response_bindings(router, "queue_unbind") == ["volttron1.zmq.agent0"]
+    assert router._response_bindings == {"volttron1.zmq.agent1"}
+
+
+def test_response_binding_removed_when_peer_is_unreachable():
+    router = make_router()
+    run_vip_loop(router, [message("zmq.agent", "", "hello"),
+                          message("zmq.agent", "rmq.agent", "RPC", "{}")])
+
+    router.zmq_router.socket.send_multipart.side_effect = ZMQError(EHOSTUNREACH)
+    router.outbound_response_handler(
+        MagicMock(), SimpleNamespace(routing_key="volttron1.zmq.agent", delivery_tag=1),
+        SimpleNamespace(app_id="volttron1.rmq.agent", headers={}, message_id="1",
+                        type="RPC"),
+        '["{}"]')
+
+    assert response_bindings(router, "queue_unbind") == ["volttron1.zmq.agent"]
+    assert router._response_bindings == set()
+    assert router._zmq_peers == set()
+
+
+def test_startup_clears_response_bindings():
+    router = make_router()
+    router._response_bindings = {"volttron1.zmq.agent"}
+    router.startup(None)
+    assert router._response_bindings == set()
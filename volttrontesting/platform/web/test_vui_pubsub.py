@@ -1,3 +1,25 @@
+import json
+from unittest.mock import MagicMock
+
+import gevent
+
+from volttron.platform.web.vui_pubsub import SubscriptionGroup, VUIPubsubManager, VUIWebSocket
+
+
+class FakeSocket:
+    def __init__(self):
+        self.terminated = False
+        self.frames = []
+
+    def queue_frame(self, topic, frame):
+        self.frames.append((topic, frame))
+
+
+def make_manager():
+    agent = MagicMock()
+    return VUIPubsubManager(agent), agent.vip.pubsub
+
+
 def test_vui_pubsub_manager_init():
     # TODO: write_test
     pass
@@ -9,8 +31,33 @@ def test_create_websocket():
 
 
 def test_client_opened():
-    # TODO: write_test
-    pass
+    manager, pubsub = make_manager()
+    sockets = [FakeSocket() for _ in range(3)]
+    manager.client_opened(sockets[0], 'devices/campus/building1', 'token1')
+    manager.client_opened(sockets[1], 'devices/campus/building1', 'token2')
+    assert pubsub.subscribe.call_count == 1
+    assert manager.user_websockets['token2']['devices/campus/building1'] is sockets[1]
+
+    # A shorter prefix takes over the existing subscription.
+    manager.client_opened(sockets[2], 'devices/campus', 'token3')
+    assert list(manager.subscription_groups) == ['devices/campus']
+    pubsub.unsubscribe.assert_called_once()
+    assert set(manager.subscription_groups['devices/campus'].websockets) == set(sockets)
+
+
+def test_client_closed():
+    manager, pubsub = make_manager()
+    first, second = FakeSocket(), FakeSocket()
+    manager.client_opened(first, 'devices/campus', 'token1')
+    manager.client_opened(second, 'devices/campus/building1', 'token2')
+
+    manager.client_closed(first, 'devices/campus', 'token1')
+    assert pubsub.unsubscribe.call_count == 0
+    assert 'devices/campus' not in manager.user_websockets['token1']
+
+    manager.client_closed(second, 'devices/campus/building1', 'token2')
+    pubsub.unsubscribe.assert_called_once()
+    assert manager.subscription_groups == {}
 
 
 def test_close_socket():
@@ -48,9 +95,37 @@ def test_closed():
     pass
 
 
-def test_on_topic():
-    # TODO: write_test
-    pass
+def test_on_publish_serializes_once():
+    group = SubscriptionGroup(MagicMock(), 'devices/campus')
+    sockets = [FakeSocket() for _ in range(3)]
+    group.add(sockets[0], 'devices/campus')
+    group.add(sockets[1], 'devices/campus/building1')
+    group.add(sockets[2], 'devices/campus/building2')
+
+    message = [{'p1': 1.0}, {'p1': {'units': 'F'}}]
+    group.on_publish('pubsub', 'agent', '', 'devices/campus/building1/all', {}, message)
+    assert sockets[0].frames == [('devices/campus/building1/all', json.dumps(message))]
+    assert sockets[0].frames[0][1] is sockets[1].frames[0][1]
+    assert sockets[2].frames == []
+
+
+def test_queue_frame():
+    ws = VUIWebSocket.__new__(VUIWebSocket)
+    VUIWebSocket.__init__(ws, MagicMock())
+    ws.max_pending_frames = 2
+    ws.queue_frame('a', '1')
+    ws.queue_frame('b', '2')
+    ws.queue_frame('a', '3')
+    ws.queue_frame('c', '4')
+    assert list(ws._pending.items()) == [('b', '2'), ('c', '4')]
+    assert (ws.coalesced_frames, ws.dropped_frames) == (1, 1)
+
+    sent = []
+    ws.send = sent.append
+    sender = gevent.spawn(ws._send_pending)
+    gevent.sleep(0)
+    assert sent == ['2', '4']
+    sender.kill()
 
 
 def test_opened():
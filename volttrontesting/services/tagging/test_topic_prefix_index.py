@@ -0,0 +1,81 @@
+import re
+
+import pytest
+
+from volttron.platform.agent.base_tagging import BaseTaggingService, TopicPrefixIndex
+from volttron.platform.vip.agent import Agent
+from volttrontesting.utils.utils import AgentMock
+
+BaseTaggingService.__bases__ = (AgentMock.imitate(Agent, Agent()),)
+
+TOPICS = ["campus1/building1/device1/p1",
+          "campus1/building1/device1/p2",
+          "campus1/building1/device11/p1",
+          "campus1/building2/device1/p1",
+          "campus2/building1/device1/p1",
+          "weather/temperature"]
+
+
+def scan(topics, topic_pattern):
+    """Prefix matching as done by scanning every topic"""
+    pattern_parts = topic_pattern.split("/")
+    prefixes = set()
+    for topic in topics:
+        prefix = "/".join(topic.split("/")[:len(pattern_parts)])
+        if re.match(topic_pattern + "$", prefix):
+            prefixes.add(prefix)
+    return prefixes
+
+
+@pytest.mark.tagging
+@pytest.mark.parametrize("topic_pattern", [
+    "campus1/building1/device1",
+    "campus1/building1/device1.*",
+    "campus1/.*/device1",
+    "campus.*",
+    "campus1/building1/device1/p1",
+    "campus1/building3",
+    ".*/temperature",
+    "weather/temperature/extra",
+])
+def test_match_is_same_as_scan(topic_pattern):
+    index = TopicPrefixIndex(TOPICS)
+    assert index.match(topic_pattern) == scan(TOPICS, topic_pattern)
+
+
+@pytest.mark.tagging
+def test_update_adds_and_removes_topics():
+    index = TopicPrefixIndex(TOPICS)
+    assert index.match("campus3/.*") == set()
+
+    topics = TOPICS[1:] + ["campus3/building1/device1/p1"]
+    assert index.update(topics) == (1, 1)
+    assert len(index) == len(topics)
+    assert index.match("campus3/.*") == {"campus3/building1"}
+    assert index.match("campus1/building1/device1/.*") == {"campus1/building1/device1/p2"}
+
+    index.remove("campus1/building1/device1/p2")
+    assert index.match("campus1/building1/device1") == set()
+    assert index.match("campus1/building1/device11") == {"campus1/building1/device11"}
+
+
+@pytest.mark.tagging
+def test_topics_added_between_refreshes_are_found_on_refresh():
+    service = BaseTaggingService()
+    historian_topics = list(TOPICS)
+    service.vip.rpc.call.return_value.get.side_effect = \
+        lambda timeout: list(historian_topics)
+    service.refresh_topic_index()
+    service.vip.rpc.call.reset_mock()
+
+    historian_topics.append("campus1/building1/device2/p1")
+    # the pattern already has matches in the index, so the new device is
+    # not seen until the next refresh
+    assert set(service.get_matching_topic_prefixes("campus1/building1/device*")) == \
+        {"campus1/building1/device1", "campus1/building1/device11"}
+    service.vip.rpc.call.assert_not_called()
+
+    service.refresh_topic_index()
+    assert set(service.get_matching_topic_prefixes("campus1/building1/device*")) == \
+        {"campus1/building1/device1", "campus1/building1/device11",
+         "campus1/building1/device2"}
@@ -0,0 +1,69 @@
+from time import perf_counter
+
+from mock import Mock
+import zmq
+
+from volttron.platform.vip.router import INCOMING, OUTGOING
+from volttron.platform.vip.tracking import Histogram, Tracker
+
+
+def incoming(peer, subsystem):
+    return [peer, '', 'VIP1', peer, 'id', subsystem]
+
+
+def test_histogram_buckets():
+    histogram = Histogram((1, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(1, 2), (5, 3), (float('inf'), 4)]
+    assert histogram.to_dict() == {'buckets': [[1, 2], [5, 3], ['+Inf', 4]], 'sum': 14.5, 'count': 4}
+
+
+def test_disabled_tracker_records_nothing():
+    tracker = Tracker()
+    tracker.hit(INCOMING, incoming('agent', 'pubsub'), None)
+    tracker.routed(perf_counter())
+    tracker.fanout('devices/campus/building', 3)
+    metrics = tracker.get_metrics()
+    assert metrics['dwell'] == {} and metrics['fanout'] == {}
+    assert tracker.stats['incoming']['peer'] == {}
+
+
+def test_dwell_backlog_and_fanout():
+    tracker = Tracker()
+    tracker.enable()
+    socket = Mock()
+    socket.getsockopt.side_effect = [zmq.POLLIN, zmq.POLLIN, 0]
+    for subsystem in ('pubsub', 'RPC', 'pubsub'):
+        tracker.hit(INCOMING, incoming('agent', subsystem), None)
+        tracker.hit(OUTGOING, incoming('historian', subsystem), None)
+        tracker.routed(perf_counter(), socket)
+    tracker.fanout('devices/campus/building/all', 3)
+    tracker.fanout('devices/campus/other/all', 2)
+    tracker.fanout('heartbeat', 1)
+
+    metrics = tracker.get_metrics()
+    assert metrics['dwell']['pubsub']['count'] == 2
+    assert metrics['dwell']['RPC']['count'] == 1
+    assert metrics['backlog']['count'] == 1
+    assert metrics['backlog']['sum'] == 3
+    assert metrics['fanout'] == {'devices/campus': {'messages': 2, 'deliveries': 5},
+                                 'heartbeat': {'messages': 1, 'deliveries': 1}}
+    assert tracker.stats['incoming']['peer'] == {'agent': 3}
+    assert set(metrics['rates']['incoming']['subsystem']) == {'pubsub', 'RPC'}
+
+
+def test_prometheus_text():
+    tracker = Tracker()
+    tracker.enable()
+    tracker.hit(INCOMING, incoming('agent', 'pubsub'), None)
+    tracker.routed(perf_counter())
+    tracker.fanout('devices/campus/building/all', 3)
+
+    text = tracker.prometheus()
+    assert '# TYPE volttron_router_dwell_seconds histogram' in text
+    assert 'volttron_router_messages_total{direction="incoming",peer="agent"} 1' in text
+    assert 'volttron_router_dwell_seconds_bucket{le="+Inf",subsystem="pubsub"} 1' in text
+    assert 'volttron_router_dwell_seconds_count{subsystem="pubsub"} 1' in text
+    assert 'volttron_pubsub_deliveries_total{prefix="devices/campus"} 3' in text
+    assert text.endswith('\n')
@@ -1155,3 +1155,159 @@ def test_unhandled_cache_read_exception(volttron_instance, weather,
     finally:
         # make sure the cache is ready to be used again
         weather._cache._sqlite_conn = sqlite3.connect(DATABASE_FILE)
+
+
+def _build_cache(tmp_path, **kwargs):
+    from volttron.platform.agent.base_weather import WeatherCache
+    api_services = {"get_current_weather": {"type": "current",
+                                            "update_interval": None},
+                    "get_hourly_forecast": {"type": "forecast",
+                                            "update_interval": None}}
+    return WeatherCache(str(tmp_path / "weather.sqlite"),
+                        api_services=api_services, max_size_gb=None, **kwargs)
+
+
+@pytest.mark.weather2
+def test_cache_indexes_created(tmp_path):
+    cache = _build_cache(tmp_path)
+    cursor = cache._sqlite_conn.cursor()
+    for table in ["get_current_weather", "get_hourly_forecast"]:
+        indexes = [row[1] for row in cursor.execute(
+            "PRAGMA index_list({})".format(table)).fetchall()]
+        assert "{}_LOCATION_TIME".format(table) in indexes
+    cursor.close()
+    cache.close()
+
+
+@pytest.mark.weather2
+def test_cache_bulk_current_reads(tmp_path):
+    cache = _build_cache(tmp_path)
+    now = datetime.datetime.utcnow()
+    locations = [jsonapi.dumps({"location": "fake_location{}".format(i)})
+                 for i in range(3)]
+    for i, location in enumerate(locations[:2]):
+        cache.store_weather_records("get_current_weather", [
+            location, now - datetime.timedelta(hours=1), jsonapi.dumps({"old": i})])
+        cache.store_weather_records("get_current_weather", [
+            location, now, jsonapi.dumps({"new": i})])
+
+    results = cache.get_current_data_bulk("get_current_weather", locations)
+    assert set(results) == set(locations[:2])
+    for i, location in enumerate(locations[:2]):
+        assert jsonapi.loads(results[location][1]) == {"new": i}
+    assert cache.get_current_data("get_current_weather", locations[2]) == \
+        (None, None)
+
+    # the most recent observation is served from memory until a new record
+    # for the location is stored
+    cache._sqlite_conn.execute("UPDATE get_current_weather SET POINTS = ?",
+                               (jsonapi.dumps({"changed": True}),))
+    assert jsonapi.loads(cache.get_current_data(
+        "get_current_weather", locations[0])[1]) == {"new": 0}
+    cache.store_weather_records("get_current_weather", [
+        locations[0], now + datetime.timedelta(minutes=1),
+        jsonapi.dumps({"newest": 0})])
+    assert jsonapi.loads(cache.get_current_data(
+        "get_current_weather", locations[0])[1]) == {"newest": 0}
+    cache.close()
+
+
+@pytest.mark.weather2
+def test_cache_bulk_forecast_reads(tmp_path):
+    cache = _build_cache(tmp_path)
+    request_time = datetime.datetime.utcnow()
+    forecast_start = (request_time + datetime.timedelta(hours=1)).replace(
+        minute=0, second=0, microsecond=0)
+    locations = [jsonapi.dumps({"location": "fake_location{}".format(i)})
+                 for i in range(2)]
+    records = []
+    for location in locations:
+        for generation in range(2):
+            generation_time = request_time - datetime.timedelta(hours=2 - generation)
+            for hour in range(3):
+                records.append([location, generation_time,
+                                forecast_start + datetime.timedelta(hours=hour),
+                                jsonapi.dumps({"generation": generation})])
+    cache.store_weather_records("get_hourly_forecast", records)
+
+    results = cache.get_forecast_data_bulk("get_hourly_forecast", "hour",
+                                           locations, 2, request_time)
+    assert set(results) == set(locations)
+    for location in locations:
+        assert len(results[location]) == 2
+        for generation_time, forecast_time, points in results[location]:
+            assert jsonapi.loads(points) == {"generation": 1}
+    assert cache.get_forecast_data("get_hourly_forecast", "hour",
+                                   locations[0], 2, request_time) == \
+        results[locations[0]]
+    cache.close()
+
+
+@pytest.mark.weather2
+def test_cache_recent_observations_thread_safe(tmp_path):
+    import threading
+    cache = _build_cache(tmp_path)
+    cache._max_recent_observations = 10
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(5000):
+                location = "location{}".format((i + offset) % 25)
+                generation = cache._observation_generation(
+                    ("get_current_weather", location))
+                cache._remember_observation("get_current_weather", location,
+                                            (i, "{}"), generation)
+                if i % 3 == 0:
+                    cache._forget_observations("get_current_weather",
+                                               [location])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache._recent_observations) <= 10
+    cache.close()
+
+
+@pytest.mark.weather2
+def test_cache_read_racing_store_does_not_remember_stale_row(tmp_path):
+    import threading
+    cache = _build_cache(tmp_path, check_same_thread=False)
+    now = datetime.datetime.utcnow()
+    location = jsonapi.dumps({"location": "fake_location"})
+    cache.store_weather_records("get_current_weather", [
+        location, now, jsonapi.dumps({"old": True})])
+
+    # hold the reader between its SELECT and remembering the row while a
+    # newer record is stored
+    read_done = threading.Event()
+    store_done = threading.Event()
+    remember = cache._remember_observation
+
+    def paused_remember(*args):
+        read_done.set()
+        store_done.wait(5)
+        remember(*args)
+
+    cache._remember_observation = paused_remember
+    results = {}
+    reader = threading.Thread(target=lambda: results.update(
+        cache.get_current_data_bulk("get_current_weather", [location])))
+    reader.start()
+    assert read_done.wait(5)
+    cache.store_weather_records("get_current_weather", [
+        location, now + datetime.timedelta(minutes=1),
+        jsonapi.dumps({"new": True})])
+    store_done.set()
+    reader.join(5)
+    del cache._remember_observation
+
+    assert jsonapi.loads(results[location][1]) == {"old": True}
+    assert jsonapi.loads(cache.get_current_data(
+        "get_current_weather", location)[1]) == {"new": True}
+    cache.close()
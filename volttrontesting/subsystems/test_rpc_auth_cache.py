@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import gevent.local
+import pytest
+from mock import MagicMock
+
+from volttron.platform import jsonrpc
+from volttron.platform.vip.agent import RPC
+
+
+class _Owner:
+    def __init__(self, user_to_capabilities):
+        self.user_to_capabilities = user_to_capabilities
+        self.capability_lookups = 0
+        self.vip = SimpleNamespace(
+            auth=SimpleNamespace(get_capabilities=self._get_capabilities)
+        )
+
+    def _get_capabilities(self, user):
+        self.capability_lookups += 1
+        return self.user_to_capabilities.get(user, [])
+
+    @RPC.export
+    @RPC.allow("can_set")
+    def set_point(self, path, value):
+        return path, value
+
+
+def _build_rpc(user_to_capabilities):
+    owner = _Owner(user_to_capabilities)
+    core = MagicMock()
+    core.messagebus = "zmq"
+    rpc = RPC(core, owner, MagicMock())
+    rpc.context = gevent.local.local()
+    return owner, rpc
+
+
+def _call_as(rpc, user, *args):
+    rpc.context.vip_message = SimpleNamespace(user=user)
+    return rpc._exports["set_point"](*args)
+
+
+@pytest.mark.rpc
+def test_auth_decision_is_cached_per_user():
+    owner, rpc = _build_rpc({"alice": {"can_set": None}})
+
+    for _ in range(5):
+        assert _call_as(rpc, "alice", "a/b", 1) == ("a/b", 1)
+    assert owner.capability_lookups == 1
+
+    for _ in range(3):
+        with pytest.raises(jsonrpc.Error):
+            _call_as(rpc, "bob", "a/b", 1)
+    assert owner.capability_lookups == 2
+
+
+@pytest.mark.rpc
+def test_auth_cache_cleared_on_capability_update():
+    owner, rpc = _build_rpc({"alice": {"can_set": None}})
+    assert _call_as(rpc, "alice", "a/b", 1) == ("a/b", 1)
+
+    owner.user_to_capabilities = {}
+    rpc.clear_auth_cache()
+    with pytest.raises(jsonrpc.Error):
+        _call_as(rpc, "alice", "a/b", 1)
+    assert owner.capability_lookups == 2
+
+
+@pytest.mark.rpc
+def test_cached_argument_restrictions_are_enforced():
+    owner, rpc = _build_rpc({"alice": {"can_set": {"path": "/campus/.*/"}}})
+
+    assert _call_as(rpc, "alice", "campus/b", 1) == ("campus/b", 1)
+    with pytest.raises(jsonrpc.Error):
+        _call_as(rpc, "alice", "other/b", 1)
+    assert _call_as(rpc, "alice", "campus/c", 2) == ("campus/c", 2)
+    assert owner.capability_lookups == 1
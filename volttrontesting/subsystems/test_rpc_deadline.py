@@ -0,0 +1,109 @@
+import time
+from types import SimpleNamespace
+
+import gevent
+import gevent.local
+import pytest
+from mock import MagicMock
+
+from volttron.platform import jsonapi
+from volttron.platform.vip.agent import RPC, DeadlineExceeded
+from volttron.platform.vip.agent.subsystems.rpc import Dispatcher
+
+
+class _Owner:
+    def __init__(self):
+        self.steps = 0
+        self.rpc = None
+
+    @RPC.export
+    def slow_query(self, steps):
+        for _ in range(steps):
+            self.rpc.check_deadline()
+            gevent.sleep(0.01)
+            self.steps += 1
+        return self.steps
+
+    @RPC.export
+    @RPC.interruptible
+    def slow_interruptible(self, steps):
+        for _ in range(steps):
+            gevent.sleep(0.01)
+            self.steps += 1
+        return self.steps
+
+    @RPC.export
+    def time_left(self):
+        return self.rpc.remaining()
+
+
+def _build_rpc():
+    owner = _Owner()
+    core = MagicMock()
+    core.messagebus = "zmq"
+    rpc = RPC(core, owner, MagicMock())
+    rpc.context = gevent.local.local()
+    rpc._dispatcher = Dispatcher(rpc._exports, rpc.context)
+    owner.rpc = rpc
+    return owner, rpc
+
+
+def _request(method, *args, rpc_timeout=None):
+    caller = Dispatcher({}, gevent.local.local())
+    deadline = None if rpc_timeout is None else time.time() + rpc_timeout
+    request, _ = caller.call(method, args, deadline=deadline)
+    return jsonapi.loads(request)
+
+
+def _dispatch(rpc, request):
+    response = rpc._dispatcher.dispatch(request, SimpleNamespace(user="caller"))
+    return None if response is None else jsonapi.loads(response)
+
+
+@pytest.mark.rpc
+def test_no_deadline_runs_to_completion():
+    owner, rpc = _build_rpc()
+    request = _request("slow_query", 20)
+    assert "deadline" not in request
+
+    assert _dispatch(rpc, request)["result"] == 20
+    assert _dispatch(rpc, _request("time_left"))["result"] is None
+
+
+@pytest.mark.rpc
+def test_remaining_is_visible_to_callee():
+    owner, rpc = _build_rpc()
+    remaining = _dispatch(rpc, _request("time_left", rpc_timeout=5))["result"]
+    assert 4 < remaining <= 5
+    assert rpc.remaining() is None
+
+
+@pytest.mark.rpc
+def test_slow_handler_stops_at_deadline_and_reply_is_dropped():
+    owner, rpc = _build_rpc()
+    assert _dispatch(rpc, _request("slow_query", 100, rpc_timeout=0.1)) is None
+    assert owner.steps < 50
+
+    owner.steps = 0
+    assert _dispatch(rpc, _request("slow_interruptible", 100, rpc_timeout=0.1)) is None
+    assert owner.steps < 50
+
+
+@pytest.mark.rpc
+def test_expired_request_is_not_run():
+    owner, rpc = _build_rpc()
+    request = _request("slow_query", 5, rpc_timeout=-1)
+    assert _dispatch(rpc, request) is None
+    assert owner.steps == 0
+
+    with pytest.raises(DeadlineExceeded):
+        rpc._dispatcher.method(request, request["id"], "slow_query", [5], {})
+
+
+@pytest.mark.rpc
+def test_late_reply_from_uninterruptible_handler_is_dropped():
+    owner, rpc = _build_rpc()
+    rpc._exports["sleep"] = lambda: gevent.sleep(0.05) or "done"
+
+    assert _dispatch(rpc, _request("sleep", rpc_timeout=5))["result"] == "done"
+    assert _dispatch(rpc, _request("sleep", rpc_timeout=0.01)) is None